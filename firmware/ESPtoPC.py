@@ -1,90 +1,384 @@
-import bluetooth
-import threading
+import asyncio
+import json
+import os
+import socket
 import time
 
-# Global dictionary to map device addresses to IDs
-device_ids = {}
-
-def handle_connection(addr, device_id):
-    """Connect to a device, send its assigned ID, and print incoming pitch data."""
-    print(f"[{addr}] Attempting connection...")
-    
-    # Discover available services on the device
-    services = bluetooth.find_service(address=addr)
-    port = None
-    for svc in services:
-        if svc["protocol"] == "RFCOMM":
-            port = svc["port"]
-            break
-    if port is None:
-        print(f"[{addr}] No RFCOMM service found. Skipping this device.")
-        return
-    
-    print(f"[{addr}] Found RFCOMM service on port {port}.")
-    
-    sock = bluetooth.BluetoothSocket(bluetooth.RFCOMM)
-    sock.settimeout(10)  # Set a timeout for socket operations
+import bluetooth
+
+# Name advertised by the ESP32 controller sketch (see esp32code.ino)
+DEVICE_NAME = "ESP32_BT_Device"
+
+# EventController running inside the game (software/event_controller.py)
+CONTROLLER_HOST = 'localhost'
+CONTROLLER_PORT = 5555
+
+# Games send feedback commands here (software/feedback.py) to relay to controllers
+COMMAND_HOST = 'localhost'
+COMMAND_PORT = 5556
+
+RECV_SIZE = 1024           # Bytes read per socket wakeup
+MAX_LINE_LENGTH = 64       # Longest line we accept before discarding garbage
+PUBLISH_INTERVAL = 1 / 60  # Flush the latest samples at most 60 times a second
+SETTLE_DELAY = 1.0         # Give the ESP32 time to settle after connecting
+
+# Known controllers are remembered across boots so startup can skip the scan
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'controller_registry.json')
+DISCOVERY_DURATION = 8     # Seconds per background inquiry scan
+DISCOVERY_INTERVAL = 30    # Seconds between background scans for new controllers
+RECONNECT_DELAY = 1.0      # First retry delay after a failed or dropped connection
+MAX_RECONNECT_DELAY = 15.0
+
+
+class LineDecoder:
+    """Turn an arbitrary stream of byte chunks into complete text lines.
+
+    A single recv() may hold several readings or only half of one, so
+    partial lines are carried over until their newline arrives.
+    """
+    def __init__(self, max_line_length=MAX_LINE_LENGTH):
+        self.max_line_length = max_line_length
+        self.buffer = b''
+
+    def feed(self, data):
+        """Add a chunk of bytes and return the list of completed lines"""
+        self.buffer += data
+        *lines, self.buffer = self.buffer.split(b'\n')
+
+        # A runaway partial line means we lost sync - drop it
+        if len(self.buffer) > self.max_line_length:
+            self.buffer = b''
+
+        decoded = []
+        for line in lines:
+            text = line.decode('utf-8', errors='ignore').strip()
+            if text:
+                decoded.append(text)
+        return decoded
+
+
+def parse_pitch(line):
+    """Parse one line sent by the ESP32 into a float pitch, or None"""
+    # Accept both the bare value and the "Pitch: 12.34°" debug format
+    if ':' in line:
+        line = line.split(':', 1)[1]
     try:
-        # Use connect_ex() to get an error code
-        err = sock.connect_ex((addr, port))
-        if err != 0:
-            print(f"[{addr}] Initial connection failed with error code: {err}")
+        return float(line.replace('°', '').strip())
+    except ValueError:
+        return None
+
+
+class DeviceRegistry:
+    """Controllers seen before, persisted as JSON.
+
+    Each address keeps its RFCOMM port and the device ID it was first
+    assigned, so players keep the same ID across reboots.
+    """
+    def __init__(self, path=REGISTRY_PATH):
+        self.path = path
+        self.devices = {}  # addr -> {"name": str, "port": int, "device_id": int}
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                self.devices = json.load(f).get('devices', {})
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            self.devices = {}
+        return self
+
+    def save(self):
+        # Write to a temporary file first so a power cut can't corrupt the registry
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'devices': self.devices}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def __contains__(self, addr):
+        return addr in self.devices
+
+    def known_devices(self):
+        """Return (addr, port, device_id) for every known controller, ordered by ID"""
+        return sorted(((addr, info['port'], info['device_id']) for addr, info in self.devices.items()),
+                      key=lambda device: device[2])
+
+    def register(self, addr, name, port):
+        """Add or update a controller and return its (stable) device ID"""
+        if addr in self.devices:
+            self.devices[addr].update(name=name, port=port)
+            return self.devices[addr]['device_id']
+
+        # New controllers take the lowest free ID
+        used = {info['device_id'] for info in self.devices.values()}
+        device_id = 0
+        while device_id in used:
+            device_id += 1
+        self.devices[addr] = {'name': name, 'port': port, 'device_id': device_id}
+        return device_id
+
+    def update_port(self, addr, port):
+        if addr in self.devices:
+            self.devices[addr]['port'] = port
+
+
+class ESPBluetoothService:
+    """Read every ESP32 controller from a single asyncio loop.
+
+    Only the most recent pitch of each device is kept; the publisher
+    forwards whatever changed since its last flush to the EventController.
+    """
+    def __init__(self, controller_host=CONTROLLER_HOST, controller_port=CONTROLLER_PORT,
+                 publish_interval=PUBLISH_INTERVAL, publish=None):
+        self.controller_host = controller_host
+        self.controller_port = controller_port
+        self.publish_interval = publish_interval
+        self.publish = publish or self._send_to_controller
+        self.writer = None  # Connection to the EventController, kept open between flushes
+
+        # Latest pitch per device ID and the IDs updated since the last flush
+        self.latest = {}
+        self.dirty = set()
+        self.running = False
+
+        # One reconnecting task per controller address
+        self.connections = {}
+        self.connected = set()
+        self.sockets = {}  # device_id -> open socket, for feedback commands
+        self.start_time = None
+
+    def record_line(self, device_id, line):
+        """Store a decoded line as the device's latest sample"""
+        pitch = parse_pitch(line)
+        if pitch is None:
+            return False
+        self.latest[device_id] = pitch
+        self.dirty.add(device_id)
+        return True
+
+    async def handle_connection(self, addr, port, device_id):
+        """Connect to a device, send its assigned ID, and record incoming pitch data.
+
+        Returns True if the connection was established at all.
+        """
+        loop = asyncio.get_running_loop()
+        print(f"[{addr}] Connecting on RFCOMM port {port}...")
+
+        sock = socket.socket(socket.AF_BLUETOOTH, socket.SOCK_STREAM, socket.BTPROTO_RFCOMM)
+        sock.setblocking(False)
+        established = False
+        try:
+            await loop.sock_connect(sock, (addr, port))
+            await asyncio.sleep(SETTLE_DELAY)
+            established = True
+            print(f"[{addr}] Connected successfully with assigned ID {device_id}.")
+
+            # Broadcast the assigned ID to the ESP32
+            id_message = f"Your ID is {device_id}\n"
+            await loop.sock_sendall(sock, id_message.encode('utf-8'))
+            self.sockets[device_id] = sock
+            self._mark_connected(device_id)
+
+            decoder = LineDecoder()
+            while self.running:
+                data = await loop.sock_recv(sock, RECV_SIZE)
+                if not data:
+                    break
+                for line in decoder.feed(data):
+                    self.record_line(device_id, line)
+        except OSError as e:
+            print(f"[{addr}] Connection error: {e}")
+        finally:
+            if self.sockets.get(device_id) is sock:
+                del self.sockets[device_id]
             sock.close()
-            return
-        # Give the ESP32 time to settle
-        time.sleep(1)
-        print(f"[{addr}] Connected successfully with assigned ID {device_id}.")
-        
-        # Broadcast the assigned ID to the ESP32
-        id_message = f"Your ID is {device_id}\n"
-        sock.send(id_message.encode('utf-8'))
-        print(f"[{addr}] Sent ID message: {id_message.strip()}")
-        
-        while True:
+            self.connected.discard(device_id)
+            if established:
+                print(f"[{addr}] Disconnected.")
+        return established
+
+    def _mark_connected(self, device_id):
+        self.connected.add(device_id)
+        elapsed = time.monotonic() - self.start_time
+        print(f"Controllers ready: {len(self.connected)}/{len(self.connections)} after {elapsed:.1f}s")
+
+    async def maintain_connection(self, addr, port, device_id, registry):
+        """Keep a controller connected, re-resolving its port if connecting fails"""
+        loop = asyncio.get_running_loop()
+        delay = RECONNECT_DELAY
+        while self.running:
+            if await self.handle_connection(addr, port, device_id):
+                delay = RECONNECT_DELAY
+            else:
+                # The cached port may be stale (e.g. reflashed firmware) - ask SDP again
+                new_port = await loop.run_in_executor(None, find_rfcomm_port, addr)
+                if new_port is not None and new_port != port:
+                    print(f"[{addr}] RFCOMM port changed from {port} to {new_port}.")
+                    port = new_port
+                    registry.update_port(addr, port)
+                    registry.save()
+                    continue
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+            await asyncio.sleep(delay)
+
+    def connect_device(self, addr, port, device_id, registry):
+        """Start the reconnecting task for a controller, once per address"""
+        if addr not in self.connections:
+            self.connections[addr] = asyncio.create_task(
+                self.maintain_connection(addr, port, device_id, registry))
+
+    def take_updates(self):
+        """Return pitch events for every device updated since the last call"""
+        now = time.time()
+        events = [
+            {
+                'action': 'pitch',
+                'player_id': device_id + 1,  # Games use 1-based player IDs
+                'pitch': self.latest[device_id],
+                'timestamp': now
+            }
+            for device_id in sorted(self.dirty)
+        ]
+        self.dirty.clear()
+        return events
+
+    async def publish_loop(self):
+        """Periodically forward the newest samples to the EventController"""
+        while self.running:
+            await asyncio.sleep(self.publish_interval)
+            events = self.take_updates()
+            if events:
+                await self.publish(events)
+
+    async def _send_to_controller(self, events):
+        """Send a batch of events to the EventController as JSON lines on one long-lived connection
+
+        The connection is only opened again after it fails (e.g. the game restarted).
+        """
+        payload = ''.join(json.dumps(event) + '\n' for event in events)
+        try:
+            if self.writer is None or self.writer.is_closing():
+                _, self.writer = await asyncio.open_connection(self.controller_host, self.controller_port)
+            self.writer.write(payload.encode('utf-8'))
+            await self.writer.drain()
+        except OSError as e:
+            print(f"Failed to send events to controller: {e}")
+            self._close_controller_connection()
+
+    def _close_controller_connection(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    async def handle_command_client(self, reader, writer):
+        """Relay JSON-line feedback commands from a game to the right controller"""
+        loop = asyncio.get_running_loop()
+        try:
+            while self.running:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    # Games address players by 0-based index, which is the device ID
+                    device_id = int(message['player'])
+                    command = str(message['command'])
+                except (ValueError, KeyError, TypeError):
+                    print(f"Ignoring invalid feedback command: {line!r}")
+                    continue
+
+                sock = self.sockets.get(device_id)
+                if sock is None:
+                    continue  # Controller not connected; feedback is best-effort
+                try:
+                    await loop.sock_sendall(sock, (command + '\n').encode('utf-8'))
+                except OSError as e:
+                    print(f"[ID {device_id}] Failed to send feedback: {e}")
+        finally:
+            writer.close()
+
+    async def discovery_loop(self, registry, interval=DISCOVERY_INTERVAL):
+        """Scan in the background and connect controllers not seen before"""
+        while self.running:
             try:
-                data = sock.recv(1024)  # Receive up to 1024 bytes
-            except bluetooth.btcommon.BluetoothError as e:
-                print(f"[{addr}] Receive error: {e}")
-                break
-            if not data:
-                break
-            # Assuming the data is sent as a UTF-8 string
-            pitch = data.decode('utf-8').strip()
-            print(f"[ID {device_id} | {addr}] Pitch: {pitch}°")
-    except Exception as e:
-        print(f"[{addr}] Connection error: {e}")
-    finally:
-        sock.close()
-        print(f"[{addr}] Disconnected.")
+                for addr, name, port in await discover(exclude=registry):
+                    device_id = registry.register(addr, name, port)
+                    registry.save()
+                    print(f"Found device: {name} ({addr}) assigned ID {device_id}")
+                    self.connect_device(addr, port, device_id, registry)
+            except (bluetooth.BluetoothError, OSError) as e:
+                # Adapter busy or radio toggled; a failed scan must not drop connected controllers
+                print(f"Discovery scan failed: {e}")
+            await asyncio.sleep(interval)
+
+    async def run(self, registry, discovery_interval=DISCOVERY_INTERVAL):
+        """Reconnect known controllers right away, then keep looking for new ones"""
+        self.running = True
+        self.start_time = time.monotonic()
+        publisher = asyncio.create_task(self.publish_loop())
+        command_server = await asyncio.start_server(self.handle_command_client,
+                                                    COMMAND_HOST, COMMAND_PORT)
+
+        known = registry.known_devices()
+        print(f"Reconnecting {len(known)} known controller(s)...")
+        for addr, port, device_id in known:
+            self.connect_device(addr, port, device_id, registry)
+
+        try:
+            await self.discovery_loop(registry, discovery_interval)
+        finally:
+            self.running = False
+            publisher.cancel()
+            self._close_controller_connection()
+            command_server.close()
+            for task in self.connections.values():
+                task.cancel()
+
+
+def find_rfcomm_port(addr):
+    """Look up the RFCOMM port a device advertises over SDP"""
+    for svc in bluetooth.find_service(address=addr):
+        if svc["protocol"] == "RFCOMM":
+            return svc["port"]
+    return None
+
+
+async def discover(exclude=()):
+    """Scan for ESP32 controllers and resolve their RFCOMM ports.
+
+    Returns (addr, name, port) for every controller not in exclude.
+    """
+    loop = asyncio.get_running_loop()
+    print(f"Scanning for {DEVICE_NAME} devices...")
+    nearby_devices = await loop.run_in_executor(
+        None, lambda: bluetooth.discover_devices(duration=DISCOVERY_DURATION, lookup_names=True))
 
-def main():
-    print("Scanning for ESP32_BT_Device devices...")
-    # Discover nearby Bluetooth devices (8-second scan)
-    nearby_devices = bluetooth.discover_devices(duration=8, lookup_names=True)
-    
     # Filter devices that include the ESP32 device name
-    devices = [(addr, name) for addr, name in nearby_devices if "ESP32_BT_Device" in name]
-    
-    if not devices:
-        print("No ESP32_BT_Device devices found.")
-        return
-
-    threads = []
-    # Assign an ID to each discovered device in the order they are found
-    for i, (addr, name) in enumerate(devices):
-        device_ids[addr] = i
-        print(f"Found device: {name} ({addr}) assigned ID {i}")
-        t = threading.Thread(target=handle_connection, args=(addr, i))
-        t.daemon = True
-        t.start()
-        threads.append(t)
-
-    # Keep the main thread running as long as there are active connections
+    found = [(addr, name) for addr, name in nearby_devices
+             if name and DEVICE_NAME in name and addr not in exclude]
+
+    # SDP lookups are blocking; resolve all of them in parallel
+    ports = await asyncio.gather(*(loop.run_in_executor(None, find_rfcomm_port, addr)
+                                   for addr, _ in found))
+
+    devices = []
+    for (addr, name), port in zip(found, ports):
+        if port is None:
+            print(f"[{addr}] No RFCOMM service found. Skipping this device.")
+            continue
+        devices.append((addr, name, port))
+    return devices
+
+
+async def main_async():
+    registry = DeviceRegistry().load()
+    await ESPBluetoothService().run(registry)
+
+
+def main():
     try:
-        while True:
-            time.sleep(1)
+        asyncio.run(main_async())
     except KeyboardInterrupt:
         print("Exiting...")
 
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,153 @@
+#include <Wire.h>
+#include <BLEDevice.h>
+#include <BLEServer.h>
+#include <BLE2902.h>
+#include <Adafruit_MPU6050.h>
+#include <Adafruit_Sensor.h>
+#include <math.h>
+
+// --- Pin assignments ---
+#define LED1_PIN 33   // Represents bit 0 (LSB)
+#define LED2_PIN 32   // Represents bit 1
+#define BUTTON_PIN 27
+#define SPEAKER_PIN 25
+
+// I2C pins for MPU6050
+#define SDA_PIN 21
+#define SCL_PIN 22
+
+// --- GATT layout (must match middleware/esp32_ble_bridge.py) ---
+#define DEVICE_NAME         "ESP32_BLE_Device"
+#define SERVICE_UUID        "7a1d0001-5c3e-4f6b-9b8e-3d2f1c0e6a10"
+#define SAMPLE_CHAR_UUID    "7a1d0002-5c3e-4f6b-9b8e-3d2f1c0e6a10"
+#define CONTROL_CHAR_UUID   "7a1d0003-5c3e-4f6b-9b8e-3d2f1c0e6a10"
+
+// Send a sample every 10 ms; the connection interval sets the real pace
+const unsigned long SAMPLE_INTERVAL_MS = 10;
+
+// Packed sample sent in each notification: ID, pitch, button bits
+struct __attribute__((packed)) Sample {
+  uint8_t id;
+  float pitch;
+  uint8_t buttons;
+};
+
+Adafruit_MPU6050 mpu;
+BLECharacteristic *sampleCharacteristic = nullptr;
+bool clientConnected = false;
+
+// Global variable for device ID (-1 means not set yet)
+int deviceID = -1;
+
+void updateLEDsWithID() {
+  digitalWrite(LED1_PIN, (deviceID & 0x01) ? HIGH : LOW);
+  digitalWrite(LED2_PIN, (deviceID & 0x02) ? HIGH : LOW);
+}
+
+class ServerCallbacks : public BLEServerCallbacks {
+  void onConnect(BLEServer *server) {
+    clientConnected = true;
+  }
+
+  void onDisconnect(BLEServer *server) {
+    clientConnected = false;
+    deviceID = -1;
+    // Advertise again so the bridge can reconnect
+    server->getAdvertising()->start();
+  }
+};
+
+class ControlCallbacks : public BLECharacteristicCallbacks {
+  void onWrite(BLECharacteristic *characteristic) {
+    String incoming = String(characteristic->getValue().c_str());
+    incoming.trim();
+    // Same ID message the Bluetooth Classic sketch understands
+    if (incoming.startsWith("Your ID is ")) {
+      deviceID = incoming.substring(String("Your ID is ").length()).toInt();
+      Serial.print("Assigned deviceID: ");
+      Serial.println(deviceID);
+    }
+  }
+};
+
+void setup() {
+  Serial.begin(115200);
+  Serial.println("ESP32 BLE IMU Controller");
+
+  pinMode(LED1_PIN, OUTPUT);
+  pinMode(LED2_PIN, OUTPUT);
+  pinMode(BUTTON_PIN, INPUT_PULLUP);
+  pinMode(SPEAKER_PIN, OUTPUT);
+
+  // Initialize I2C and the MPU6050
+  Wire.begin(SDA_PIN, SCL_PIN);
+  if (!mpu.begin()) {
+    Serial.println("Failed to find MPU6050 chip");
+    while (1) {
+      delay(10);
+    }
+  }
+  mpu.setAccelerometerRange(MPU6050_RANGE_8_G);
+  mpu.setGyroRange(MPU6050_RANGE_500_DEG);
+  mpu.setFilterBandwidth(MPU6050_BAND_21_HZ);
+
+  // --- BLE GATT server setup ---
+  BLEDevice::init(DEVICE_NAME);
+  BLEServer *server = BLEDevice::createServer();
+  server->setCallbacks(new ServerCallbacks());
+
+  BLEService *service = server->createService(SERVICE_UUID);
+  sampleCharacteristic = service->createCharacteristic(
+    SAMPLE_CHAR_UUID, BLECharacteristic::PROPERTY_NOTIFY);
+  sampleCharacteristic->addDescriptor(new BLE2902());
+
+  BLECharacteristic *controlCharacteristic = service->createCharacteristic(
+    CONTROL_CHAR_UUID, BLECharacteristic::PROPERTY_WRITE | BLECharacteristic::PROPERTY_WRITE_NR);
+  controlCharacteristic->setCallbacks(new ControlCallbacks());
+  service->start();
+
+  BLEAdvertising *advertising = BLEDevice::getAdvertising();
+  advertising->addServiceUUID(SERVICE_UUID);
+  // Ask for the shortest connection interval (7.5 ms) for low input latency
+  advertising->setMinPreferred(0x06);
+  advertising->setMaxPreferred(0x06);
+  BLEDevice::startAdvertising();
+  Serial.println("BLE advertising. Waiting for the bridge...");
+}
+
+void loop() {
+  static unsigned long lastSample = 0;
+
+  // --- Display ID on LEDs, or flash while waiting for one ---
+  if (deviceID >= 0) {
+    updateLEDsWithID();
+  } else {
+    static unsigned long lastToggle = 0;
+    static bool toggleState = false;
+    if (millis() - lastToggle > 500) {
+      lastToggle = millis();
+      toggleState = !toggleState;
+      digitalWrite(LED1_PIN, toggleState ? HIGH : LOW);
+      digitalWrite(LED2_PIN, toggleState ? HIGH : LOW);
+    }
+  }
+
+  if (!clientConnected || deviceID < 0 || millis() - lastSample < SAMPLE_INTERVAL_MS) {
+    return;
+  }
+  lastSample = millis();
+
+  // Compute pitch angle from accelerometer data (same formula as esp32code)
+  sensors_event_t a, g, temp;
+  mpu.getEvent(&a, &g, &temp);
+  float pitch = atan2(a.acceleration.y, sqrt(a.acceleration.x * a.acceleration.x + a.acceleration.z * a.acceleration.z)) * 180.0 / PI;
+
+  // Assuming active LOW: bit 0 is the main button
+  Sample sample;
+  sample.id = (uint8_t)deviceID;
+  sample.pitch = pitch;
+  sample.buttons = (digitalRead(BUTTON_PIN) == LOW) ? 0x01 : 0x00;
+
+  sampleCharacteristic->setValue((uint8_t *)&sample, sizeof(sample));
+  sampleCharacteristic->notify();
+}
@@ -24,10 +24,19 @@ Adafruit_MPU6050 mpu;
 // --- Tone parameters ---
 const int TONE_FREQUENCY = 1000;   // 1 kHz tone
 const int TONE_DURATION = 200;     // duration in milliseconds
+const int RUMBLE_FREQUENCY = 80;   // No motor on board, so rumble is a low buzz
+
+// --- Timing (non-blocking, so feedback commands are handled right away) ---
+const unsigned long SAMPLE_INTERVAL_MS = 20;     // Pitch samples sent at 50 Hz
+const unsigned long BUTTON_DEBOUNCE_MS = 300;
 
 // Global variable for device ID (-1 means not set yet)
 int deviceID = -1;
 
+// LED override set by an "LED" feedback command (0 = show the ID as usual)
+unsigned long ledOverrideUntil = 0;
+int ledOverrideMask = 0;
+
 // Function to update LED outputs based on deviceID
 // LED1 = bit 0, LED2 = bit 1
 void updateLEDsWithID() {
@@ -36,6 +45,36 @@ void updateLEDsWithID() {
   digitalWrite(LED2_PIN, (deviceID & 0x02) ? HIGH : LOW);
 }
 
+// Handle one line from the PC: the ID assignment or a feedback command
+//   Your ID is <n>
+//   TONE <frequency> <ms>
+//   RUMBLE <ms>
+//   LED <mask> <ms>
+void handleCommand(String incoming) {
+  incoming.trim();
+  // Look for the expected ID message format
+  if (incoming.startsWith("Your ID is ")) {
+    String idStr = incoming.substring(String("Your ID is ").length());
+    int id = idStr.toInt();
+    deviceID = id;
+    Serial.print("Assigned deviceID: ");
+    Serial.println(deviceID);
+  } else if (incoming.startsWith("TONE ")) {
+    int frequency = 0, duration = 0;
+    sscanf(incoming.c_str(), "TONE %d %d", &frequency, &duration);
+    tone(SPEAKER_PIN, frequency, duration);
+  } else if (incoming.startsWith("RUMBLE ")) {
+    int duration = 0;
+    sscanf(incoming.c_str(), "RUMBLE %d", &duration);
+    tone(SPEAKER_PIN, RUMBLE_FREQUENCY, duration);
+  } else if (incoming.startsWith("LED ")) {
+    int mask = 0, duration = 0;
+    sscanf(incoming.c_str(), "LED %d %d", &mask, &duration);
+    ledOverrideMask = mask;
+    ledOverrideUntil = millis() + duration;
+  }
+}
+
 void setup() {
   Serial.begin(115200);
   delay(1000);
@@ -76,24 +115,25 @@ void setup() {
 }
 
 void loop() {
-  // --- Check if we have received our ID from Bluetooth ---
+  static unsigned long lastSample = 0;
+  static unsigned long lastButtonPress = 0;
+
+  // --- Commands arrive over Bluetooth, or over USB serial when plugged in ---
   if (SerialBT.available()) {
     String incoming = SerialBT.readStringUntil('\n');
-    incoming.trim();
     Serial.print("Received via Bluetooth: ");
     Serial.println(incoming);
-    // Look for the expected ID message format
-    if (incoming.startsWith("Your ID is ")) {
-      String idStr = incoming.substring(String("Your ID is ").length());
-      int id = idStr.toInt();
-      deviceID = id;
-      Serial.print("Assigned deviceID: ");
-      Serial.println(deviceID);
-    }
+    handleCommand(incoming);
+  }
+  if (Serial.available()) {
+    handleCommand(Serial.readStringUntil('\n'));
   }
   
   // --- Display ID on LEDs ---
-  if (deviceID >= 0) {
+  if (millis() < ledOverrideUntil) {
+    digitalWrite(LED1_PIN, (ledOverrideMask & 0x01) ? HIGH : LOW);
+    digitalWrite(LED2_PIN, (ledOverrideMask & 0x02) ? HIGH : LOW);
+  } else if (deviceID >= 0) {
     updateLEDsWithID();
   } else {
     // If no ID yet, flash both LEDs as a waiting indicator.
@@ -109,13 +149,17 @@ void loop() {
 
   // --- Check Button for tone output ---
   // Assuming active LOW: when pressed, digitalRead returns LOW.
-  if (digitalRead(BUTTON_PIN) == LOW) {
+  if (digitalRead(BUTTON_PIN) == LOW && millis() - lastButtonPress > BUTTON_DEBOUNCE_MS) {
+    lastButtonPress = millis();
     // Play a 1kHz tone for TONE_DURATION milliseconds.
     tone(SPEAKER_PIN, TONE_FREQUENCY, TONE_DURATION);
-    // Debounce delay to avoid retriggering too quickly.
-    delay(300);
   }
 
+  if (millis() - lastSample < SAMPLE_INTERVAL_MS) {
+    return;
+  }
+  lastSample = millis();
+
   // --- Read MPU6050 data ---
   sensors_event_t a, g, temp;
   mpu.getEvent(&a, &g, &temp);
@@ -124,17 +168,9 @@ void loop() {
   // Formula: pitch = atan2(accY, sqrt(accX^2 + accZ^2)) * (180/PI)
   float pitch = atan2(a.acceleration.y, sqrt(a.acceleration.x * a.acceleration.x + a.acceleration.z * a.acceleration.z)) * 180.0 / PI;
   
-  // Print the pitch to Serial monitor.
-  Serial.print("Pitch: ");
-  Serial.print(pitch, 2);
-  Serial.println("°");
-  
   // --- Transmit pitch data over Bluetooth Serial ---
   // This will send the pitch to any connected Bluetooth clients.
   char pitchStr[10];
   dtostrf(pitch, 4, 2, pitchStr);  // Format the pitch value as a string
   SerialBT.println(pitchStr);
-  
-  // Short delay before repeating the loop.
-  delay(500);
 }
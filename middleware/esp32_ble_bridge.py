@@ -0,0 +1,265 @@
+import asyncio
+import json
+import struct
+import time
+import argparse
+from abc import ABC, abstractmethod
+
+# Try to import bleak (BLE support is optional for the rest of the middleware)
+try:
+    from bleak import BleakClient, BleakScanner
+except ImportError:
+    print("Warning: Could not import bleak, BLE transport unavailable")
+    BleakClient = None
+    BleakScanner = None
+
+# GATT layout advertised by firmware/esp32-ble-controller
+DEVICE_NAME = "ESP32_BLE_Device"
+SERVICE_UUID = "7a1d0001-5c3e-4f6b-9b8e-3d2f1c0e6a10"
+SAMPLE_CHAR_UUID = "7a1d0002-5c3e-4f6b-9b8e-3d2f1c0e6a10"   # notify: packed samples
+CONTROL_CHAR_UUID = "7a1d0003-5c3e-4f6b-9b8e-3d2f1c0e6a10"  # write: ID assignment
+
+# One notification = controller ID (uint8), pitch in degrees (float32), button bits (uint8)
+SAMPLE_FORMAT = struct.Struct('<BfB')
+
+# Button bits and the game action each press produces
+BUTTON_ACTIONS = {
+    0x01: 'hit',
+    0x02: 'select',
+}
+
+MIN_PUBLISH_INTERVAL = 1 / 120  # Never flush to the controller more often than this
+
+
+def pack_sample(controller_id, pitch, buttons=0):
+    """Pack a sample the same way the ESP32 firmware does"""
+    return SAMPLE_FORMAT.pack(controller_id, pitch, buttons)
+
+
+def unpack_sample(data):
+    """Unpack a notification payload into (controller_id, pitch, buttons), or None"""
+    if len(data) != SAMPLE_FORMAT.size:
+        return None
+    return SAMPLE_FORMAT.unpack(data)
+
+
+class ControllerTransport(ABC):
+    """Interface between the bridge and a single BLE controller.
+
+    The bridge only ever talks to controllers through these methods, so a
+    local fake can replace the radio in tests. A transport missing any of
+    them fails when it's created rather than mid-connection.
+    """
+    address = None
+
+    @abstractmethod
+    async def connect(self):
+        """Connect to the controller"""
+
+    @abstractmethod
+    async def subscribe(self, callback):
+        """Call callback(bytes) for every sample notification"""
+
+    @abstractmethod
+    async def write(self, data):
+        """Write bytes to the controller's control characteristic"""
+
+    @abstractmethod
+    async def disconnect(self):
+        """Disconnect from the controller"""
+
+
+class BleakTransport(ControllerTransport):
+    """ControllerTransport backed by a bleak GATT client"""
+    def __init__(self, address):
+        if BleakClient is None:
+            raise RuntimeError("bleak is not installed")
+        self.address = address
+        self.client = BleakClient(address)
+
+    async def connect(self):
+        await self.client.connect()
+
+    async def subscribe(self, callback):
+        await self.client.start_notify(SAMPLE_CHAR_UUID,
+                                       lambda _, data: callback(bytes(data)))
+
+    async def write(self, data):
+        await self.client.write_gatt_char(CONTROL_CHAR_UUID, data, response=False)
+
+    async def disconnect(self):
+        if self.client.is_connected:
+            await self.client.disconnect()
+
+
+class ESP32BLEBridge:
+    """Forward BLE controller notifications to the game's EventController.
+
+    Pitch is latest-value-per-controller; button presses are queued as
+    discrete actions so none are lost between flushes.
+    """
+    def __init__(self, transports, controller_host='localhost', controller_port=5555,
+                 publish=None, min_publish_interval=MIN_PUBLISH_INTERVAL):
+        self.transports = list(transports)
+        self.controller_host = controller_host
+        self.controller_port = controller_port
+        self.publish = publish or self._send_to_controller
+        self.writer = None  # Connection to the EventController, kept open between flushes
+        self.min_publish_interval = min_publish_interval
+
+        self.latest_pitch = {}
+        self.dirty = set()
+        self.buttons = {}
+        self.pending_actions = []
+        self.wakeup = None
+        self.running = False
+
+    def handle_notification(self, data):
+        """Decode one notification and record its pitch and button presses"""
+        sample = unpack_sample(data)
+        if sample is None:
+            print(f"Ignoring malformed BLE sample ({len(data)} bytes)")
+            return
+        controller_id, pitch, buttons = sample
+
+        self.latest_pitch[controller_id] = pitch
+        self.dirty.add(controller_id)
+
+        # Only newly pressed buttons produce actions
+        pressed = buttons & ~self.buttons.get(controller_id, 0)
+        self.buttons[controller_id] = buttons
+        for bit, action in BUTTON_ACTIONS.items():
+            if pressed & bit:
+                self.pending_actions.append((controller_id, action))
+
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    def take_updates(self):
+        """Return the events gathered since the last call"""
+        now = time.time()
+        # Games use 1-based player IDs
+        events = [
+            {'action': action, 'player_id': controller_id + 1, 'timestamp': now}
+            for controller_id, action in self.pending_actions
+        ]
+        events.extend(
+            {'action': 'pitch', 'player_id': controller_id + 1,
+             'pitch': self.latest_pitch[controller_id], 'timestamp': now}
+            for controller_id in sorted(self.dirty)
+        )
+        self.pending_actions.clear()
+        self.dirty.clear()
+        return events
+
+    async def publish_loop(self):
+        """Flush as soon as a notification arrives, rate-limited"""
+        while self.running:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            events = self.take_updates()
+            if events:
+                await self.publish(events)
+            await asyncio.sleep(self.min_publish_interval)
+
+    async def _send_to_controller(self, events):
+        """Send a batch of events to the EventController as JSON lines on one long-lived connection
+
+        The connection is only opened again after it fails (e.g. the game restarted).
+        """
+        payload = ''.join(json.dumps(event) + '\n' for event in events)
+        try:
+            if self.writer is None or self.writer.is_closing():
+                _, self.writer = await asyncio.open_connection(self.controller_host, self.controller_port)
+            self.writer.write(payload.encode('utf-8'))
+            await self.writer.drain()
+        except OSError as e:
+            print(f"Failed to send events to controller: {e}")
+            self._close_controller_connection()
+
+    def _close_controller_connection(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    async def _start_transport(self, transport, controller_id):
+        """Connect one controller, tell it its ID, and subscribe to its samples"""
+        try:
+            await transport.connect()
+            await transport.write(f"Your ID is {controller_id}\n".encode('utf-8'))
+            await transport.subscribe(self.handle_notification)
+            print(f"[{transport.address}] Streaming as controller {controller_id}")
+            return True
+        except Exception as e:
+            print(f"[{transport.address}] Failed to start BLE controller: {e}")
+            return False
+
+    async def start(self):
+        """Connect every controller in parallel and start publishing"""
+        self.running = True
+        self.wakeup = asyncio.Event()
+        self.publisher = asyncio.create_task(self.publish_loop())
+        results = await asyncio.gather(*(self._start_transport(transport, i)
+                                         for i, transport in enumerate(self.transports)))
+        return sum(results)
+
+    async def stop(self):
+        """Stop publishing and disconnect every controller"""
+        self.running = False
+        if self.wakeup is not None:
+            self.wakeup.set()
+            await self.publisher
+        self._close_controller_connection()
+        for transport in self.transports:
+            try:
+                await transport.disconnect()
+            except Exception as e:
+                print(f"[{transport.address}] Error disconnecting: {e}")
+
+
+async def scan_for_controllers(timeout=5.0):
+    """Find advertising ESP32 BLE controllers and return their addresses"""
+    devices = await BleakScanner.discover(timeout=timeout, service_uuids=[SERVICE_UUID])
+    return sorted(device.address for device in devices
+                  if device.name and DEVICE_NAME in device.name)
+
+
+async def main(args):
+    addresses = args.address or await scan_for_controllers(args.scan_time)
+    if not addresses:
+        print(f"No {DEVICE_NAME} devices found.")
+        return
+
+    bridge = ESP32BLEBridge([BleakTransport(address) for address in addresses],
+                            controller_host=args.host,
+                            controller_port=args.controller_port)
+    connected = await bridge.start()
+    print(f"BLE bridge running with {connected} controller(s). Press Ctrl+C to stop.")
+    try:
+        while True:
+            await asyncio.sleep(1)
+    finally:
+        await bridge.stop()
+
+
+if __name__ == "__main__":
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='ESP32 BLE to Event Controller Bridge')
+    parser.add_argument('--address', action='append',
+                        help='BLE address of a controller (repeat for several, skips scanning)')
+    parser.add_argument('--scan-time', type=float, default=5.0,
+                        help='Seconds to scan for controllers')
+    parser.add_argument('--host', type=str, default='localhost',
+                        help='Host address for the event controller')
+    parser.add_argument('--controller-port', type=int, default=5555,
+                        help='Port for the event controller')
+
+    args = parser.parse_args()
+
+    if BleakClient is None:
+        print("Install bleak (see middleware/requirements.txt) to use the BLE bridge")
+    else:
+        try:
+            asyncio.run(main(args))
+        except KeyboardInterrupt:
+            print("Program terminated")
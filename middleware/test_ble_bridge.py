@@ -0,0 +1,115 @@
+import asyncio
+from esp32_ble_bridge import ControllerTransport, ESP32BLEBridge, pack_sample
+
+class FakeTransport(ControllerTransport):
+    """Stands in for a BLE controller: records writes and replays notifications"""
+    def __init__(self, address):
+        self.address = address
+        self.connected = False
+        self.callback = None
+        self.written = []
+
+    async def connect(self):
+        self.connected = True
+
+    async def subscribe(self, callback):
+        self.callback = callback
+
+    async def write(self, data):
+        self.written.append(data)
+
+    async def disconnect(self):
+        self.connected = False
+
+    def notify(self, data):
+        self.callback(data)
+
+
+def run_bridge(scenario):
+    """Run a scenario against a bridge with two fake controllers and collect published events"""
+    published = []
+
+    async def publish(events):
+        published.extend(events)
+
+    async def main():
+        transports = [FakeTransport("AA:00"), FakeTransport("AA:01")]
+        bridge = ESP32BLEBridge(transports, publish=publish, min_publish_interval=0)
+        await bridge.start()
+        await scenario(transports)
+        await asyncio.sleep(0.01)
+        await bridge.stop()
+        return transports
+
+    transports = asyncio.run(main())
+    return transports, published
+
+
+def test_controllers_get_ids_and_samples_are_forwarded():
+    async def scenario(transports):
+        transports[0].notify(pack_sample(0, 12.5, 0))
+        transports[1].notify(pack_sample(1, -3.0, 0))
+
+    transports, published = run_bridge(scenario)
+
+    assert transports[0].written == [b"Your ID is 0\n"]
+    assert transports[1].written == [b"Your ID is 1\n"]
+    assert not transports[0].connected
+    pitches = {e['player_id']: e['pitch'] for e in published if e['action'] == 'pitch'}
+    assert pitches == {1: 12.5, 2: -3.0}
+
+
+def test_only_latest_pitch_is_kept_between_flushes():
+    async def scenario(transports):
+        # No await between notifications, so they all land before the next flush
+        for pitch in (1.0, 2.0, 3.0):
+            transports[0].notify(pack_sample(0, pitch, 0))
+
+    _, published = run_bridge(scenario)
+
+    assert [e['pitch'] for e in published] == [3.0]
+
+
+def test_button_press_is_reported_once():
+    async def scenario(transports):
+        transports[0].notify(pack_sample(0, 0.0, 0x01))
+        await asyncio.sleep(0)
+        transports[0].notify(pack_sample(0, 0.0, 0x01))  # Still held
+        await asyncio.sleep(0)
+        transports[0].notify(pack_sample(0, 0.0, 0x00))
+        await asyncio.sleep(0)
+        transports[0].notify(pack_sample(0, 0.0, 0x03))
+
+    _, published = run_bridge(scenario)
+
+    actions = [e['action'] for e in published if e['action'] != 'pitch']
+    assert actions == ['hit', 'hit', 'select']
+
+
+def test_malformed_samples_are_ignored():
+    async def scenario(transports):
+        transports[0].notify(b"\x00\x01")
+
+    _, published = run_bridge(scenario)
+
+    assert published == []
+
+
+def test_an_incomplete_transport_cannot_be_created():
+    class NoWrite(FakeTransport):
+        write = ControllerTransport.write
+
+    try:
+        NoWrite("AA:BB")
+    except TypeError:
+        return
+    assert False, "a transport without write() was created"
+
+
+if __name__ == "__main__":
+    test_controllers_get_ids_and_samples_are_forwarded()
+    test_only_latest_pitch_is_kept_between_flushes()
+    test_button_press_is_reported_once()
+    test_malformed_samples_are_ignored()
+    test_an_incomplete_transport_cannot_be_created()
+    print("All BLE bridge tests passed")
@@ -0,0 +1,134 @@
+# allocbench.py - How much the game objects allocate
+#
+# Counts the Rect objects a Pong tick creates (collision checks used to
+# make new ones every call), measures how many bytes each kind of game
+# object takes, and times a Shooting Stars style frame where bullets and
+# stars are created and thrown away all the time. Run it with:
+#   python allocbench.py [--ticks 2000]
+import os
+import sys
+import time
+import argparse
+import contextlib
+import tracemalloc
+import pong_core
+
+
+def best_time(func, *args, repeat=5):
+    """Fastest of repeat runs of func, in seconds (the machine's noise only ever adds time)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def count_rects(func, *args):
+    """Call func, returning (its result, how many pong_core.Rect objects were created meanwhile)"""
+    created = [0]
+    original = pong_core.Rect.__init__
+
+    def counting_init(self, *rect_args):
+        created[0] += 1
+        original(self, *rect_args)
+
+    pong_core.Rect.__init__ = counting_init
+    try:
+        result = func(*args)
+    finally:
+        pong_core.Rect.__init__ = original
+    return result, created[0]
+
+
+def bytes_per_object(make, count=2000):
+    """Average bytes held by each of count objects from make()"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [make() for _ in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return used / count
+
+
+def pong_ticks(ticks):
+    """Rects created per tick of a bot match (with a fever orb on the field), and seconds per tick"""
+    from pong_sim import PongSimulation
+    from pong_bot import PongBot, bot_inputs
+    from pong_fever import FeverOrb
+
+    def play():
+        sim = PongSimulation(800, 600, 4, seed=1)
+        bots = {player: PongBot(player, seed=player) for player in range(4)}
+        sim.start()
+        for _ in range(ticks):
+            if sim.fever_orb is None:
+                sim.fever_orb = FeverOrb(sim.game_rect, sim.fever_orb_radius, sim.rng, sim.rate)
+            sim.step(bot_inputs(bots, sim))
+
+    # Throw the game's debug prints away (kept in memory they'd count as allocations)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        _, created = count_rects(play)
+        elapsed = best_time(play)
+    return created / ticks, elapsed / ticks
+
+
+def star_frames(frames, width=1280, height=720, dt=1 / 60):
+    """Frames of stars bouncing and bullets flying, with bullets spawned and dropped every frame"""
+    import random
+    from shooting_stars import Star, Bullet
+
+    random.seed(1)
+    stars = [Star(random.randint(50, width - 50), random.randint(50, height - 50)) for _ in range(30)]
+    bullets = []
+    for frame in range(frames):
+        bullets.append(Bullet(0, random.randint(50, height - 50), frame % 4))
+        for star in stars:
+            star.update(width, height, dt)
+        for bullet in bullets:
+            bullet.update(dt)
+            for star in stars:
+                if star.is_hit(bullet.x, bullet.y):
+                    bullet.active = False
+                    break
+        bullets = [bullet for bullet in bullets if bullet.active and not bullet.is_out_of_bounds(width, height)]
+        if len(stars) < 30:
+            stars.append(Star(random.randint(50, width - 50), random.randint(50, height - 50)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Allocation counts of the game objects")
+    parser.add_argument('--ticks', type=int, default=2000, help="Pong ticks and Shooting Stars frames to run")
+    args = parser.parse_args(argv)
+
+    from pong_core import Rect
+    from pong_paddle import Paddle
+    from pong_ball import Ball
+    from pong_fever import FeverOrb
+    from shooting_stars import Star, Bullet, Pokemon
+
+    rects, tick_time = pong_ticks(args.ticks)
+    print(f"Pong: {rects:.1f} Rects created per tick, {tick_time * 1e6:.1f} us per tick (bots included)")
+
+    game_rect = Rect(0, 0, 600, 600)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        sizes = [('Ball', lambda: Ball(300, 300, 10, 400)),
+                 ('Paddle', lambda: Paddle(0, 0, 100, 15, 0, 20)),
+                 ('FeverOrb', lambda: FeverOrb(game_rect)),
+                 ('Rect', lambda: Rect(0, 0, 10, 10)),
+                 ('Star', lambda: Star(100, 100)),
+                 ('Bullet', lambda: Bullet(100, 100, 0)),
+                 ('Pokemon', lambda: Pokemon(100, 100, 0))]
+        sizes = [(name, bytes_per_object(make)) for name, make in sizes]
+    for name, size in sizes:
+        print(f"{name}: {size:.0f} bytes each")  # With its float attributes and any cached Rect
+
+    frame_time = best_time(star_frames, args.ticks) / args.ticks
+    print(f"Shooting Stars: {frame_time * 1e6:.1f} us per frame")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
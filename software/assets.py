@@ -0,0 +1,250 @@
+# assets.py - Load images once and keep display-ready, pre-scaled copies
+import os
+from collections import OrderedDict
+import pygame
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+SPRITE_CACHE_SIZE = 64  # Transformed sprites kept before the least recently used is dropped
+TEXT_CACHE_SIZE = 256   # Rendered strings kept before the least recently used is dropped
+
+
+class AssetManager:
+    """
+    Shared image cache for every game
+
+    Each file is read from disk once. Surfaces handed out are converted to
+    the display's pixel format (convert_alpha() for images with transparency)
+    so blitting them doesn't convert every pixel every frame, and scaled
+    variants are kept per (path, size).
+    """
+    def __init__(self, base_dir=ASSET_DIR):
+        self.base_dir = base_dir
+        self.loaded = {}     # path -> surface as read from disk
+        self.converted = {}  # (path, size) -> surface ready for the current display
+        self.display_mode = None
+
+    def path(self, name):
+        """Full path of an asset, relative to the asset directory unless absolute"""
+        return name if os.path.isabs(name) else os.path.join(self.base_dir, name)
+
+    def current_display_mode(self):
+        """What converted surfaces depend on: the display surface's size and pixel format"""
+        display = pygame.display.get_surface() if pygame.display.get_init() else None
+        if display is None:
+            return None
+        return (display.get_size(), display.get_bitsize(), display.get_masks())
+
+    def check_display_mode(self):
+        """Drop converted surfaces if the display mode changed since they were made"""
+        mode = self.current_display_mode()
+        if mode != self.display_mode:
+            self.converted.clear()
+            self.display_mode = mode
+
+    def load(self, path):
+        """Read an image from disk, once"""
+        surface = self.loaded.get(path)
+        if surface is None:
+            surface = pygame.image.load(path)
+            self.loaded[path] = surface
+        return surface
+
+    def image(self, name, size=None):
+        """
+        Get an image converted for the display, scaled to size if given
+
+        Args:
+            name (str): File name in the asset directory (or an absolute path)
+            size (tuple): (width, height) to scale to, or None for the original size
+
+        Raises:
+            FileNotFoundError, pygame.error: If the image can't be loaded
+        """
+        self.check_display_mode()
+        path = self.path(name)
+        key = (path, tuple(size) if size is not None else None)
+        surface = self.converted.get(key)
+        if surface is not None:
+            return surface
+
+        surface = self.load(path)
+        if size is not None and surface.get_size() != key[1]:
+            surface = pygame.transform.scale(surface, key[1])
+        surface = self.convert(surface)
+        self.converted[key] = surface
+        return surface
+
+    def convert(self, surface):
+        """Match the display's pixel format, keeping transparency if the image has any"""
+        if self.display_mode is None:
+            return surface  # No display yet - nothing to convert to
+        try:
+            if surface.get_flags() & pygame.SRCALPHA:
+                return surface.convert_alpha()
+            return surface.convert()
+        except pygame.error as e:
+            print(f"Could not convert image for the display: {e}")
+            return surface
+
+    def clear(self):
+        """Forget every loaded and converted image"""
+        self.loaded.clear()
+        self.converted.clear()
+
+
+class SpriteCache:
+    """
+    Bounded LRU cache of transformed sprites (scaled, rotated, tinted)
+
+    Entries are keyed by the source surface and the transform's parameters,
+    so drawing the same sprite at the same size every frame only transforms
+    it once.
+    """
+    def __init__(self, max_entries=SPRITE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (id(source), op, params) -> (source, result)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, source, op, params, make):
+        """Return the cached result of op on source, calling make() to create it on a miss"""
+        key = (id(source), op, params)
+        entry = self.entries.get(key)
+        # The source is kept alive in the entry, so a matching id is the same surface
+        if entry is not None and entry[0] is source:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        result = make()
+        self.entries[key] = (source, result)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return result
+
+    def scale(self, surface, size):
+        """pygame.transform.scale, cached"""
+        size = (int(size[0]), int(size[1]))
+        return self.get(surface, 'scale', size, lambda: pygame.transform.scale(surface, size))
+
+    def rotate(self, surface, angle):
+        """pygame.transform.rotate, cached"""
+        return self.get(surface, 'rotate', angle, lambda: pygame.transform.rotate(surface, angle))
+
+    def tint(self, surface, color):
+        """Copy of surface with every pixel multiplied by color, cached"""
+        color = tuple(color)
+        def make():
+            tinted = surface.copy()
+            tinted.fill(color, special_flags=pygame.BLEND_RGBA_MULT if len(color) == 4 else pygame.BLEND_RGB_MULT)
+            return tinted
+        return self.get(surface, 'tint', color, make)
+
+    def stats(self):
+        """Hit/miss counters and current size, for debugging"""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries)}
+
+    def clear(self):
+        """Drop every cached sprite (the counters are kept)"""
+        self.entries.clear()
+
+
+class FontCache:
+    """
+    Process-wide font registry and LRU cache of rendered text
+
+    Fonts are opened once per (name, size). render() has the same arguments
+    as Font.render, with the font first, and reuses the surface for strings
+    that were drawn recently, so HUD labels aren't re-rendered every frame.
+    """
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.fonts = {}  # (name, size) -> pygame.font.Font
+        self.entries = OrderedDict()  # (font, text, antialias, color, background) -> surface
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size, name=None):
+        """The shared Font for name (None for the default font) at size"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, font, text, antialias, color, background=None):
+        """font.render(text, antialias, color, background), cached"""
+        key = (font, text, antialias, tuple(color), tuple(background) if background is not None else None)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self.entries[key] = surface
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    def stats(self):
+        """Hit/miss counters and current size, for debugging"""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries)}
+
+    def clear(self):
+        """Drop every rendered string (fonts stay open, the counters are kept)"""
+        self.entries.clear()
+
+
+class OverlayCache:
+    """
+    Full-screen translucent overlays (fever tint, countdown and win screens)
+
+    One surface is kept per screen size and reused every frame; a new color
+    is a fill() and a new opacity a set_alpha(), so nothing is allocated
+    while an overlay is showing.
+    """
+    def __init__(self):
+        self.surfaces = {}  # size -> [surface, rgb, alpha]
+
+    def get(self, size, color):
+        """The overlay for a screen of size, filled with color (r, g, b, alpha)"""
+        rgb, alpha = tuple(color[:3]), color[3] if len(color) > 3 else 255
+        entry = self.surfaces.get(size)
+        if entry is None:
+            surface = pygame.Surface(size)
+            try:
+                surface = surface.convert()
+            except pygame.error:
+                pass  # No display yet - blits just won't be as fast
+            entry = self.surfaces[size] = [surface, None, None]
+
+        surface = entry[0]
+        if entry[1] != rgb:
+            surface.fill(rgb)
+            entry[1] = rgb
+        if entry[2] != alpha:
+            surface.set_alpha(alpha)
+            entry[2] = alpha
+        return surface
+
+    def draw(self, screen, color):
+        """Tint the whole screen with color (r, g, b, alpha)"""
+        return screen.blit(self.get(screen.get_size(), color), (0, 0))
+
+    def clear(self):
+        """Free the overlay surfaces"""
+        self.surfaces.clear()
+
+
+# Shared by every game so each image is only loaded once per run
+assets = AssetManager()
+sprites = SpriteCache()
+fonts = FontCache()
+overlays = OverlayCache()
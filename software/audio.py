@@ -0,0 +1,115 @@
+# audio.py - Non-blocking music and sound effects for the menu and games
+#
+# Sound effects are decoded once (through the resource store) and played
+# from memory. Background tracks are streamed with pygame.mixer.music;
+# switching scenes fades the old track out and the new one in on a timer
+# that update() checks each frame, so nothing here sleeps or waits on a
+# fade.
+import os
+import time
+import pygame
+from resources import store
+
+MUSIC_FADE_MS = 1000  # How long a scene's track takes to fade out and the next to fade in
+
+
+class AudioEngine:
+    def __init__(self, resources=None):
+        self.resources = resources if resources is not None else store
+        self.current = None  # Track playing, or about to once the last one has faded out
+        self.pending = None  # (path, volume, fade_ms) waiting for the fade out to finish
+        self.switch_at = 0
+        self.missing = set()  # Tracks already found not to exist
+
+    def available(self):
+        """True if the mixer is up"""
+        return pygame.mixer.get_init() is not None
+
+    def play_music(self, name, volume=0.5, fade_ms=MUSIC_FADE_MS):
+        """
+        Switch the background track, fading out whatever is playing first
+
+        Calling this again with the track that's already playing does nothing, so
+        scenes can call it every frame. A missing track fades the music out.
+        """
+        if not self.available():
+            return
+        path = self.resources.path(name)
+        if path == self.current:
+            return
+
+        if path in self.missing or not os.path.exists(path):
+            if path not in self.missing:
+                print(f"Music not found: {path}")
+                self.missing.add(path)
+            self.stop_music(fade_ms)
+            return
+
+        self.current = path
+        if pygame.mixer.music.get_busy() and fade_ms > 0:
+            # Loading now would block until the fade finishes - start it from update()
+            pygame.mixer.music.fadeout(fade_ms)
+            self.pending = (path, volume, fade_ms)
+            self.switch_at = time.time() + fade_ms / 1000.0
+        else:
+            self.pending = None
+            self.start_music(path, volume, fade_ms)
+
+    def start_music(self, path, volume, fade_ms):
+        """Stream a track on a loop, fading it in"""
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(-1, fade_ms=fade_ms)
+        except pygame.error as e:
+            print(f"Error playing music {path}: {e}")
+            self.current = None
+
+    def stop_music(self, fade_ms=0):
+        """Stop the background track, fading it out over fade_ms"""
+        self.current = None
+        self.pending = None
+        if not self.available():
+            return
+        if fade_ms > 0 and pygame.mixer.music.get_busy():
+            pygame.mixer.music.fadeout(fade_ms)
+        else:
+            pygame.mixer.music.stop()
+
+    def update(self):
+        """Start the next track once the previous one has faded out; call once per frame"""
+        if self.pending is None or time.time() < self.switch_at:
+            return
+        if pygame.mixer.music.get_busy():
+            return  # Still fading
+        path, volume, fade_ms = self.pending
+        self.pending = None
+        self.start_music(path, volume, fade_ms)
+
+    def play_effect(self, name, volume=None, maxtime=0):
+        """
+        Play a sound effect from memory without waiting for it
+
+        Args:
+            name (str): Sound file in the resource directory
+            volume (float): Volume to play at, or None to keep the sound's current volume
+            maxtime (int): Stop after this many milliseconds (0 plays it all)
+
+        Returns:
+            pygame.mixer.Channel, or None if the sound couldn't be played
+        """
+        if not self.available():
+            return None
+        sound = self.resources.sound(name, volume)
+        if sound is None:
+            return None
+        return sound.play(maxtime=maxtime)
+
+    def stop_effects(self):
+        """Stop every sound effect (the music keeps playing)"""
+        if self.available():
+            pygame.mixer.stop()
+
+
+# Shared by the menu and every game
+audio = AudioEngine()
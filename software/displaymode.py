@@ -0,0 +1,36 @@
+# displaymode.py - Opening the window at a fixed internal resolution
+#
+# The menu and every game draw into a surface of RENDER_SIZE whatever
+# the panel is, and pygame.SCALED has SDL's renderer stretch it to the
+# screen in one pass on the GPU (letterboxed to keep the aspect ratio).
+# On a 4K cabinet that's a ninth of the pixels to fill each frame at
+# 1280x720. Layouts all come from screen.get_size(), so sizes, game
+# areas and HUDs are in internal coordinates without knowing about it.
+import pygame
+
+RENDER_SIZE = (1280, 720)  # Internal resolution; None draws at the panel's native resolution
+
+
+def open_display(render_size=RENDER_SIZE, fullscreen=True):
+    """
+    Open the game window, drawing at render_size and scaled to fit the screen
+
+    Falls back to the panel's native resolution if render_size is None or
+    scaling isn't available.
+
+    Returns:
+        pygame.Surface: The surface to draw on
+    """
+    flags = pygame.FULLSCREEN if fullscreen else 0
+    if render_size is not None:
+        if pygame.display.get_surface() is not None:
+            # SDL can't give an open window a new scaled mode; start the window over
+            pygame.display.quit()
+            pygame.display.init()
+        try:
+            screen = pygame.display.set_mode(render_size, flags | pygame.SCALED)
+            print(f"Drawing at {screen.get_size()}, scaled to {pygame.display.get_window_size()}")
+            return screen
+        except pygame.error as e:
+            print(f"Warning: Could not open a scaled display ({e}), using native resolution")
+    return pygame.display.set_mode((0, 0), flags)
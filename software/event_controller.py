@@ -10,6 +10,7 @@ class EventController:
         self.socket = None
         self.running = False
         self.events = []
+        self.latest_pitch = {}  # player_id -> most recent controller pitch
         self.lock = threading.Lock()
     
     def start(self):
@@ -18,7 +19,7 @@ class EventController:
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         try:
             self.socket.bind((self.host, self.port))
-            self.socket.listen(1)
+            self.socket.listen(5)
             self.running = True
             
             # Start listening thread
@@ -32,31 +33,71 @@ class EventController:
                 self.socket.close()
         
     def _listen_for_events(self):
-        """Listen for events from external programs"""
+        """Accept clients, reading each on its own thread so relays can stay connected"""
+        self.socket.settimeout(0.5)  # Add timeout for easier shutdown
         while self.running:
             try:
-                self.socket.settimeout(0.5)  # Add timeout for easier shutdown
-                try:
-                    client, _ = self.socket.accept()
-                    data = client.recv(1024).decode('utf-8')
-                    client.close()
-                    
-                    if data:
-                        try:
-                            event_data = json.loads(data)
-                            print(f"Event controller received: {event_data}")  # Debug print
-                            with self.lock:
-                                self.events.append(event_data)
-                        except json.JSONDecodeError:
-                            print(f"Received invalid JSON data: {data}")
-                except socket.timeout:
-                    # This is expected, just continue
-                    pass
+                client, _ = self.socket.accept()
+            except socket.timeout:
+                continue  # This is expected, just continue
             except Exception as e:
                 if self.running:
                     print(f"Error in event controller: {e}")
-            
-            time.sleep(0.01)  # Small delay to prevent CPU hogging
+                    time.sleep(0.01)  # Don't spin if accept keeps failing
+                continue
+            threading.Thread(target=self._read_client, args=(client,), daemon=True).start()
+    
+    def _read_client(self, client):
+        """Store every JSON line a client sends until it disconnects
+        
+        Relays keep one connection open and send newline-delimited events;
+        one-off senders write a single event (newline optional) and close.
+        """
+        client.settimeout(0.5)
+        buffer = b''
+        try:
+            while self.running:
+                try:
+                    chunk = client.recv(4096)
+                except socket.timeout:
+                    continue
+                if not chunk:
+                    break
+                buffer += chunk
+                *lines, buffer = buffer.split(b'\n')
+                for line in lines:
+                    self._store_line(line)
+            self._store_line(buffer)  # A last event without a newline
+        except OSError as e:
+            if self.running:
+                print(f"Error reading event client: {e}")
+        finally:
+            client.close()
+    
+    def _store_line(self, line):
+        line = line.decode('utf-8', errors='ignore').strip()
+        if not line:
+            return
+        try:
+            self._store_event(json.loads(line))
+        except json.JSONDecodeError:
+            print(f"Received invalid JSON data: {line}")
+    
+    def _store_event(self, event_data):
+        """Queue an event, keeping only the newest pitch sample per player"""
+        with self.lock:
+            if isinstance(event_data, dict) and event_data.get('action') == 'pitch':
+                # Pitch samples stream continuously, so they replace each other
+                # instead of piling up in the event queue
+                self.latest_pitch[event_data.get('player_id')] = event_data.get('pitch')
+                return
+            self.events.append(event_data)
+        print(f"Event controller received: {event_data}")  # Debug print
+    
+    def get_pitch(self):
+        """Get the latest controller pitch for each player_id"""
+        with self.lock:
+            return dict(self.latest_pitch)
     
     def get_events(self):
         """Get and clear the current events"""
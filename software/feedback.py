@@ -0,0 +1,210 @@
+# feedback.py - Non-blocking feedback (rumble, tone, LED) from games to controllers
+import socket
+import json
+import time
+import threading
+
+# Try to import pyserial for controllers plugged in over USB
+try:
+    import serial
+except ImportError:
+    serial = None
+
+# ESPtoPC listens here and relays commands over Bluetooth
+FEEDBACK_HOST = 'localhost'
+FEEDBACK_PORT = 5556
+
+MIN_COMMAND_INTERVAL = 0.05  # Per device: never send commands closer together than this
+RECONNECT_COOLDOWN = 2.0     # Seconds to wait before retrying a failed connection
+
+
+def format_command(kind, duration=100, frequency=1000, mask=0b11):
+    """
+    Build the text command understood by the ESP32 firmware
+
+    Args:
+        kind (str): 'rumble', 'tone' or 'led'
+        duration (int): How long the effect lasts, in milliseconds
+        frequency (int): Tone frequency in Hz (tone only)
+        mask (int): Which LEDs to light, bit 0 = LED1, bit 1 = LED2 (led only)
+    """
+    if kind == 'rumble':
+        return f"RUMBLE {int(duration)}"
+    elif kind == 'tone':
+        return f"TONE {int(frequency)} {int(duration)}"
+    elif kind == 'led':
+        return f"LED {int(mask)} {int(duration)}"
+    raise ValueError(f"Unknown feedback kind: {kind}")
+
+
+class SocketFeedbackWriter:
+    """Send commands to ESPtoPC, which forwards them over Bluetooth"""
+    def __init__(self, host=FEEDBACK_HOST, port=FEEDBACK_PORT):
+        self.host = host
+        self.port = port
+        self.sock = None
+        self.retry_at = 0
+
+    def write(self, player, command):
+        if self.sock is None:
+            if time.time() < self.retry_at:
+                return False
+            try:
+                self.sock = socket.create_connection((self.host, self.port), timeout=0.5)
+            except OSError:
+                self.retry_at = time.time() + RECONNECT_COOLDOWN
+                return False
+        try:
+            message = json.dumps({'player': player, 'command': command}) + '\n'
+            self.sock.sendall(message.encode('utf-8'))
+            return True
+        except OSError as e:
+            print(f"Feedback connection lost: {e}")
+            self.close()
+            self.retry_at = time.time() + RECONNECT_COOLDOWN
+            return False
+
+    def close(self):
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+
+
+class SerialFeedbackWriter:
+    """Write commands straight to controllers connected over USB serial"""
+    def __init__(self, ports, baudrate=115200):
+        # ports maps player index -> serial port name
+        self.ports = dict(ports)
+        self.baudrate = baudrate
+        self.connections = {}
+
+    def write(self, player, command):
+        if serial is None or player not in self.ports:
+            return False
+        try:
+            if player not in self.connections:
+                self.connections[player] = serial.Serial(self.ports[player], self.baudrate,
+                                                         timeout=0, write_timeout=0.1)
+            self.connections[player].write((command + '\n').encode('utf-8'))
+            return True
+        except serial.SerialException as e:
+            print(f"Feedback serial error for player {player + 1}: {e}")
+            connection = self.connections.pop(player, None)
+            if connection:
+                connection.close()
+            return False
+
+    def close(self):
+        for connection in self.connections.values():
+            connection.close()
+        self.connections.clear()
+
+
+class FeedbackService:
+    """Queue feedback commands and write them from a background thread.
+
+    Games only ever touch the queue, so a slow or missing controller can't
+    stall the render loop. Commands of the same kind for the same player
+    replace each other while queued, and each player's device gets at most
+    one command per MIN_COMMAND_INTERVAL.
+    """
+    def __init__(self, writer, min_interval=MIN_COMMAND_INTERVAL):
+        self.writer = writer
+        self.min_interval = min_interval
+        self.pending = {}    # player -> {kind: command}, in arrival order
+        self.last_sent = {}  # player -> time of the last write
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        """Start the background writer thread"""
+        self.running = True
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def feedback(self, player, kind, **params):
+        """Queue a command for a player's controller; returns immediately"""
+        command = format_command(kind, **params)
+        with self.condition:
+            queued = self.pending.setdefault(player, {})
+            # Coalesce: a newer command of the same kind replaces the queued one
+            queued.pop(kind, None)
+            queued[kind] = command
+            self.condition.notify()
+
+    def _next_command(self):
+        """Pop the next command whose device is off cooldown, or return the time to wait"""
+        now = time.time()
+        wait = None
+        for player, queued in self.pending.items():
+            ready_at = self.last_sent.get(player, 0) + self.min_interval
+            if ready_at <= now:
+                kind = next(iter(queued))
+                command = queued.pop(kind)
+                if not queued:
+                    del self.pending[player]
+                self.last_sent[player] = now
+                return (player, command), None
+            wait = ready_at - now if wait is None else min(wait, ready_at - now)
+        return None, wait
+
+    def _run(self):
+        while self.running:
+            with self.condition:
+                item, wait = self._next_command()
+                if item is None:
+                    self.condition.wait(wait)
+                    continue
+            player, command = item
+            try:
+                self.writer.write(player, command)
+            except Exception as e:
+                print(f"Error writing feedback: {e}")
+
+    def stop(self):
+        """Stop the writer thread and close the connection"""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread:
+            self.thread.join(timeout=1)
+        self.writer.close()
+
+
+# Process-wide service used by the games
+_service = None
+
+def start_feedback(writer=None, **kwargs):
+    """Start the shared feedback service (defaults to relaying through ESPtoPC)"""
+    global _service
+    if _service is None:
+        _service = FeedbackService(writer or SocketFeedbackWriter(), **kwargs)
+        _service.start()
+    return _service
+
+def stop_feedback():
+    """Stop the shared feedback service"""
+    global _service
+    if _service is not None:
+        _service.stop()
+        _service = None
+
+def feedback(player, kind, **params):
+    """
+    Send feedback to a player's controller without blocking
+
+    Args:
+        player (int): Player index (0-3)
+        kind (str): 'rumble', 'tone' or 'led'
+        **params: duration, frequency or mask (see format_command)
+
+    Does nothing if the feedback service hasn't been started.
+    """
+    if _service is None:
+        return
+    try:
+        _service.feedback(player, kind, **params)
+    except ValueError as e:
+        print(f"Invalid feedback request: {e}")
@@ -0,0 +1,68 @@
+# gameclock.py - One frame clock shared by the menu and every game
+#
+# Games ask the clock how long the last frame took (dt, in seconds) and
+# move things by speed * dt instead of a fixed amount per frame, so play
+# feels the same at 60 Hz, 144 Hz or uncapped. The frame cap is set in
+# one place: a fixed rate, NATIVE for the display's refresh rate, or
+# UNCAPPED for the lowest input latency.
+import time
+import pygame
+
+NATIVE = None  # Cap at the display's refresh rate
+UNCAPPED = 0
+FALLBACK_FPS = 60  # NATIVE when the display doesn't report its refresh rate
+MAX_DT = 0.25  # Longest frame a game is asked to catch up on, in seconds
+
+
+def refresh_rate():
+    """The display's refresh rate in Hz, or FALLBACK_FPS if it can't be read"""
+    # Only pygame-ce can ask SDL for it; plain pygame gets the fallback
+    get_rate = getattr(pygame.display, 'get_current_refresh_rate', None)
+    if get_rate is not None and pygame.display.get_init():
+        try:
+            rate = get_rate()
+            if rate > 0:
+                return rate
+        except pygame.error:
+            pass
+    return FALLBACK_FPS
+
+
+class GameClock:
+    def __init__(self, fps=NATIVE):
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.last = time.perf_counter()
+        self.dt = 0.0
+
+    def target_fps(self):
+        """The frame cap in frames per second (0 = uncapped)"""
+        return refresh_rate() if self.fps is NATIVE else self.fps
+
+    def tick(self, fps=None):
+        """
+        Wait out the rest of the frame and return the seconds since the last tick
+
+        fps overrides the clock's cap for this frame. dt is measured with
+        perf_counter rather than the whole milliseconds Clock.tick reports,
+        which are too coarse above 100 Hz, and is capped at MAX_DT so a
+        stall doesn't fling everything across the screen.
+        """
+        self.clock.tick(self.target_fps() if fps is None else fps)
+        now = time.perf_counter()
+        self.dt = min(now - self.last, MAX_DT)
+        self.last = now
+        return self.dt
+
+    def restart(self):
+        """Don't count the time since the last tick (after loading or switching scenes)"""
+        self.clock.tick()
+        self.last = time.perf_counter()
+        self.dt = 0.0
+
+    def get_fps(self):
+        return self.clock.get_fps()
+
+
+# Shared by the menu and every game
+clock = GameClock()
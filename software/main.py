@@ -1,11 +1,16 @@
 # main.py - Simplified version
 import pygame
+from assets import fonts
+from audio import audio, MUSIC_FADE_MS
+from gameclock import clock
+from displaymode import open_display
 import sys
 import time
 import os
 import traceback
 import random
 import json
+import argparse
 
 # Try to import event controller
 try:
@@ -14,12 +19,31 @@ except ImportError:
     print("Warning: Could not import EventController")
     EventController = None
 
+# Try to import controller feedback
+try:
+    from feedback import start_feedback, stop_feedback
+except ImportError:
+    print("Warning: Could not import feedback")
+    start_feedback = None
+    stop_feedback = None
+
+# Try to import the shared image/sound store
+try:
+    from resources import ResourceStore
+except ImportError:
+    print("Warning: Could not import ResourceStore")
+    ResourceStore = None
+
 # Try to import pong game
 try:
     from pong import run_pong
+    from pong_spectate import SPECTATOR_PORT  # Spectator screens can watch Pong on this port
+    from pong_bot import BOT_IDLE_SECONDS
 except ImportError:
     print("Warning: Could not import run_pong")
-    def run_pong(screen, player_count, events):
+    SPECTATOR_PORT = None
+    BOT_IDLE_SECONDS = None
+    def run_pong(screen, player_count, events, **options):
         print("Pong game not available")
         return -1
 
@@ -28,7 +52,7 @@ try:
     from shooting_stars import run_shooting_stars
 except ImportError:
     print("Warning: Could not import run_shooting_stars")
-    def run_shooting_stars(screen, player_count, external_events):
+    def run_shooting_stars(screen, player_count, external_events, resources=None):
         print("Shooting Stars game not available")
         return -1
 
@@ -56,7 +80,7 @@ def save_win_stats(stats):
 def draw_win_stats(screen, stats, font, center_x, y_pos):
     """Draw player win statistics on the menu screen"""
     # Draw heading
-    heading = font.render("Player Win Statistics:", True, (255, 255, 255))
+    heading = fonts.render(font, "Player Win Statistics:", True, (255, 255, 255))
     screen.blit(heading, (center_x - heading.get_width() // 2, y_pos))
     
     # Draw individual player stats
@@ -64,7 +88,7 @@ def draw_win_stats(screen, stats, font, center_x, y_pos):
     for i, player in enumerate(["Player 1", "Player 2", "Player 3", "Player 4"]):
         color = PLAYER_COLORS[i]
         text = f"{player}: {stats[player]}"
-        render = font.render(text, True, color)
+        render = fonts.render(font, text, True, color)
         screen.blit(render, (center_x - render.get_width() // 2, y_pos + y_offset))
         y_offset += 30
 
@@ -72,29 +96,44 @@ def draw_menu(screen, player_count):
     # ... existing menu drawing code ...
     
     # Add player count display
-    font = pygame.font.Font(None, 36)
-    player_text = font.render(f"Player Count: {player_count}", True, (255, 255, 255))
+    font = fonts.font(36)
+    player_text = fonts.render(font, f"Player Count: {player_count}", True, (255, 255, 255))
     player_rect = player_text.get_rect(center=(screen.get_width() // 2, screen.get_height() - 100))
     screen.blit(player_text, player_rect)
     
     # Add player count controls
-    controls_text = font.render("Press 2, 3, or 4 to set player count", True, (200, 200, 200))
+    controls_text = fonts.render(font, "Press 2, 3, or 4 to set player count", True, (200, 200, 200))
     controls_rect = controls_text.get_rect(center=(screen.get_width() // 2, screen.get_height() - 60))
     screen.blit(controls_text, controls_rect)
     
     # ... rest of menu drawing code ...
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="My Multi-Minigame Project")
+    parser.add_argument('--spectate', action='store_true', help="Stream Pong matches to spectator screens")
+    parser.add_argument('--spectate-host', default='localhost',
+                        help="Address to stream from (0.0.0.0 lets other machines watch)")
+    parser.add_argument('--fill-with-bots', action='store_true',
+                        help="Bots play the Pong sides nobody joined instead of walls")
+    parser.add_argument('--bot-idle-seconds', type=float, nargs='?', const=BOT_IDLE_SECONDS, default=None,
+                        help="A bot takes over a Pong player idle this many seconds "
+                             "(%(const)s if not given); off by default")
+    parser.add_argument('--multi-ball', type=int, default=0, metavar='N',
+                        help="Keep N extra balls in play for the whole Pong match")
+    parser.add_argument('--multi-ball-powerup', action='store_true',
+                        help="Spawn Pong orbs that split the ball into several")
+    args = parser.parse_args(argv)
+    spectator_port = SPECTATOR_PORT if args.spectate else None  # Off unless asked for
+
     # Initialize pygame
     pygame.init()
     
     # Initialize mixer for audio
     pygame.mixer.init()
     
-    # Set up fullscreen display
-    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    # Set up fullscreen display, drawn at a fixed resolution and scaled to the panel
+    screen = open_display()
     pygame.display.set_caption("My Multi-Minigame Project")
-    clock = pygame.time.Clock()
     
     # Menu state
     menu_selected = 0
@@ -116,10 +155,20 @@ def main():
         except Exception as e:
             print(f"Error starting event controller: {e}")
     
+    # Start the feedback service (rumble/tone/LED commands relayed by ESPtoPC)
+    if start_feedback is not None:
+        start_feedback()
+    
+    # Read every game's images and sounds in the background while the menu is up
+    resources = None
+    if ResourceStore is not None:
+        resources = ResourceStore()
+        resources.start()
+    
     # Fonts
-    title_font = pygame.font.Font(None, 100)
-    menu_font = pygame.font.Font(None, 74)
-    info_font = pygame.font.Font(None, 36)
+    title_font = fonts.font(100)
+    menu_font = fonts.font(74)
+    info_font = fonts.font(36)
     
     # For debouncing external events
     last_event_time = 0
@@ -129,36 +178,17 @@ def main():
     running = True
     state = "menu"  # Possible states: "menu", "pong", "shooting_stars"
     
-    # Load sound files
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    win_sound = None
-    try:
-        # Load main menu music
-        menu_music_path = os.path.join(current_dir, "main-menu.mp3")
-        win_sound_path = os.path.join(current_dir, "win-sound.mp3")
-        
-        # Load and play menu music
-        pygame.mixer.music.load(menu_music_path)
-        pygame.mixer.music.set_volume(0.4)  # Set volume to 40%
-        pygame.mixer.music.play(-1)  # Loop indefinitely
-        
-        # Load win sound effect
-        win_sound = pygame.mixer.Sound(win_sound_path)
-        win_sound.set_volume(0.7)  # Set volume to 70%
-    except Exception as e:
-        print(f"Error loading sound files: {e}")
+    # Sound effects come from the same store as the games'
+    if resources is not None:
+        audio.resources = resources
     
     try:
         while running:
             # Handle events based on current state
             if state == "menu":
-                # Ensure menu music is playing
-                if not pygame.mixer.music.get_busy():
-                    try:
-                        pygame.mixer.music.load(menu_music_path)
-                        pygame.mixer.music.play(-1)
-                    except Exception as e:
-                        print(f"Error playing menu music: {e}")
+                # Ensure menu music is playing (fades in after a game's track fades out)
+                audio.play_music("main-menu.mp3", 0.4)  # Set volume to 40%
+                audio.update()
                 
                 # Fill background
                 screen.fill((30, 30, 30))
@@ -177,12 +207,12 @@ def main():
                         elif event.key == pygame.K_RETURN:
                             selected_option = menu_options[menu_selected][1]
                             if selected_option == "pong":
-                                # Stop menu music before starting the game
-                                pygame.mixer.music.stop()
+                                # Fade menu music out as the game starts
+                                audio.stop_music(MUSIC_FADE_MS)
                                 state = "pong"
                             elif selected_option == "shooting_stars":
-                                # Stop menu music before starting the game
-                                pygame.mixer.music.stop()
+                                # Fade menu music out as the game starts
+                                audio.stop_music(MUSIC_FADE_MS)
                                 state = "shooting_stars"
                             elif selected_option == "quit":
                                 running = False
@@ -215,12 +245,12 @@ def main():
                                     selected_option = menu_options[menu_selected][1]
                                     print(f"Selected option: {selected_option}")
                                     if selected_option == "pong":
-                                        # Stop menu music before starting the game
-                                        pygame.mixer.music.stop()
+                                        # Fade menu music out as the game starts
+                                        audio.stop_music(MUSIC_FADE_MS)
                                         state = "pong"
                                     elif selected_option == "shooting_stars":
-                                        # Stop menu music before starting the game
-                                        pygame.mixer.music.stop()
+                                        # Fade menu music out as the game starts
+                                        audio.stop_music(MUSIC_FADE_MS)
                                         state = "shooting_stars"
                                     elif selected_option == "quit":
                                         running = False
@@ -233,14 +263,14 @@ def main():
                 center_y = screen_height // 2
                 
                 # Draw title
-                title_text = title_font.render("Mini-Games", True, (255, 255, 255))
+                title_text = fonts.render(title_font, "Mini-Games", True, (255, 255, 255))
                 screen.blit(title_text, (center_x - title_text.get_width() // 2, 50))
                 
                 # Draw menu options
                 menu_y_start = center_y - 150
                 for idx, (text, _) in enumerate(menu_options):
                     color = (255, 0, 0) if idx == menu_selected else (255, 255, 255)
-                    label = menu_font.render(text, True, color)
+                    label = fonts.render(menu_font, text, True, color)
                     screen.blit(label, (center_x - label.get_width() // 2, 
                                       menu_y_start + idx * 100))
                 
@@ -249,19 +279,23 @@ def main():
                 draw_win_stats(screen, player_wins, info_font, center_x, win_stats_y)
                 
                 # Add player count display
-                player_text = info_font.render(f"Player Count: {player_count}", True, (255, 255, 255))
+                player_text = fonts.render(info_font, f"Player Count: {player_count}", True, (255, 255, 255))
                 player_rect = player_text.get_rect(center=(screen_width // 2, screen_height - 100))
                 screen.blit(player_text, player_rect)
                 
                 # Add player count controls
-                controls_text = info_font.render("Press 2, 3, or 4 to set player count", True, (200, 200, 200))
+                controls_text = fonts.render(info_font, "Press 2, 3, or 4 to set player count", True, (200, 200, 200))
                 controls_rect = controls_text.get_rect(center=(screen_width // 2, screen_height - 60))
                 screen.blit(controls_text, controls_rect)
             
             elif state == "pong":
                 print("Starting Pong game...")
                 # Run pong with specified player count and get the winner
-                winner = run_pong(screen, player_count, controller.get_events() if controller else None)
+                # Pass the controller itself so the game keeps draining live events
+                winner = run_pong(screen, player_count, controller, resources=resources,
+                                  spectator_port=spectator_port, spectator_host=args.spectate_host,
+                                  fill_with_bots=args.fill_with_bots, bot_idle_seconds=args.bot_idle_seconds,
+                                  multi_ball=args.multi_ball, multi_ball_powerup=args.multi_ball_powerup)
                 print(f"Pong game returned result: {winner}")
                 
                 # Update win count ONLY if there was a valid winner (>= 0)
@@ -270,41 +304,32 @@ def main():
                     player_wins[player] += 1
                     print(f"{player} won! Total wins: {player_wins[player]}")
                     
-                    # Only play win sound if it wasn't already played in the game
-                    if win_sound and not pygame.mixer.get_busy():
-                        win_sound.play()
-                        # Wait for sound to finish (or set a timer)
-                        pygame.time.delay(1000)  # Wait 1 second
-                        pygame.mixer.stop()  # Stop all sounds
+                    # Only play win sound if it wasn't already played in the game (cut off after 1 second)
+                    if not pygame.mixer.get_busy():
+                        audio.play_effect("win-sound.mp3", 0.7, maxtime=1000)
                 else:
                     print("Pong game ended without a winner")
                 
-                # Force a small delay before returning to menu to let any sounds finish
-                pygame.time.delay(500)
                 state = "menu"  # Return to menu after the game finishes
             
             elif state == "shooting_stars":
                 # Run the Shooting Stars game
-                winner = run_shooting_stars(screen, player_count, controller.get_events() if controller else None)
+                winner = run_shooting_stars(screen, player_count, controller.get_events() if controller else None,
+                                            resources=resources)
                 # Update win stats
                 if winner != -1:
                     player = f"Player {winner + 1}"
                     player_wins[player] += 1
                     
-                    # Play win sound if available and not already played in the game
-                    if win_sound and winner >= 0:
-                        win_sound.play()
-                        # Wait briefly for sound to start then stop it
-                        pygame.time.delay(1000)  # Wait 1 second
-                        pygame.mixer.stop()  # Stop all sounds
+                    # Play win sound if available (cut off after 1 second)
+                    if winner >= 0:
+                        audio.play_effect("win-sound.mp3", 0.7, maxtime=1000)
                 
-                # Force a small delay before returning to menu
-                pygame.time.delay(500)
                 state = "menu"  # Return to menu after the game finishes
             
             # Update display
             pygame.display.flip()
-            clock.tick(60)
+            clock.tick()
     
     except Exception as e:
         print(f"Error in main loop: {e}")
@@ -315,11 +340,13 @@ def main():
         save_win_stats(player_wins)
         
         # Stop all sounds
-        pygame.mixer.music.stop()
+        audio.stop_music()
         
         # Cleanup event controller if it was initialized
         if controller:
             controller.stop()
+        if stop_feedback is not None:
+            stop_feedback()
         pygame.quit()
         sys.exit()
 
@@ -1,5 +1,6 @@
 # menu.py
 import pygame
+from assets import fonts
 
 # Global menu state
 _selected = 0
@@ -8,7 +9,7 @@ _menu_options = [("Minigame 1", "minigame1"), ("Minigame 2", "minigame2"), ("Qui
 def show_menu(screen, external_events=None):
     global _selected, _menu_options
     
-    font = pygame.font.Font(None, 74)
+    font = fonts.font(74)
     
     # Process external events
     if external_events:
@@ -25,7 +26,7 @@ def show_menu(screen, external_events=None):
     screen.fill((30, 30, 30))
     for idx, (text, _) in enumerate(_menu_options):
         color = (255, 0, 0) if idx == _selected else (255, 255, 255)
-        label = font.render(text, True, color)
+        label = fonts.render(font, text, True, color)
         screen.blit(label, (100, 100 + idx * 100))
     
     # Process pygame events
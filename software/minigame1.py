@@ -1,15 +1,16 @@
 # minigame1.py - 4 Player Pong
 import pygame
+from assets import fonts, overlays
+from gameclock import clock
 import math
 import random
 import time
 
 def run_minigame1(screen, external_events=None):
     # Initialize game variables
-    clock = pygame.time.Clock()
     running = True
-    font = pygame.font.Font(None, 36)
-    large_font = pygame.font.Font(None, 100)
+    font = fonts.font(36)
+    large_font = fonts.font(100)
     
     # Screen dimensions
     WIDTH, HEIGHT = screen.get_size()
@@ -35,13 +36,14 @@ def run_minigame1(screen, external_events=None):
     # Paddle settings
     PADDLE_WIDTH = 100
     PADDLE_HEIGHT = 15
-    PADDLE_SPEED = 8
-    PADDLE_HIT_DURATION = 10  # frames
+    PADDLE_SPEED = 480  # pixels per second
+    PADDLE_NUDGE = PADDLE_SPEED / 60  # pixels per controller move event
+    PADDLE_HIT_DURATION = 1 / 6  # seconds
     PADDLE_HIT_DISTANCE = 20  # pixels
     
     # Ball settings
     BALL_RADIUS = 10
-    BALL_SPEED = 5
+    BALL_SPEED = 300  # pixels per second
     
     # Player states - [x, y, width, height, direction, hit_timer]
     # Direction: 0=top, 1=right, 2=bottom, 3=left
@@ -74,8 +76,10 @@ def run_minigame1(screen, external_events=None):
     countdown_duration = 5  # seconds
     
     # Game loop
+    clock.restart()
     while running:
         current_time = time.time()
+        dt = clock.tick()  # Seconds since the last frame
         
         # Process pygame events
         for event in pygame.event.get():
@@ -94,36 +98,36 @@ def run_minigame1(screen, external_events=None):
         # Player 1 (Top) controls - W/A/S/D
         if players_alive[0]:
             if keys[pygame.K_a]:
-                paddles[0][0] = max(GAME_MARGIN, paddles[0][0] - PADDLE_SPEED)
+                paddles[0][0] = max(GAME_MARGIN, paddles[0][0] - PADDLE_SPEED * dt)
             if keys[pygame.K_d]:
-                paddles[0][0] = min(GAME_MARGIN + GAME_WIDTH - paddles[0][2], paddles[0][0] + PADDLE_SPEED)
+                paddles[0][0] = min(GAME_MARGIN + GAME_WIDTH - paddles[0][2], paddles[0][0] + PADDLE_SPEED * dt)
             if keys[pygame.K_s] and paddles[0][5] == 0 and game_started:
                 paddles[0][5] = PADDLE_HIT_DURATION
         
         # Player 2 (Right) controls - Arrow keys
         if players_alive[1]:
             if keys[pygame.K_UP]:
-                paddles[1][1] = max(GAME_MARGIN, paddles[1][1] - PADDLE_SPEED)
+                paddles[1][1] = max(GAME_MARGIN, paddles[1][1] - PADDLE_SPEED * dt)
             if keys[pygame.K_DOWN]:
-                paddles[1][1] = min(GAME_MARGIN + GAME_HEIGHT - paddles[1][3], paddles[1][1] + PADDLE_SPEED)
+                paddles[1][1] = min(GAME_MARGIN + GAME_HEIGHT - paddles[1][3], paddles[1][1] + PADDLE_SPEED * dt)
             if keys[pygame.K_LEFT] and paddles[1][5] == 0 and game_started:
                 paddles[1][5] = PADDLE_HIT_DURATION
         
         # Player 3 (Bottom) controls - I/J/K/L
         if players_alive[2]:
             if keys[pygame.K_j]:
-                paddles[2][0] = max(GAME_MARGIN, paddles[2][0] - PADDLE_SPEED)
+                paddles[2][0] = max(GAME_MARGIN, paddles[2][0] - PADDLE_SPEED * dt)
             if keys[pygame.K_l]:
-                paddles[2][0] = min(GAME_MARGIN + GAME_WIDTH - paddles[2][2], paddles[2][0] + PADDLE_SPEED)
+                paddles[2][0] = min(GAME_MARGIN + GAME_WIDTH - paddles[2][2], paddles[2][0] + PADDLE_SPEED * dt)
             if keys[pygame.K_i] and paddles[2][5] == 0 and game_started:
                 paddles[2][5] = PADDLE_HIT_DURATION
         
         # Player 4 (Left) controls - Numpad
         if players_alive[3]:
             if keys[pygame.K_KP8]:
-                paddles[3][1] = max(GAME_MARGIN, paddles[3][1] - PADDLE_SPEED)
+                paddles[3][1] = max(GAME_MARGIN, paddles[3][1] - PADDLE_SPEED * dt)
             if keys[pygame.K_KP5]:
-                paddles[3][1] = min(GAME_MARGIN + GAME_HEIGHT - paddles[3][3], paddles[3][1] + PADDLE_SPEED)
+                paddles[3][1] = min(GAME_MARGIN + GAME_HEIGHT - paddles[3][3], paddles[3][1] + PADDLE_SPEED * dt)
             if keys[pygame.K_KP6] and paddles[3][5] == 0 and game_started:
                 paddles[3][5] = PADDLE_HIT_DURATION
         
@@ -136,28 +140,28 @@ def run_minigame1(screen, external_events=None):
                 if 0 <= player < 4 and players_alive[player]:
                     if action == 'left' or action == 'up':
                         if player == 0 or player == 2:  # Top/Bottom players
-                            paddles[player][0] = max(GAME_MARGIN, paddles[player][0] - PADDLE_SPEED)
+                            paddles[player][0] = max(GAME_MARGIN, paddles[player][0] - PADDLE_NUDGE)
                         else:  # Left/Right players
-                            paddles[player][1] = max(GAME_MARGIN, paddles[player][1] - PADDLE_SPEED)
+                            paddles[player][1] = max(GAME_MARGIN, paddles[player][1] - PADDLE_NUDGE)
                     elif action == 'right' or action == 'down':
                         if player == 0 or player == 2:  # Top/Bottom players
                             paddles[player][0] = min(GAME_MARGIN + GAME_WIDTH - paddles[player][2], 
-                                                    paddles[player][0] + PADDLE_SPEED)
+                                                    paddles[player][0] + PADDLE_NUDGE)
                         else:  # Left/Right players
                             paddles[player][1] = min(GAME_MARGIN + GAME_HEIGHT - paddles[player][3], 
-                                                    paddles[player][1] + PADDLE_SPEED)
+                                                    paddles[player][1] + PADDLE_NUDGE)
                     elif action == 'hit' and paddles[player][5] == 0 and game_started:
                         paddles[player][5] = PADDLE_HIT_DURATION
         
         # Update paddle hit animations
         for i in range(4):
             if paddles[i][5] > 0:
-                paddles[i][5] -= 1
+                paddles[i][5] = max(0.0, paddles[i][5] - dt)
         
         # Update ball position only if game has started
         if game_started:
-            next_ball_x = ball_x + ball_dx
-            next_ball_y = ball_y + ball_dy
+            next_ball_x = ball_x + ball_dx * dt
+            next_ball_y = ball_y + ball_dy * dt
             
             # Check for collisions with paddles
             collision_occurred = False
@@ -242,8 +246,8 @@ def run_minigame1(screen, external_events=None):
                 ball_y = next_ball_y
             else:
                 # If collision occurred, move ball in new direction
-                ball_x += ball_dx
-                ball_y += ball_dy
+                ball_x += ball_dx * dt
+                ball_y += ball_dy * dt
             
             # Check for collisions with walls and eliminate players
             if ball_x - BALL_RADIUS < GAME_MARGIN:  # Left wall
@@ -295,15 +299,15 @@ def run_minigame1(screen, external_events=None):
                 screen.fill(BLACK)
                 if winner >= 0:
                     winner_text = f"Player {winner + 1} Wins!"
-                    text_surface = font.render(winner_text, True, PLAYER_COLORS[winner])
+                    text_surface = fonts.render(font, winner_text, True, PLAYER_COLORS[winner])
                 else:
-                    text_surface = font.render("Draw!", True, WHITE)
+                    text_surface = fonts.render(font, "Draw!", True, WHITE)
                 
                 text_rect = text_surface.get_rect(center=(CENTER_X, CENTER_Y))
                 screen.blit(text_surface, text_rect)
                 
                 # Display return message
-                return_text = font.render("Press ESC to return to menu", True, WHITE)
+                return_text = fonts.render(font, "Press ESC to return to menu", True, WHITE)
                 return_rect = return_text.get_rect(center=(CENTER_X, CENTER_Y + 50))
                 screen.blit(return_text, return_rect)
                 
@@ -318,7 +322,7 @@ def run_minigame1(screen, external_events=None):
                         elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                             waiting = False
                             running = False
-                    clock.tick(60)
+                    clock.tick()
                 
                 continue
         
@@ -370,7 +374,7 @@ def run_minigame1(screen, external_events=None):
         for i, alive in enumerate(players_alive):
             status = "Alive" if alive else "Dead"
             color = PLAYER_COLORS[i] if alive else WALL_COLOR
-            text = font.render(f"Player {i+1}: {status}", True, color)
+            text = fonts.render(font, f"Player {i+1}: {status}", True, color)
             
             if i == 0:  # Top
                 screen.blit(text, (10, 10))
@@ -382,15 +386,13 @@ def run_minigame1(screen, external_events=None):
                 screen.blit(text, (WIDTH - text.get_width() - 10, HEIGHT - text.get_height() - 10))
         
         # Draw controls info
-        controls_text = font.render("ESC: Return to Menu", True, WHITE)
+        controls_text = fonts.render(font, "ESC: Return to Menu", True, WHITE)
         screen.blit(controls_text, (CENTER_X - controls_text.get_width()//2, 10))
         
         # Draw countdown if game hasn't started
         if not game_started:
             # Semi-transparent overlay
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 128))  # Black with 50% transparency
-            screen.blit(overlay, (0, 0))
+            overlays.draw(screen, (0, 0, 0, 128))  # Black with 50% transparency
             
             # Calculate remaining time
             remaining = countdown_duration - (current_time - countdown_start)
@@ -400,12 +402,12 @@ def run_minigame1(screen, external_events=None):
                 countdown_text = str(int(remaining) + 1)
             
             # Draw countdown text
-            text_surface = large_font.render(countdown_text, True, WHITE)
+            text_surface = fonts.render(large_font, countdown_text, True, WHITE)
             text_rect = text_surface.get_rect(center=(CENTER_X, CENTER_Y))
             screen.blit(text_surface, text_rect)
             
             # Draw "Get Ready" text
-            ready_text = font.render("Get Ready!", True, WHITE)
+            ready_text = fonts.render(font, "Get Ready!", True, WHITE)
             ready_rect = ready_text.get_rect(center=(CENTER_X, CENTER_Y - 80))
             screen.blit(ready_text, ready_rect)
             
@@ -418,9 +420,8 @@ def run_minigame1(screen, external_events=None):
             ]
             
             for i, control in enumerate(controls):
-                control_text = font.render(control, True, PLAYER_COLORS[i])
+                control_text = fonts.render(font, control, True, PLAYER_COLORS[i])
                 control_rect = control_text.get_rect(center=(CENTER_X, CENTER_Y + 80 + i * 30))
                 screen.blit(control_text, control_rect)
         
         pygame.display.flip()
-        clock.tick(60)
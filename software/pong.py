@@ -6,9 +6,16 @@ import random
 import math
 import traceback
 from pong_utils import *
-from pong_paddle import Paddle
-from pong_ball import Ball
-from pong_fever import FeverOrb, FeverEffect
+from pong_sim import PongSimulation, NO_INPUT
+from pong_replay import InputLog
+from pong_bot import PongBot, PLAYER_SLOTS
+from pong_spectate import SpectatorServer
+from feedback import feedback
+from assets import sprites, fonts, overlays
+from resources import store
+from audio import audio
+from profiler import FrameProfiler
+from gameclock import clock
 
 # Define constants if they don't exist elsewhere
 if not 'PLAYER_COLORS' in globals():
@@ -25,27 +32,57 @@ if not 'WALL_COLOR' in globals():
 if not 'PLAYER_STARTING_LIVES' in globals():
     PLAYER_STARTING_LIVES = 3
 
+PONG_MUSIC = "pong.mp3"  # Background track, if there is one
+
 # Create a Pong game class that can be initialized and run as a state
 class PongGame:
-    def __init__(self, screen=None, player_count=4, event_handler=None):
+    def __init__(self, screen=None, player_count=4, event_handler=None,
+                 simulation_rate=SIMULATION_RATE, display_fps=DISPLAY_FPS, resources=None,
+                 fill_with_bots=False, bot_idle_seconds=None,
+                 multi_ball=0, multi_ball_powerup=False, spectator_port=None, spectator_host='localhost',
+                 net=None):
         """Initialize the Pong game state"""
         self.screen = screen
+        self.resources = resources if resources is not None else store  # Images and sounds, loaded once
         self.player_count = player_count
         self.event_handler = event_handler
         self.running = False
         self.initialized = False
         self.clock = None
+        
+        # Fixed-timestep simulation, rendered independently of the display rate
+        self.simulation_rate = simulation_rate
+        self.display_fps = display_fps  # None follows the shared clock, 0 means uncapped
+        self.sim_dt = 1.0 / simulation_rate
+        self.accumulator = 0.0
+        self.prev_ball_pos = None
+        self.prev_paddle_pos = None
         self.font = None
-        self.game_started = False
-        self.game_over = False
-        self.winner = None
-        self.paddles = None
-        self.ball = None
-        self.players_alive = [True, True, True, True]
-        self.player_lives = [PLAYER_STARTING_LIVES] * 4
+        self.sim = None  # Created in initialize() once the screen size is known
+        self.input_log = None  # Per-tick inputs of the match, for replays
+        self.multi_ball = multi_ball  # Extra balls in play all match
+        self.multi_ball_powerup = multi_ball_powerup  # Orbs that split the ball
+        self.prev_extra_balls = None
+        self.spectator_port = spectator_port  # Stream every tick to spectator screens on this port
+        self.spectator_host = spectator_host  # Address the stream is bound to
+        self.spectators = None
+        self.net = net  # A connected NetClient: play one side of a match run by a NetServer
+        self.profiler = FrameProfiler()  # Per-phase frame timings, F2 shows the graph
+        self.pending_moves = [0.0] * 4  # Middleware input waiting for the next simulation step
+        self.pending_hits = [False] * 4
+        
+        # Computer players for the slots nobody joined (instead of walls) and, if bot_idle_seconds
+        # is set, for humans idle that long
+        self.fill_with_bots = fill_with_bots
+        self.bot_idle_ticks = int(bot_idle_seconds * simulation_rate) if bot_idle_seconds else None
+        self.bots = {}
+        self.bot_slots = set()  # Players the bots always control
+        self.last_active_tick = [0] * 4  # Simulation tick of each player's last input
         self.bg_image = None
-        self.fever_effect = None
-        self.fever_orb = None
+        self.background = None  # Static layer (background, boundary, walls) for dirty-rect redraws
+        self.background_key = None
+        self.dirty_rects = []  # Where moving objects were drawn last frame
+        self.full_redraw = True
         self.pokemon_sprites = {}
         self.player_pokemon = {}
         self.start_time = pygame.time.get_ticks()
@@ -61,6 +98,51 @@ class PongGame:
         if not pygame.mixer.get_init():
             pygame.mixer.init()
 
+    # Game state lives in the simulation; these keep the old attribute names working
+    @property
+    def ball(self):
+        return self.sim.ball if self.sim else None
+
+    @property
+    def paddles(self):
+        return self.sim.paddles if self.sim else None
+
+    @property
+    def players_alive(self):
+        return self.sim.players_alive if self.sim else [True, True, True, True]
+
+    @property
+    def player_lives(self):
+        return self.sim.player_lives if self.sim else [PLAYER_STARTING_LIVES] * 4
+
+    @property
+    def fever_effect(self):
+        return self.sim.fever_effect if self.sim else None
+
+    @property
+    def fever_orb(self):
+        return self.sim.fever_orb if self.sim else None
+
+    @property
+    def game_over(self):
+        return self.sim.game_over if self.sim else False
+
+    @property
+    def winner(self):
+        return self.sim.winner if self.sim else None
+
+    @property
+    def game_started(self):
+        return self.sim.game_started if self.sim else False
+
+    @game_started.setter
+    def game_started(self, started):
+        if started:
+            self.sim.start()
+        else:
+            self.sim.game_started = False
+            self.sim.ball.game_started = False
+
     def initialize(self, player_count=4):
         """Initialize pygame and game resources"""
         print(f"Initializing Pong game with player_count={player_count}")
@@ -84,148 +166,62 @@ class PongGame:
             print(f"Screen dimensions: {self.WIDTH}x{self.HEIGHT}")
             
             # Initialize resources
-            self.clock = pygame.time.Clock()
-            self.font = pygame.font.Font(None, 36)
+            self.clock = clock
+            self.font = fonts.font(36)
             
             # Get game area
             self.GAME_RECT = get_square_game_rect(self.WIDTH, self.HEIGHT)
             print(f"Game area: {self.GAME_RECT}")
             
-            # Calculate dimensions
-            try:
-                dims = calculate_game_dimensions(self.WIDTH, self.HEIGHT)
-                self.ball_radius = dims.get('ball_radius', 15)
-                self.ball_speed = dims.get('ball_speed', 7.5)
-                self.paddle_hit_distance = dims.get('paddle_hit_distance', 10)
-                self.fever_orb_radius = dims.get('fever_orb_radius', 30)
-                print(f"Ball radius: {self.ball_radius}, Ball speed: {self.ball_speed}")
-            except Exception as e:
-                print(f"Error calculating dimensions: {e}")
-                self.ball_radius = 15
-                self.ball_speed = 7.5
-                self.paddle_hit_distance = 10
-                self.fever_orb_radius = 30
-            
-            # Load pokemon sprites
-            self.load_pokemon_sprites()
-            
             # Store player count
             self.player_count = player_count
             
-            # Get the center of the game field
-            center_x = self.GAME_RECT.centerx
-            center_y = self.GAME_RECT.centery
-            
-            # Determine the short dimension for consistent positioning
-            short_dim = min(self.GAME_RECT.width, self.GAME_RECT.height)
-            
-            # Define paddle dimensions
-            paddle_long = int(short_dim * 0.15)  # 15% of short dimension
-            paddle_short = int(short_dim * 0.02)  # 2% of short dimension
-            hit_distance = int(short_dim * 0.05)  # 5% of short dimension
-            
-            # Distance from center to paddles (47.5% of short dimension)
-            paddle_distance = int(short_dim * 0.475)
-            
-            # Initialize paddles with proper orientation
-            self.paddles = [
-                # Top paddle (horizontal) - width is longer than height
-                Paddle(center_x, center_y - paddle_distance, 
-                      paddle_long, paddle_short, 0, hit_distance),
-                
-                # Right paddle (vertical) - IMPORTANT: For right paddle (direction 1), 
-                # width and height need to be swapped in a different way due to Paddle.get_rect() implementation
-                Paddle(center_x + paddle_distance, center_y, 
-                      paddle_long, paddle_short, 1, hit_distance),
-                
-                # Bottom paddle (horizontal) - width is longer than height
-                Paddle(center_x, center_y + paddle_distance, 
-                      paddle_long, paddle_short, 2, hit_distance),
+            # The simulation owns the ball, paddles, lives and fever state
+            if self.net is not None:
+                # A networked match: the server's copy is the real one (and records it)
+                self.sim = self.net.sim
+                print(f"Playing side {self.net.player + 1} of a networked match")
+            else:
+                self.sim = PongSimulation(self.WIDTH, self.HEIGHT, 4 if self.fill_with_bots else player_count,
+                                          multi_ball=self.multi_ball, multi_ball_powerup=self.multi_ball_powerup,
+                                          rate=self.simulation_rate)
                 
-                # Left paddle (vertical) - IMPORTANT: For left paddle (direction 3),
-                # width and height need to be swapped in a different way due to Paddle.get_rect() implementation
-                Paddle(center_x - paddle_distance, center_y, 
-                      paddle_long, paddle_short, 3, hit_distance)
-            ]
-
-            self.ball = Ball(self.GAME_RECT.centerx, self.GAME_RECT.centery, 
-                           self.ball_radius, self.ball_speed)
+                # Every tick's inputs, so the match can be replayed exactly
+                self.input_log = InputLog.for_simulation(self.sim)
+            print(f"Ball radius: {self.sim.ball_radius}, Ball speed: {self.sim.ball_speed}")
+            print(f"Match seed: {self.sim.seed}")
+            
+            # Let marquee displays and streaming PCs watch without capturing the screen
+            if self.spectator_port is not None and self.spectators is None:
+                self.spectators = SpectatorServer(self.spectator_host, self.spectator_port)
+                if not self.spectators.start():
+                    self.spectators = None
+            
+            # A bot for every side, playing the empty ones and standing in for idle players
+            # (in a networked match the server plays the empty sides)
+            self.bots = {} if self.net else {i: PongBot(i, self.simulation_rate) for i in range(4)}
+            if self.fill_with_bots:
+                self.bot_slots = set(PLAYER_SLOTS[player_count:])
+                print(f"Bots playing sides: {sorted(self.bot_slots)}")
+            
+            # Render the ball's speed effect for every color it can flash
+            prepare_ball_effects(self.sim.ball_radius, [(255, 255, 255), self.ball.boost_color, BALL_BOOST_COLOR])
+            
+            # Load pokemon sprites
+            self.load_pokemon_sprites()
             
             # Load background
             try:
-                bg_path = os.path.join(os.path.dirname(__file__), "pong-bg.jpg")
-                if os.path.exists(bg_path):
-                    self.bg_image = pygame.image.load(bg_path)
-                    self.bg_image = pygame.transform.scale(self.bg_image, (self.WIDTH, self.HEIGHT))
+                self.bg_image = self.resources.image("pong-bg.jpg", (self.WIDTH, self.HEIGHT))
             except Exception as e:
                 print(f"Could not load background image: {e}")
                 self.bg_image = None
             
-            # Initialize fever mode
-            self.fever_effect = FeverEffect(FEVER_DURATION)
-            self.fever_orb = None
-            
-            # Load and play background music
-            try:
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                bg_music_path = os.path.join(current_dir, "pong.mp3")
-                
-                # If pong.mp3 doesn't exist, look for any other mp3 file we can use
-                if not os.path.exists(bg_music_path):
-                    # Just create a file list and check for mp3s that aren't win-sound or main-menu
-                    files = os.listdir(current_dir)
-                    for file in files:
-                        if file.endswith(".mp3") and file != "win-sound.mp3" and file != "main-menu.mp3" and file != "shooting-stars.mp3":
-                            bg_music_path = os.path.join(current_dir, file)
-                            break
-                
-                # Load and play the background music if found
-                if os.path.exists(bg_music_path):
-                    pygame.mixer.music.load(bg_music_path)
-                    pygame.mixer.music.set_volume(0.4)  # 40% volume
-                    pygame.mixer.music.play(-1)  # Loop indefinitely
-            
-            except Exception as e:
-                print(f"Error loading pong music: {e}")
+            # Background music, faded in over whatever was playing
+            audio.play_music(PONG_MUSIC, 0.4)  # 40% volume
             
-            # Explicitly set game to not started
-            self.game_started = False
-            
-            # Make sure these values are properly initialized
-            self.game_over = False
-            self.winner = None
-            
-            # Make sure all players start with lives
-            self.players_alive = [False, False, False, False]
-            self.player_lives = [0, 0, 0, 0]
-            
-            # SWAPPED LOGIC: Player 1 (top) is always active
-            self.players_alive[0] = True
-            self.player_lives[0] = PLAYER_STARTING_LIVES
-            
-            # For 2 players, enable player 2 (bottom) - SWAPPED
-            if player_count >= 2:
-                self.players_alive[2] = True  # Bottom player is now Player 2
-                self.player_lives[2] = PLAYER_STARTING_LIVES
-            
-            # For 3 players, enable player 3 (right) - SWAPPED
-            if player_count >= 3:
-                self.players_alive[1] = True  # Right player is now Player 3
-                self.player_lives[1] = PLAYER_STARTING_LIVES
-            
-            # For 4 players, enable player 4 (left) - unchanged
-            if player_count >= 4:
-                self.players_alive[3] = True
-                self.player_lives[3] = PLAYER_STARTING_LIVES
-            
-            # Load and play win sound
-            try:
-                win_sound_path = os.path.join(current_dir, "win-sound.mp3")
-                if os.path.exists(win_sound_path):
-                    self.win_sound = pygame.mixer.Sound(win_sound_path)
-                    self.win_sound.set_volume(0.7)  # 70% volume
-            except Exception as e:
-                print(f"Error loading win sound: {e}")
+            # Win sound (already decoded if the menu preloaded it)
+            self.win_sound = self.resources.sound("win-sound.mp3", 0.7)  # 70% volume
             
             self.initialized = True
             return True
@@ -243,7 +239,7 @@ class PongGame:
             try:
                 sprite_path = os.path.join(os.path.dirname(__file__), f'{name}.png')
                 if os.path.exists(sprite_path):
-                    sprite = pygame.image.load(sprite_path)
+                    sprite = self.resources.image(sprite_path)
                     self.pokemon_sprites[name] = sprite
                 else:
                     print(f"Sprite file not found: {sprite_path}")
@@ -277,52 +273,29 @@ class PongGame:
     
     def reset_game(self):
         """Reset the game state"""
-        self.game_started = False
-        self.game_over = False
-        self.winner = None
-        self.players_alive = [True, True, True, True]
-        self.player_lives = [PLAYER_STARTING_LIVES] * 4
-        self.ball.reset(self.GAME_RECT.centerx, self.GAME_RECT.centery)
-        for paddle in self.paddles:
-            self.reset_paddle_position(paddle)
-        self.fever_orb = None
+        if self.net:
+            return  # The server starts the next match
+        self.sim.reset_game()
+        self.input_log.mark_reset()
+        self.last_active_tick = [self.sim.tick] * 4
+        self.show_win_screen = False
+        self.win_sound_played = False
     
     def reset_paddle_position(self, paddle):
         """Reset paddle to center position"""
-        # Get center coordinates and distance
-        center_x = self.GAME_RECT.centerx
-        center_y = self.GAME_RECT.centery
-        short_dim = min(self.GAME_RECT.width, self.GAME_RECT.height)
-        
-        # Use EXACTLY the same distance as initialization (47.5% of short dimension)
-        paddle_distance = int(short_dim * 0.475)
-        
-        # Reset to EXACT same positions as initialization
-        # IMPORTANT: Mimic the exact same positioning logic from initialize()
-        if paddle.direction == 0:  # Top
-            paddle.x = center_x  # Paddle constructor will center itself
-            paddle.y = center_y - paddle_distance
-        elif paddle.direction == 1:  # Right
-            paddle.x = center_x + paddle_distance
-            paddle.y = center_y
-        elif paddle.direction == 2:  # Bottom
-            paddle.x = center_x
-            paddle.y = center_y + paddle_distance
-        elif paddle.direction == 3:  # Left
-            paddle.x = center_x - paddle_distance
-            paddle.y = center_y
+        self.sim.reset_paddle_position(paddle)
     
     def handle_events(self, events):
         """Process pygame events"""
         for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
-                pygame.mixer.music.stop()
+                audio.stop_music()
                 return False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
-                    pygame.mixer.music.stop()
+                    audio.stop_music()
                     return False
                 elif event.key == pygame.K_SPACE and not self.game_started:
                     print("Space pressed - starting game!")
@@ -332,201 +305,209 @@ class PongGame:
         
         return True
     
-    def update(self):
-        """Update game state"""
-        if not self.game_started:
-            return
-        
+    def update(self, inputs=None):
+        """Advance the simulation one step and react to what happened"""
         try:
-            # Update paddles
-            for paddle in self.paddles:
-                paddle.update()
-            
-            # Update fever effect
-            self.fever_effect.update()
-            
-            # Update fever orb if it exists
-            if self.fever_orb:
-                self.fever_orb.update()
-                
-                # Check for collision with ball
-                if self.fever_orb.check_collision(self.ball.get_rect()):
-                    self.fever_effect.activate()
-                    self.fever_orb = None
+            if self.net:
+                # Our side predicted now, corrected when the server's state arrives
+                events = self.net.step(inputs)
             else:
-                # Spawn new fever orb randomly
-                if random.randint(0, 60 * random.randint(FEVER_ORB_MIN_SPAWN_TIME, FEVER_ORB_MAX_SPAWN_TIME)) == 0:
-                    self.fever_orb = FeverOrb(self.GAME_RECT, self.fever_orb_radius)
-            
-            # Apply fever speed boost if active
-            ball_speed_multiplier = 2.0 if self.fever_effect.active else 1.0
-            
-            # Add try-except for set_speed_multiplier
-            try:
-                self.ball.set_speed_multiplier(ball_speed_multiplier)
-            except AttributeError:
-                print("Warning: Ball doesn't have set_speed_multiplier method. Adding it dynamically.")
-                # Add the method dynamically if it doesn't exist
-                self.ball.speed_multiplier = ball_speed_multiplier
-            
-            # IMPORTANT: Make sure the ball knows the game has started
-            self.ball.game_started = self.game_started
-            
-            # Update ball
-            self.ball.update()
-            
-            # Check for collisions with paddles
-            collision_detected = False
-            for i, paddle in enumerate(self.paddles):
-                if self.players_alive[i]:
-                    collision_result = paddle.check_collision(self.ball)
-                    if collision_result is not None:
-                        # Apply appropriate boost based on hit vs regular bounce
-                        if collision_result:  # True means hit was active
-                            # Hit boost (stronger)
-                            self.ball.hit_boost *= 1.2
-                            if self.ball.hit_boost > 3.0:
-                                self.ball.hit_boost = 3.0
-                        else:
-                            # Regular bounce (weaker)
-                            self.ball.hit_boost *= 1.05
-                            if self.ball.hit_boost > 2.0:
-                                self.ball.hit_boost = 2.0
-                        break
-            
-            # Check boundaries with player_alive status
-            player_hit = self.ball.check_boundaries(self.GAME_RECT, self.players_alive)
-            
-            # Handle player elimination
-            if player_hit is not None:
-                self.player_lives[player_hit] -= 1
-                
-                if self.player_lives[player_hit] <= 0:
-                    self.players_alive[player_hit] = False
-                    
-                    # Check if game is over (only one player left)
-                    alive_count = sum(self.players_alive)
-                    if alive_count == 1:  # Changed from <=1 to exactly 1 to prevent random endings
-                        # Find the last player standing
-                        last_player = -1
-                        for i, alive in enumerate(self.players_alive):
-                            if alive:
-                                last_player = i
-                                break
-                        
-                        if last_player >= 0:
-                            self.game_over = True
-                            self.winner = last_player
-                            self.show_win_screen = True  # Flag to show win screen
-                
-                # Reset ball
-                self.ball.reset(self.GAME_RECT.centerx, self.GAME_RECT.centery)
-                
-                # Reset paddle
-                if player_hit < len(self.paddles):
-                    self.reset_paddle_position(self.paddles[player_hit])
-        
+                inputs = self.input_log.record(self.sim, inputs)
+                events = self.sim.step(inputs)
+            for event in events:
+                self.handle_sim_event(event)
+            if self.spectators:
+                self.spectators.broadcast(self.sim)
         except Exception as e:
             print(f"Error updating game: {e}")
             import traceback
             traceback.print_exc()
     
-    def draw(self):
-        """Draw game state"""
+    def handle_sim_event(self, event):
+        """Controller feedback and win screen for a simulation event"""
+        kind = event['type']
+        if kind == 'paddle':
+            # Stronger rumble for an active hit than for a plain bounce
+            feedback(event['player'], 'rumble', duration=120 if event['hit'] else 50)
+        elif kind == 'fever':
+            # Light up every active controller for the length of the fever
+            for i, alive in enumerate(self.players_alive):
+                if alive:
+                    feedback(i, 'led', mask=0b11, duration=FEVER_DURATION * 1000)
+                    feedback(i, 'tone', frequency=1500, duration=150)
+        elif kind == 'multi_ball':
+            for i, alive in enumerate(self.players_alive):
+                if alive:
+                    feedback(i, 'tone', frequency=1000, duration=100)
+        elif kind == 'life_lost':
+            feedback(event['player'], 'tone', frequency=220, duration=300)
+        elif kind == 'game_over':
+            self.show_win_screen = True  # Flag to show win screen
+            if self.input_log:
+                self.input_log.finish(self.sim)
+                self.input_log.save()
+            self.profiler.write_summary('pong', {'winner': event['winner'], 'ticks': self.sim.tick,
+                                                 'player_count': self.player_count,
+                                                 'bots': sorted(self.bot_slots),
+                                                 'resolution': [self.WIDTH, self.HEIGHT]})
+    
+    def draw(self, alpha=1.0):
+        """
+        Draw game state, interpolated alpha of the way from the previous simulation step
+        
+        Only the areas under last frame's and this frame's moving objects are redrawn,
+        unless the fever overlay or win screen covers the whole screen.
+        
+        Returns:
+            list: The screen areas that changed, or None if the whole screen was redrawn
+        """
         try:
-            # Clear screen with black
-            self.screen.fill((0, 0, 0))
-            
-            # Draw background if available
-            if self.bg_image:
-                self.screen.blit(self.bg_image, (0, 0))
-            
             # Special win screen display
             if self.game_over and self.winner is not None and hasattr(self, 'show_win_screen') and self.show_win_screen:
+                self.screen.fill((0, 0, 0))
+                if self.bg_image:
+                    self.screen.blit(self.bg_image, (0, 0))
                 self.draw_win_screen()
-                return  # Don't draw the rest of the game elements
+                self.full_redraw = True
+                self.dirty_rects = []
+                return None  # Don't draw the rest of the game elements
+            
+            # The walls only change when a player is eliminated
+            if self.background is None or self.background_key != tuple(self.players_alive):
+                self.build_background()
+                self.full_redraw = True
+            
+            fever_active = self.fever_effect.active
+            full_redraw = self.full_redraw or fever_active
+            if full_redraw:
+                self.screen.blit(self.background, (0, 0))
+            else:
+                # Restore the background where things were drawn last frame
+                for rect in self.dirty_rects:
+                    self.screen.blit(self.background, rect, rect)
             
-            # Draw game boundary
-            pygame.draw.rect(self.screen, WALL_COLOR, self.GAME_RECT, 2)
+            drawn = []
             
             # Draw fever orb if it exists
             if self.fever_orb:
-                self.fever_orb.draw(self.screen)
-            
-            # Draw ball and paddles
-            self.ball.draw(self.screen, (255, 255, 255))
+                drawn.append(draw_fever_orb(self.screen, self.fever_orb))
+            if self.sim.multi_ball_orb:
+                drawn.append(draw_multi_ball_orb(self.screen, self.sim.multi_ball_orb))
+            
+            # Draw ball and paddles at their interpolated positions
+            ball_pos = None
+            if self.prev_ball_pos is not None:
+                ball_pos = self.interpolated_position(self.prev_ball_pos, (self.ball.x, self.ball.y), alpha)
+            drawn.append(draw_ball(self.screen, self.ball, (255, 255, 255), ball_pos))
+            if len(self.sim.balls):
+                drawn.extend(draw_extra_balls(self.screen, self.sim.balls.drawables(), self.prev_extra_balls, alpha))
             for i, paddle in enumerate(self.paddles):
                 if self.players_alive[i]:
-                    paddle.draw(self.screen, PLAYER_COLORS[i])
+                    paddle_pos = None
+                    if self.prev_paddle_pos is not None:
+                        paddle_pos = self.interpolated_position(self.prev_paddle_pos[i], (paddle.x, paddle.y), alpha)
+                    drawn.append(draw_paddle(self.screen, paddle, PLAYER_COLORS[i], paddle_pos))
             
             # Draw fever effect overlay
-            self.fever_effect.draw(self.screen)
+            draw_fever_overlay(self.screen, self.fever_effect)
             
             # Draw player lives with Pokémon
-            self.draw_player_lives_with_pokemon()
+            drawn.extend(self.draw_player_lives_with_pokemon())
             
             # Draw game messages
             if not self.game_started and self.show_start_text:
-                text = self.font.render("Press SPACE to start", True, (255, 255, 255))
-                self.screen.blit(text, (self.WIDTH // 2 - text.get_width() // 2, self.HEIGHT // 2))
+                text = fonts.render(self.font, "Press SPACE to start", True, (255, 255, 255))
+                drawn.append(self.screen.blit(text, (self.WIDTH // 2 - text.get_width() // 2, self.HEIGHT // 2)))
             elif self.game_over and not hasattr(self, 'show_win_screen'):
                 # Old game over text (kept for backward compatibility)
                 if self.winner is not None:
-                    text = self.font.render(f"Player {self.winner + 1} wins! Press R to restart", True, PLAYER_COLORS[self.winner])
+                    text = fonts.render(self.font, f"Player {self.winner + 1} wins! Press R to restart", True, PLAYER_COLORS[self.winner])
                 else:
-                    text = self.font.render("Game Over! Press R to restart", True, (255, 255, 255))
-                self.screen.blit(text, (self.WIDTH // 2 - text.get_width() // 2, self.HEIGHT // 2))
-            
-            # Draw walls for eliminated players (thinner walls: 5% instead of 10%)
-            wall_color = (100, 100, 100)  # Grey walls
-            wall_thickness = int(min(self.GAME_RECT.width, self.GAME_RECT.height) * 0.05)
+                    text = fonts.render(self.font, "Game Over! Press R to restart", True, (255, 255, 255))
+                drawn.append(self.screen.blit(text, (self.WIDTH // 2 - text.get_width() // 2, self.HEIGHT // 2)))
             
-            # Top wall (Player 1)
-            if not self.players_alive[0]:
-                wall_rect = pygame.Rect(
-                    self.GAME_RECT.left,
-                    self.GAME_RECT.top,
-                    self.GAME_RECT.width,
-                    wall_thickness
-                )
-                pygame.draw.rect(self.screen, wall_color, wall_rect)
+            drawn = [rect for rect in drawn if rect]
+            dirty = None if full_redraw else self.dirty_rects + drawn
             
-            # Right wall (Player 3) - SWAPPED
-            if not self.players_alive[1]:
-                wall_rect = pygame.Rect(
-                    self.GAME_RECT.right - wall_thickness,
-                    self.GAME_RECT.top,
-                    wall_thickness,
-                    self.GAME_RECT.height
-                )
-                pygame.draw.rect(self.screen, wall_color, wall_rect)
-            
-            # Bottom wall (Player 2) - SWAPPED
-            if not self.players_alive[2]:
-                wall_rect = pygame.Rect(
-                    self.GAME_RECT.left,
-                    self.GAME_RECT.bottom - wall_thickness,
-                    self.GAME_RECT.width,
-                    wall_thickness
-                )
-                pygame.draw.rect(self.screen, wall_color, wall_rect)
-            
-            # Left wall (Player 4)
-            if not self.players_alive[3]:
-                wall_rect = pygame.Rect(
-                    self.GAME_RECT.left,
-                    self.GAME_RECT.top,
-                    wall_thickness,
-                    self.GAME_RECT.height
-                )
-                pygame.draw.rect(self.screen, wall_color, wall_rect)
+            # The overlay tints every pixel, so the frame after it needs a full redraw too
+            self.full_redraw = fever_active
+            self.dirty_rects = drawn
+            return dirty
         
         except Exception as e:
             print(f"Error drawing game: {e}")
             traceback.print_exc()
+            self.full_redraw = True
+            return None
+    
+    def build_background(self):
+        """Draw everything that doesn't move (background image, boundary, walls) onto its own surface"""
+        self.background = self.screen.copy()
+        self.background.fill((0, 0, 0))
+        
+        # Draw background if available
+        if self.bg_image:
+            self.background.blit(self.bg_image, (0, 0))
+        
+        # Draw game boundary
+        pygame.draw.rect(self.background, WALL_COLOR, self.GAME_RECT, 2)
+        
+        # Draw walls for eliminated players (thinner walls: 5% instead of 10%)
+        wall_color = (100, 100, 100)  # Grey walls
+        wall_thickness = int(min(self.GAME_RECT.width, self.GAME_RECT.height) * WALL_THICKNESS_PERCENT)
+        
+        # Top wall (Player 1)
+        if not self.players_alive[0]:
+            wall_rect = pygame.Rect(
+                self.GAME_RECT.left,
+                self.GAME_RECT.top,
+                self.GAME_RECT.width,
+                wall_thickness
+            )
+            pygame.draw.rect(self.background, wall_color, wall_rect)
+        
+        # Right wall (Player 3) - SWAPPED
+        if not self.players_alive[1]:
+            wall_rect = pygame.Rect(
+                self.GAME_RECT.right - wall_thickness,
+                self.GAME_RECT.top,
+                wall_thickness,
+                self.GAME_RECT.height
+            )
+            pygame.draw.rect(self.background, wall_color, wall_rect)
+        
+        # Bottom wall (Player 2) - SWAPPED
+        if not self.players_alive[2]:
+            wall_rect = pygame.Rect(
+                self.GAME_RECT.left,
+                self.GAME_RECT.bottom - wall_thickness,
+                self.GAME_RECT.width,
+                wall_thickness
+            )
+            pygame.draw.rect(self.background, wall_color, wall_rect)
+        
+        # Left wall (Player 4)
+        if not self.players_alive[3]:
+            wall_rect = pygame.Rect(
+                self.GAME_RECT.left,
+                self.GAME_RECT.top,
+                wall_thickness,
+                self.GAME_RECT.height
+            )
+            pygame.draw.rect(self.background, wall_color, wall_rect)
+        
+        self.background_key = tuple(self.players_alive)
+    
+    def present(self, dirty):
+        """Show the drawn frame, updating only the changed areas when draw() reported them"""
+        if dirty is None:
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
     
     def draw_player_lives_with_pokemon(self):
-        """Draw player lives using Pokémon sprites"""
+        """Draw player lives using Pokémon sprites; returns the areas drawn"""
+        drawn = []
         try:
             sprite_size = int(min(self.WIDTH, self.HEIGHT) * 0.05)  # 5% of screen size
             spacing = int(sprite_size * 1.2)
@@ -534,16 +515,16 @@ class PongGame:
             for i, alive in enumerate(self.players_alive):
                 if not alive:
                     # Draw eliminated text
-                    text = self.font.render(f"Player {i+1}: ELIMINATED", True, WALL_COLOR)
+                    text = fonts.render(self.font, f"Player {i+1}: ELIMINATED", True, WALL_COLOR)
                     if i == 0:  # Top
-                        self.screen.blit(text, (10, 10))
+                        drawn.append(self.screen.blit(text, (10, 10)))
                     elif i == 1:  # Right
-                        self.screen.blit(text, (self.WIDTH - text.get_width() - 10, 10))
+                        drawn.append(self.screen.blit(text, (self.WIDTH - text.get_width() - 10, 10)))
                     elif i == 2:  # Bottom
-                        self.screen.blit(text, (10, self.HEIGHT - text.get_height() - 10))
+                        drawn.append(self.screen.blit(text, (10, self.HEIGHT - text.get_height() - 10)))
                     elif i == 3:  # Left
-                        self.screen.blit(text, (self.WIDTH - text.get_width() - 10, 
-                                        self.HEIGHT - text.get_height() - 10))
+                        drawn.append(self.screen.blit(text, (self.WIDTH - text.get_width() - 10,
+                                                             self.HEIGHT - text.get_height() - 10)))
                     continue
                 
                 # Get the player's Pokémon sprite
@@ -554,7 +535,7 @@ class PongGame:
                     sprite.fill(PLAYER_COLORS[i])
                 
                 # Scale sprite to desired size
-                scaled_sprite = pygame.transform.scale(sprite, (sprite_size, sprite_size))
+                scaled_sprite = sprites.scale(sprite, (sprite_size, sprite_size))
                 
                 # Get positions based on player
                 if i == 0:  # Top
@@ -571,7 +552,7 @@ class PongGame:
                     y = self.HEIGHT - sprite_size - 10
                 
                 # Draw player number
-                text = self.font.render(f"P{i+1}", True, PLAYER_COLORS[i])
+                text = fonts.render(self.font, f"P{i+1}", True, PLAYER_COLORS[i])
                 text_rect = text.get_rect()
                 
                 if i in [0, 2]:  # Left side
@@ -580,81 +561,100 @@ class PongGame:
                 else:  # Right side
                     text_pos = (x_start - text_rect.width - 10, y + (sprite_size - text_rect.height) // 2)
                 
-                self.screen.blit(text, text_pos)
+                drawn.append(self.screen.blit(text, text_pos))
                 
                 # Draw lives as Pokémon sprites
                 for j in range(self.player_lives[i]):
-                    self.screen.blit(scaled_sprite, (x_start + j * spacing, y))
+                    drawn.append(self.screen.blit(scaled_sprite, (x_start + j * spacing, y)))
         
         except Exception as e:
             print(f"Error drawing player lives: {e}")
             traceback.print_exc()
+        return drawn
     
     def process_input(self):
-        """Process keyboard input"""
+        """Gather this step's input for every player as (move, hit) pairs"""
+        moves = self.pending_moves
+        hits = self.pending_hits
+        self.pending_moves = [0.0] * 4
+        self.pending_hits = [False] * 4
+        
         try:
             keys = pygame.key.get_pressed()
             
-            # Player 1 (Top) controls - W/A/S/D
-            if self.players_alive[0]:
-                if keys[pygame.K_a]:
-                    self.paddles[0].move("left", self.paddles[0].hit_distance, self.GAME_RECT)
-                if keys[pygame.K_d]:
-                    self.paddles[0].move("right", self.paddles[0].hit_distance, self.GAME_RECT)
-                if keys[pygame.K_s] and self.game_started and self.paddles[0].hit_timer == 0:
-                    self.paddles[0].hit()
+            # Player 1 (Top) controls - A/D to move, S to hit
+            moves[0] += keys[pygame.K_d] - keys[pygame.K_a]
+            hits[0] = hits[0] or keys[pygame.K_s]
             
             # Player 2 (Right) controls - Arrow keys
-            if self.players_alive[1]:
-                if keys[pygame.K_UP]:
-                    self.paddles[1].move("up", self.paddles[1].hit_distance, self.GAME_RECT)
-                if keys[pygame.K_DOWN]:
-                    self.paddles[1].move("down", self.paddles[1].hit_distance, self.GAME_RECT)
-                if keys[pygame.K_LEFT] and self.game_started and self.paddles[1].hit_timer == 0:
-                    self.paddles[1].hit()
+            moves[1] += keys[pygame.K_DOWN] - keys[pygame.K_UP]
+            hits[1] = hits[1] or keys[pygame.K_LEFT]
+            
+            # Player 3 (Bottom) controls - J/L to move, K to hit
+            moves[2] += keys[pygame.K_l] - keys[pygame.K_j]
+            hits[2] = hits[2] or keys[pygame.K_k]
             
-            # Player 3 (Bottom) controls - H/J/K/L
-            if self.players_alive[2]:
-                if keys[pygame.K_j]:
-                    self.paddles[2].move("left", self.paddles[2].hit_distance, self.GAME_RECT)
-                if keys[pygame.K_l]:
-                    self.paddles[2].move("right", self.paddles[2].hit_distance, self.GAME_RECT)
-                if keys[pygame.K_k] and self.game_started and self.paddles[2].hit_timer == 0:
-                    self.paddles[2].hit()
+            # Player 4 (Left) controls - I/P to move, O to hit
+            moves[3] += keys[pygame.K_p] - keys[pygame.K_i]
+            hits[3] = hits[3] or keys[pygame.K_o]
             
-            # Player 4 (Left) controls - I/O/P
-            if self.players_alive[3]:
-                if keys[pygame.K_i]:
-                    self.paddles[3].move("up", self.paddles[3].hit_distance, self.GAME_RECT)
-                if keys[pygame.K_p]:
-                    self.paddles[3].move("down", self.paddles[3].hit_distance, self.GAME_RECT)
-                if keys[pygame.K_o] and self.game_started and self.paddles[3].hit_timer == 0:
-                    self.paddles[3].hit()
+            # Bluetooth controllers report their latest tilt rather than discrete events
+            for player_idx, move in self.controller_tilt().items():
+                moves[player_idx] += move
+            
+            self.apply_bots(moves, hits)
         
         except Exception as e:
             print(f"Error processing input: {e}")
+        
+        return list(zip(moves, hits))
     
-    def process_middleware_events(self):
+    def apply_bots(self, moves, hits):
+        """Replace the input of empty slots, and of players idle too long, with their bot's"""
+        tick = self.sim.tick
+        for player, bot in self.bots.items():
+            if player not in self.bot_slots:
+                if moves[player] or hits[player]:
+                    self.last_active_tick[player] = tick
+                    continue
+                if self.bot_idle_ticks is None or tick - self.last_active_tick[player] < self.bot_idle_ticks:
+                    continue
+            moves[player], hits[player] = bot.decide(self.sim)
+    
+    def controller_tilt(self):
+        """Return {player index: move} from the latest controller pitch, if the event handler provides it"""
+        if self.event_handler is None or not hasattr(self.event_handler, 'get_pitch'):
+            return {}
+        
+        tilt = {}
+        for player_id, pitch in self.event_handler.get_pitch().items():
+            if not isinstance(player_id, int):
+                continue
+            player_idx = player_id - 1  # Convert to 0-based index
+            if 0 <= player_idx < 4:
+                tilt[player_idx] = tilt_to_move(pitch)
+        return tilt
+    
+    def process_middleware_events(self, events=None):
         """Process events from middleware if available"""
         if self.event_handler is None:
             return
             
         try:
-            events = []
-            
-            # Get events from the middleware
-            if callable(self.event_handler):
-                # It's a function we can call
-                events = self.event_handler()
-            elif hasattr(self.event_handler, 'get_events') and callable(self.event_handler.get_events):
-                # It has a get_events method
-                events = self.event_handler.get_events()
-            elif isinstance(self.event_handler, list):
-                # It's already a list of events
-                events = self.event_handler
-            else:
-                print(f"Warning: Unsupported event_handler type: {type(self.event_handler)}")
-                return
+            # Get events from the middleware unless the caller already drained them
+            if events is None:
+                if callable(self.event_handler):
+                    # It's a function we can call
+                    events = self.event_handler()
+                elif hasattr(self.event_handler, 'get_events') and callable(self.event_handler.get_events):
+                    # It has a get_events method
+                    events = self.event_handler.get_events()
+                elif isinstance(self.event_handler, list):
+                    # It's already a list of events
+                    events = self.event_handler
+                else:
+                    print(f"Warning: Unsupported event_handler type: {type(self.event_handler)}")
+                    return
             
             # Process each event
             for event in events:
@@ -675,21 +675,21 @@ class PongGame:
                 if not self.players_alive[player_idx]:
                     continue
                 
-                # Process the event based on action
+                # Movement and hits are applied on the next simulation step
                 if action == 'left':
                     if player_idx in [0, 2]:  # Top/Bottom
-                        self.paddles[player_idx].move("left", self.paddles[player_idx].hit_distance, self.GAME_RECT)
+                        self.pending_moves[player_idx] -= 1
                 elif action == 'right':
                     if player_idx in [0, 2]:  # Top/Bottom
-                        self.paddles[player_idx].move("right", self.paddles[player_idx].hit_distance, self.GAME_RECT)
+                        self.pending_moves[player_idx] += 1
                 elif action == 'up':
                     if player_idx in [1, 3]:  # Right/Left
-                        self.paddles[player_idx].move("up", self.paddles[player_idx].hit_distance, self.GAME_RECT)
+                        self.pending_moves[player_idx] -= 1
                 elif action == 'down':
                     if player_idx in [1, 3]:  # Right/Left
-                        self.paddles[player_idx].move("down", self.paddles[player_idx].hit_distance, self.GAME_RECT)
-                elif action == 'hit' and self.game_started and self.paddles[player_idx].hit_timer == 0:
-                    self.paddles[player_idx].hit()
+                        self.pending_moves[player_idx] += 1
+                elif action == 'hit':
+                    self.pending_hits[player_idx] = True
                 elif action == 'start' and not self.game_started:
                     self.game_started = True
                 elif action == 'restart' and self.game_over:
@@ -700,10 +700,71 @@ class PongGame:
             import traceback
             traceback.print_exc()
     
+    def save_previous_positions(self):
+        """Remember where the ball and paddles were before a simulation step"""
+        self.prev_ball_pos = (self.ball.x, self.ball.y)
+        self.prev_paddle_pos = [(paddle.x, paddle.y) for paddle in self.paddles]
+        xs, ys = self.sim.balls.positions()
+        self.prev_extra_balls = (list(xs), list(ys)) if len(xs) else None
+    
+    def snap_teleported_positions(self):
+        """Don't interpolate across resets - objects that jumped are drawn where they are"""
+        max_step = self.GAME_RECT.width * 0.25
+        if self.ball.reset_timer > 0:
+            self.prev_ball_pos = (self.ball.x, self.ball.y)
+        for i, paddle in enumerate(self.paddles):
+            prev_x, prev_y = self.prev_paddle_pos[i]
+            if abs(paddle.x - prev_x) > max_step or abs(paddle.y - prev_y) > max_step:
+                self.prev_paddle_pos[i] = (paddle.x, paddle.y)
+        if self.prev_extra_balls is not None and len(self.prev_extra_balls[0]) != len(self.sim.balls):
+            self.prev_extra_balls = None  # Balls were added or removed
+    
+    def interpolated_position(self, previous, current, alpha):
+        """Blend between the last two simulation states for smooth rendering"""
+        return (previous[0] + (current[0] - previous[0]) * alpha,
+                previous[1] + (current[1] - previous[1]) * alpha)
+    
+    def step_simulation(self):
+        """Advance the game by one fixed timestep"""
+        self.save_previous_positions()
+        self.profiler.start('input')
+        inputs = self.process_input()
+        self.profiler.start('update')
+        self.update(inputs)
+        self.snap_teleported_positions()
+    
+    def leave_win_screen(self):
+        """Return the winner once the win screen is dismissed"""
+        # Stop the win sound before returning - the menu plays its own
+        audio.stop_effects()
+        return self.winner
+    
+    def frame_cap(self):
+        """Frames per second the display is capped at (0 = uncapped)"""
+        return self.clock.target_fps() if self.display_fps is None else self.display_fps
+    
     def run_frame(self):
-        """Run a single frame of the game. Returns True if the game should continue, False if it should end."""
+        """Run one displayed frame. Returns False to quit, the winner when the game ends, otherwise None.
+        
+        The simulation advances in fixed steps of 1/simulation_rate seconds, as many as the
+        elapsed time calls for, and the frame is then drawn and flipped exactly once.
+        """
         try:
+            self.profiler.begin_frame()
+            
+            # The only tick per frame - caps the display rate and measures elapsed time
+            # (time spent waiting here counts towards the flip)
+            self.profiler.start('flip')
+            frame_time = self.clock.tick(self.display_fps)
+            self.accumulator += min(frame_time, MAX_FRAME_TIME)
+            
+            # Start the next music track once the last one has faded out
+            audio.update()
+            
+            on_win_screen = self.game_over and self.show_win_screen
+            
             # Get events
+            self.profiler.start('events')
             events = pygame.event.get()
             
             # Handle events
@@ -711,42 +772,41 @@ class PongGame:
                 if event.type == pygame.QUIT:
                     print("Quit event detected in run_frame")
                     self.running = False
-                    pygame.mixer.music.stop()
+                    audio.stop_music()
                     return False
+                
+                # Something else drew over the window
+                if event.type == pygame.VIDEOEXPOSE:
+                    self.full_redraw = True
                     
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         print("Escape key detected in run_frame")
                         self.running = False
-                        pygame.mixer.music.stop()
+                        audio.stop_music()
                         return False
                     
-                    # Check for win screen interaction
-                    if hasattr(self, 'show_win_screen') and self.show_win_screen and self.game_over:
+                    # Any key press on the win screen returns the winner
+                    if on_win_screen:
                         print(f"Key pressed on win screen. Returning winner: {self.winner}")
-                        # Any key press on win screen returns the winner
-                        if not self.win_sound_played and self.win_sound:
-                            self.win_sound.play()
-                            self.win_sound_played = True
-                        
-                        # Return after a short delay to let the win sound play
-                        pygame.time.delay(200)
-                        # Stop the win sound before returning
-                        pygame.mixer.stop()
-                        return self.winner
+                        return self.leave_win_screen()
                         
-                    # Skip this frame for debugging purposes
+                    # Print the game state for debugging
                     if event.key == pygame.K_F1:
                         self.debug_game_state()
                     
+                    # Show or hide the frame timing graph
+                    if event.key == pygame.K_F2:
+                        self.profiler.toggle()
+                        self.full_redraw = True
+                    
                     # Handle space key press to start game
                     if event.key == pygame.K_SPACE and not self.game_started:
                         print("Space pressed - starting game!")
                         self.game_started = True
-                        if hasattr(self, 'ball') and self.ball is not None:
-                            self.ball.game_started = True
             
             # Handle external events if we have them
+            self.profiler.start('controllers')
             if self.event_handler is not None:
                 try:
                     external_events = []
@@ -763,40 +823,44 @@ class PongGame:
                         external_events = self.event_handler
                     
                     # Check for win screen interaction from external events
-                    if hasattr(self, 'show_win_screen') and self.show_win_screen and self.game_over:
+                    if on_win_screen:
                         for ext_event in external_events:
                             # Any button press on win screen returns the winner
-                            if isinstance(ext_event, dict) and (ext_event.get('type') == 'KEYDOWN' or ext_event.get('action') in ['select', 'hit', 'shoot']):
+                            if isinstance(ext_event, dict) and (
+                                ext_event.get('type') == 'KEYDOWN' or
+                                ext_event.get('action') in ['select', 'hit', 'shoot', 'up', 'down']
+                            ):
                                 print(f"External event on win screen. Returning winner: {self.winner}")
-                                if not self.win_sound_played and self.win_sound:
-                                    self.win_sound.play()
-                                    self.win_sound_played = True
-                                
-                                # Return after a short delay to let the win sound play
-                                pygame.time.delay(200)
-                                # Stop the win sound before returning
-                                pygame.mixer.stop()
-                                return self.winner
+                                return self.leave_win_screen()
                     
                     # Process regular middleware events if not on win screen
-                    self.process_middleware_events()
+                    self.process_middleware_events(external_events)
                 except Exception as e:
                     print(f"Error processing middleware events: {e}")
             
-            # Process input
-            self.process_input()
-            
-            # Update game state
-            self.update()
-            
-            # Draw
-            self.draw()
+            if self.net and not self.net.connected:
+                print("Lost the connection to the net server")
+                self.running = False
+                return False
             
-            # Make sure the screen is updated
-            pygame.display.flip()
+            # Advance the simulation in fixed steps
+            while self.accumulator >= self.sim_dt:
+                self.step_simulation()
+                self.accumulator -= self.sim_dt
+            
+            # Draw once, between the last two simulation states
+            self.profiler.start('draw')
+            dirty = self.draw(self.accumulator / self.sim_dt)
+            if self.profiler.visible:
+                self.profiler.draw(self.screen, fonts.font(20))
+                dirty = None
+                self.full_redraw = True  # The graph isn't part of the dirty rects
+            self.profiler.start('flip')
+            self.present(dirty)
+            self.profiler.end_frame()
             
             # Handle win screen sound (if we're on the win screen but haven't played the sound yet)
-            if self.game_over and self.winner is not None and hasattr(self, 'show_win_screen') and self.show_win_screen:
+            if self.game_over and self.winner is not None and self.show_win_screen:
                 if not self.win_sound_played and self.win_sound:
                     print(f"Playing win sound on win screen for winner: {self.winner}")
                     self.win_sound.play()
@@ -805,18 +869,6 @@ class PongGame:
                 # On win screen but waiting for input
                 return None
             
-            # Normal game over check (without dedicated win screen)
-            if self.game_over and self.winner is not None and not hasattr(self, 'show_win_screen'):
-                # Fade out background music if game is over
-                pygame.mixer.music.fadeout(1000)  # Fade out over 1 second
-                # Stop the win sound before returning
-                pygame.mixer.stop()  
-                return self.winner
-            
-            # Ensure we have a proper frame rate if not already handled in run()
-            if hasattr(self, 'clock') and self.clock:
-                self.clock.tick(60)
-                
             # Return None to indicate the game should continue (not True or False)
             return None
             
@@ -837,6 +889,7 @@ class PongGame:
         print(f"Initialization successful. game_started={self.game_started}, player_count={self.player_count}")
         print(f"Players alive: {self.players_alive}")
         print(f"Player lives: {self.player_lives}")
+        print(f"Simulation rate: {self.simulation_rate} Hz, display cap: {self.frame_cap() or 'uncapped'}")
         
         self.running = True
         winner = -1
@@ -850,11 +903,10 @@ class PongGame:
             
             # Force Pong game to start automatically
             self.game_started = True
-            if hasattr(self, 'ball') and self.ball is not None:
-                self.ball.game_started = True
-                
-            # Create a wait timer to ensure we see the game before proceeding
-            start_time = pygame.time.get_ticks()
+            
+            # Don't count loading time as simulation time
+            self.clock.restart()
+            self.accumulator = 0.0
             
             while self.running:
                 # Print a heartbeat message every 60 frames for debugging
@@ -862,79 +914,10 @@ class PongGame:
                 if frame_count % 60 == 0:
                     print(f"Game still running - frame {frame_count}")
                 
-                # Process events first
-                events = pygame.event.get()
-                for event in events:
-                    if event.type == pygame.QUIT:
-                        self.running = False
-                        print("Quit event received")
-                        pygame.mixer.music.stop()
-                        return -1
-                    elif event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_ESCAPE:
-                            self.running = False
-                            print("Escape key pressed")
-                            pygame.mixer.music.stop()
-                            return -1
-                        
-                        # Add direct win screen key press handling here
-                        elif self.game_over and hasattr(self, 'show_win_screen') and self.show_win_screen:
-                            print(f"Key pressed on win screen in main loop. Returning winner: {self.winner}")
-                            # Play win sound if not already played
-                            if not self.win_sound_played and self.win_sound:
-                                self.win_sound.play()
-                                self.win_sound_played = True
-                                # Short delay to let sound start
-                                pygame.time.delay(200)
-                            
-                            # Stop any sounds before returning
-                            pygame.mixer.stop()
-                            return self.winner
-                
-                # Handle middleware events for win screen if applicable
-                if self.game_over and hasattr(self, 'show_win_screen') and self.show_win_screen and self.event_handler is not None:
-                    try:
-                        # Get middleware events
-                        middleware_events = []
-                        if callable(self.event_handler):
-                            middleware_events = self.event_handler()
-                        elif hasattr(self.event_handler, 'get_events') and callable(self.event_handler.get_events):
-                            middleware_events = self.event_handler.get_events()
-                        elif isinstance(self.event_handler, list):
-                            middleware_events = self.event_handler
-                        
-                        # Check if any middleware event should dismiss the win screen
-                        for ext_event in middleware_events:
-                            if isinstance(ext_event, dict) and (
-                                ext_event.get('type') == 'KEYDOWN' or 
-                                ext_event.get('action') in ['select', 'hit', 'shoot', 'up', 'down']
-                            ):
-                                print(f"Middleware event detected on win screen: {ext_event}")
-                                # Play win sound if not already played
-                                if not self.win_sound_played and self.win_sound:
-                                    self.win_sound.play()
-                                    self.win_sound_played = True
-                                    # Short delay to let sound start
-                                    pygame.time.delay(200)
-                                
-                                # Stop any sounds before returning
-                                pygame.mixer.stop()
-                                return self.winner
-                    except Exception as e:
-                        print(f"Error processing middleware events on win screen: {e}")
-                
-                # Call run_frame but don't exit loop if it returns None (continue game)
                 result = self.run_frame()
                 
-                # Force the screen to update
-                pygame.display.flip()
-                
-                # Ensure we have a proper frame rate
-                if hasattr(self, 'clock') and self.clock:
-                    self.clock.tick(60)
-                
                 # Handle game end conditions
-                if isinstance(result, int) and result >= 0:
+                if isinstance(result, int) and not isinstance(result, bool) and result >= 0:
                     # Game ended with a winner
                     print(f"Game ended with winner: {result}")
                     winner = result
@@ -950,7 +933,12 @@ class PongGame:
             traceback.print_exc()
         
         # Stop the music before exiting
-        pygame.mixer.music.stop()
+        audio.stop_music()
+        if self.spectators:
+            self.spectators.close()
+            self.spectators = None
+        if self.net:
+            self.net.close()
         print(f"Game finished. Returning winner: {winner}")
         
         # Make sure we don't quit pygame if it's being managed externally
@@ -970,24 +958,24 @@ class PongGame:
         print(f"Ball position: ({self.ball.x}, {self.ball.y})")
         print(f"Ball direction: ({self.ball.dx}, {self.ball.dy})")
         print(f"Ball speed: {self.ball.base_speed * self.ball.hit_boost * self.ball.speed_multiplier}")
+        print(f"Sprite cache: {sprites.stats()}")
+        print(f"Text cache: {fonts.stats()}")
         print("--- END DEBUG ---\n")
 
     def draw_win_screen(self):
         """Draw a dedicated win screen showing the winner's Pokémon"""
-        # Create semi-transparent overlay
-        overlay = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))  # Black with 200/255 alpha
-        self.screen.blit(overlay, (0, 0))
+        # Semi-transparent overlay (reused between frames)
+        overlays.draw(self.screen, (0, 0, 0, 200))  # Black with 200/255 alpha
         
         # Get center coordinates
         center_x = self.WIDTH // 2
         center_y = self.HEIGHT // 2
         
-        # Create larger title font
-        big_font = pygame.font.Font(None, 72)
+        # Larger title font (opened once, shared with the other games)
+        big_font = fonts.font(72)
         
         # Draw winner title
-        title_text = big_font.render(f"Player {self.winner + 1} Wins!", True, PLAYER_COLORS[self.winner])
+        title_text = fonts.render(big_font, f"Player {self.winner + 1} Wins!", True, PLAYER_COLORS[self.winner])
         self.screen.blit(title_text, (center_x - title_text.get_width() // 2, center_y - 200))
         
         # Draw winner's Pokémon (larger size)
@@ -995,7 +983,7 @@ class PongGame:
         if pokemon_sprite:
             # Create a large sprite for display
             display_size = int(min(self.WIDTH, self.HEIGHT) * 0.3)  # 30% of screen size
-            scaled_sprite = pygame.transform.scale(pokemon_sprite, (display_size, display_size))
+            scaled_sprite = sprites.scale(pokemon_sprite, (display_size, display_size))
             
             # Draw centered sprite
             sprite_x = center_x - display_size // 2
@@ -1008,7 +996,7 @@ class PongGame:
         if pygame.time.get_ticks() % 1000 < 500:  # Blink every half second
             instruction_color = (255, 255, 0)  # Bright yellow when blinking
             
-        instructions_text = self.font.render("Press ANY KEY to continue", True, instruction_color)
+        instructions_text = fonts.render(self.font, "Press ANY KEY to continue", True, instruction_color)
         
         # Draw with a black outline for better visibility
         outline_padding = 2
@@ -1020,7 +1008,7 @@ class PongGame:
         ]
         
         # Draw black outlines
-        outline_text = self.font.render("Press ANY KEY to continue", True, (0, 0, 0))
+        outline_text = fonts.render(self.font, "Press ANY KEY to continue", True, (0, 0, 0))
         for pos in outline_positions:
             self.screen.blit(outline_text, pos)
             
@@ -1029,9 +1017,14 @@ class PongGame:
                          (center_x - instructions_text.get_width() // 2, center_y + 200))
 
 # Fix the run_pong function to prevent random endings and ensure the game starts properly
-def run_pong(screen=None, player_count=4, external_events=None):
+def run_pong(screen=None, player_count=4, external_events=None,
+             simulation_rate=SIMULATION_RATE, display_fps=DISPLAY_FPS, resources=None,
+             fill_with_bots=False, bot_idle_seconds=None, multi_ball=0, multi_ball_powerup=False,
+             spectator_port=None, spectator_host='localhost', net=None):
     print("Starting Pong game")
-    game = PongGame(screen, player_count, external_events)
+    game = PongGame(screen, player_count, external_events, simulation_rate, display_fps, resources,
+                    fill_with_bots, bot_idle_seconds, multi_ball=multi_ball, multi_ball_powerup=multi_ball_powerup,
+                    spectator_port=spectator_port, spectator_host=spectator_host, net=net)
     
     # Make sure the game starts automatically without requiring a space press
     if not game.initialized:
@@ -1039,8 +1032,6 @@ def run_pong(screen=None, player_count=4, external_events=None):
     
     # Auto-start the game
     game.game_started = True
-    if hasattr(game, 'ball') and game.ball is not None:
-        game.ball.game_started = True
     
     # Run the game and get the winner
     winner = game.run()
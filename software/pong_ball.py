@@ -1,21 +1,107 @@
 # pong_ball.py - Ball class for Pong game
-import pygame
 import math
 import random
-import time
-from pong_utils import *
+from pong_core import *
 
-# Constants (if not defined elsewhere)
-BALL_RESET_DURATION = 60  # Number of frames to wait before moving after reset
-BALL_SPEED_INCREMENT = 0.75 # Speed increase after each paddle hit (increased by 1.5x, was 0.5)
-BALL_MAX_SPEED = 1000  # Maximum ball speed
+def sweep_circle_rect(x, y, vx, vy, radius, rect, max_t=1.0):
+    """
+    Time of impact of a circle moving from (x, y) by (vx, vy) per unit time against rect
+    
+    Returns the earliest t in [0, max_t] at which the circle touches rect
+    (0 if it already overlaps it), or None if it doesn't within max_t.
+    """
+    left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+    
+    # Slab test against the rect grown by the radius on every side
+    t_enter, t_exit = 0.0, max_t
+    for position, velocity, low, high in ((x, vx, left - radius, right + radius),
+                                          (y, vy, top - radius, bottom + radius)):
+        if velocity == 0:
+            if position < low or position > high:
+                return None
+            continue
+        t0 = (low - position) / velocity
+        t1 = (high - position) / velocity
+        if t0 > t1:
+            t0, t1 = t1, t0
+        t_enter = max(t_enter, t0)
+        t_exit = min(t_exit, t1)
+        if t_enter > t_exit:
+            return None
+    
+    # Entering alongside an edge is a hit; entering a corner square only if the rounded corner is
+    contact_x = x + vx * t_enter
+    contact_y = y + vy * t_enter
+    if left <= contact_x <= right or top <= contact_y <= bottom:
+        return t_enter
+    
+    corner_x = left if contact_x < left else right
+    corner_y = top if contact_y < top else bottom
+    offset_x = x - corner_x
+    offset_y = y - corner_y
+    a = vx * vx + vy * vy
+    b = offset_x * vx + offset_y * vy
+    c = offset_x * offset_x + offset_y * offset_y - radius * radius
+    if c <= 0:
+        return 0.0  # Already touching the corner
+    discriminant = b * b - a * c
+    if a == 0 or discriminant < 0:
+        return None
+    t = (-b - math.sqrt(discriminant)) / a
+    return t if 0 <= t <= max_t else None
+
+def serve_direction(rng=random):
+    """A random unit direction to serve the ball in, kept away from the axes"""
+    # IMPROVED DIRECTION SELECTION: include all 4 quadrants with better angle distribution
+    # Choose from 4 quadrants instead of just 2
+    quadrant = rng.randint(0, 3)
+
+    if quadrant == 0:  # Top-right
+        angle = rng.uniform(0, 0.5 * math.pi)
+    elif quadrant == 1:  # Bottom-right
+        angle = rng.uniform(0.5 * math.pi, math.pi)
+    elif quadrant == 2:  # Bottom-left
+        angle = rng.uniform(math.pi, 1.5 * math.pi)
+    else:  # Top-left
+        angle = rng.uniform(1.5 * math.pi, 2 * math.pi)
+
+    # Avoid angles that are too vertical or horizontal (within 15 degrees of axes)
+    min_angle_offset = 0.26  # ~15 degrees
+
+    # Calculate how close we are to 0, 90, 180, or 270 degrees
+    angle_mod = angle % (0.5 * math.pi)  # Distance to closest 90-degree increment
+    if angle_mod < min_angle_offset:
+        # Too close to 0, 90, 180, or 270 - adjust angle
+        angle += min_angle_offset
+    elif angle_mod > (0.5 * math.pi - min_angle_offset):
+        angle -= min_angle_offset
+
+    dx = math.cos(angle)
+    dy = math.sin(angle)
+
+    # Normalize direction vector
+    length = math.sqrt(dx**2 + dy**2)
+    if length > 0:
+        dx /= length
+        dy /= length
+    
+    return dx, dy
 
 class Ball:
-    def __init__(self, x, y, radius, speed):
+    __slots__ = ('x', 'y', 'radius', 'rate', 'base_speed', 'reset_ticks', 'effect_ticks', 'speed_multiplier',
+                 'dx', 'dy', 'reset_timer', 'hit_boost', 'game_started', 'first_launch', 'is_boosted',
+                 'boost_multiplier', 'effect_timer', 'boost_color', 'rng', 'rect')
+
+    def __init__(self, x, y, radius, speed, rng=None, rate=SIMULATION_RATE):
         self.x = x
         self.y = y
         self.radius = radius
-        self.base_speed = speed
+        
+        # speed is in pixels per second; the ball moves per tick of a simulation running at rate
+        self.rate = rate
+        self.base_speed = per_tick(speed, rate)
+        self.reset_ticks = ticks(BALL_RESET_TIME, rate)
+        self.effect_ticks = ticks(BALL_EFFECT_TIME, rate)
         self.speed_multiplier = 1.0
         self.dx = 0
         self.dy = 0
@@ -28,11 +114,14 @@ class Ball:
         self.is_boosted = False
         self.boost_multiplier = 1.0
         
-        # For visual effects
-        self.effect_time = 0
-        self.effect_duration = 0.2
+        # For visual effects (ticks left of the speed-up flash)
+        self.effect_timer = 0
         self.boost_color = (255, 255, 100)
         
+        # Random source for serve directions (the match's seeded RNG, so replays serve the same way)
+        self.rng = rng if rng is not None else random
+        self.rect = Rect(x - radius, y - radius, radius * 2, radius * 2)  # Reused by get_rect()
+        
         # Initialize with a normalized direction vector
         self.reset(x, y)
         print(f"Ball initialized: position=({self.x}, {self.y}), direction=({self.dx}, {self.dy}), speed={self.base_speed}, radius={self.radius}")
@@ -41,49 +130,17 @@ class Ball:
         """Reset the ball after a player loses a life (between rounds)"""
         self.x = x
         self.y = y
-        self.reset_timer = BALL_RESET_DURATION
+        self.reset_timer = self.reset_ticks
         
         # Reset hit boost multiplier
         self.hit_boost = 1.0
         
         # Increment base speed between rounds
-        self.base_speed = min(self.base_speed + BALL_SPEED_INCREMENT, BALL_MAX_SPEED)
+        self.base_speed = min(self.base_speed + per_tick(BALL_SPEED_INCREMENT, self.rate),
+                              per_tick(BALL_MAX_SPEED, self.rate))
         print(f"Round ended: Ball speed increased to {self.base_speed}")
         
-        # IMPROVED DIRECTION SELECTION: include all 4 quadrants with better angle distribution
-        import random, math
-        
-        # Choose from 4 quadrants instead of just 2
-        quadrant = random.randint(0, 3)
-        
-        if quadrant == 0:  # Top-right
-            angle = random.uniform(0, 0.5 * math.pi)
-        elif quadrant == 1:  # Bottom-right
-            angle = random.uniform(0.5 * math.pi, math.pi)
-        elif quadrant == 2:  # Bottom-left
-            angle = random.uniform(math.pi, 1.5 * math.pi)
-        else:  # Top-left
-            angle = random.uniform(1.5 * math.pi, 2 * math.pi)
-        
-        # Avoid angles that are too vertical or horizontal (within 15 degrees of axes)
-        min_angle_offset = 0.26  # ~15 degrees
-        
-        # Calculate how close we are to 0, 90, 180, or 270 degrees
-        angle_mod = angle % (0.5 * math.pi)  # Distance to closest 90-degree increment
-        if angle_mod < min_angle_offset:
-            # Too close to 0, 90, 180, or 270 - adjust angle
-            angle += min_angle_offset
-        elif angle_mod > (0.5 * math.pi - min_angle_offset):
-            angle -= min_angle_offset
-        
-        self.dx = math.cos(angle)
-        self.dy = math.sin(angle)
-        
-        # Normalize direction vector
-        length = math.sqrt(self.dx**2 + self.dy**2)
-        if length > 0:
-            self.dx /= length
-            self.dy /= length
+        self.dx, self.dy = serve_direction(self.rng)
         
         print(f"Ball reset: position=({self.x}, {self.y}), direction=({self.dx}, {self.dy}), reset_timer={self.reset_timer}")
     
@@ -91,69 +148,143 @@ class Ball:
         """Set a multiplier for the ball's speed (for fever mode)"""
         self.speed_multiplier = multiplier
     
-    def update(self):
-        """Update ball position and state"""
-        print(f"Ball update: game_started={self.game_started}, reset_timer={self.reset_timer}")
-        
+    def update(self, game_rect=None, paddles=(), players_alive=None):
+        """
+        Move the ball one tick, bouncing off paddles and walls along the way
+        
+        The ball is swept along its path instead of jumping to the end of it, so
+        it can't pass through a paddle or wall however fast it is going.
+        
+        Returns:
+            (contacts, loser): (paddle index, hit_active) for every paddle bounce this
+            tick, and the index of the player who let the ball through, or None
+        """
+        contacts = []
         if not self.game_started:
-            print("Ball not moving: game not started")
-            return
+            return contacts, None
+        
+        # Update effect timer
+        if self.effect_timer > 0:
+            self.effect_timer -= 1
             
         if self.reset_timer > 0:
             self.reset_timer -= 1
-            print(f"Ball in reset state: {self.reset_timer} frames remaining")
-            return
-        
-        # Fix for speed multipliers: calculate effective speed correctly
-        effective_speed = self.base_speed * self.hit_boost * self.speed_multiplier
-        
-        # CRITICAL: Normalize direction and apply effective speed
-        magnitude = math.sqrt(self.dx**2 + self.dy**2)
-        if magnitude > 0:
-            normalized_dx = self.dx / magnitude
-            normalized_dy = self.dy / magnitude
-            
-            # Store old position for boundary checks
-            old_x = self.x
-            old_y = self.y
+            return contacts, None
+        
+        # Resolve contacts in the order they happen, for the rest of the tick after each one
+        loser = None
+        remaining = 1.0
+        for _ in range(MAX_BOUNCES_PER_STEP + 1):
+            effective_speed = self.base_speed * self.hit_boost * self.speed_multiplier
+            vx = self.dx * effective_speed
+            vy = self.dy * effective_speed
             
-            # Move with proper speed
-            self.x += normalized_dx * effective_speed
-            self.y += normalized_dy * effective_speed
+            t, obstacle = remaining, None
+            if game_rect is not None:
+                t, obstacle = self.next_contact(vx, vy, remaining, game_rect, paddles, players_alive)
+            self.x += vx * t
+            self.y += vy * t
+            remaining -= t
             
-            # Update the direction vectors to maintain proportions but have correct magnitude
-            self.dx = normalized_dx 
-            self.dy = normalized_dy
-        
-        print(f"Ball moved to: ({self.x}, {self.y}) with speed {effective_speed}")
+            if obstacle is None:
+                break
+            kind, index = obstacle
+            if kind == 'paddle':
+                contacts.append((index, paddles[index].bounce(self)))
+            elif kind == 'wall':
+                self.bounce_off_wall(index, game_rect)
+            else:
+                print(f"Ball reached player {index + 1}'s side - player index {index} loses a life")
+                loser = index
+                break
+        
+        # Defensive check - sweeping should keep the ball in play, but never lose it
+        if game_rect is not None and loser is None and self.escaped(game_rect):
+            print(f"WARNING: Ball escaped boundaries at ({self.x}, {self.y}). Resetting to center.")
+            self.reset(game_rect.centerx, game_rect.centery)
         
-        # Update effect timer
-        if self.effect_time > 0:
-            current_time = time.time()
-            if current_time > self.effect_time + self.effect_duration:
-                self.effect_time = 0
+        return contacts, loser
+    
+    def next_contact(self, vx, vy, max_t, game_rect, paddles, players_alive):
+        """
+        Find the first paddle, wall or open side the ball touches moving by (vx, vy) per tick
+        
+        Returns:
+            (t, obstacle): the fraction of the tick until contact, and ('paddle' | 'wall' | 'side', index),
+            or (max_t, None) if nothing is hit within max_t
+        """
+        best_t, best = max_t, None
+        
+        # Paddles are checked first so they win ties with the side behind them
+        for i, paddle in enumerate(paddles):
+            if players_alive is not None and not players_alive[i]:
+                continue
+            if not paddle.faces(vx, vy):
+                continue  # Moving away from (or along) the paddle's front
+            t = sweep_circle_rect(self.x, self.y, vx, vy, self.radius, paddle.get_rect(), best_t)
+            if t is not None and (best is None or t < best_t):
+                best_t, best = t, ('paddle', i)
+        
+        # Eliminated players' sides are walled off, the rest are open
+        wall_thickness = int(min(game_rect.width, game_rect.height) * WALL_THICKNESS_PERCENT)
+        for player, axis, sign in FIELD_SIDES:
+            position, velocity = (self.x, vx) if axis == 'x' else (self.y, vy)
+            if velocity * sign <= 0:
+                continue
+            alive = players_alive is None or players_alive[player]
+            plane = self.side_plane(player, game_rect, 0 if alive else wall_thickness)
+            t = max(0.0, (plane - position) / velocity)
+            if t <= max_t and (best is None or t < best_t):
+                best_t, best = t, ('side' if alive else 'wall', player)
+        
+        return best_t, best
+    
+    def side_plane(self, player, game_rect, inset=0):
+        """Where the ball's center is when its edge touches a side (moved in by inset)"""
+        for side, axis, sign in FIELD_SIDES:
+            if side == player:
+                if axis == 'x':
+                    edge = game_rect.left if sign < 0 else game_rect.right
+                else:
+                    edge = game_rect.top if sign < 0 else game_rect.bottom
+                return edge - sign * (inset + self.radius)
+    
+    def bounce_off_wall(self, player, game_rect):
+        """Bounce back into the field off the wall of an eliminated player"""
+        wall_thickness = int(min(game_rect.width, game_rect.height) * WALL_THICKNESS_PERCENT)
+        plane = self.side_plane(player, game_rect, wall_thickness)
+        if player == 3:  # Left wall - bounce right
+            self.dx = abs(self.dx)
+            self.x = max(self.x, plane)
+        elif player == 1:  # Right wall - bounce left
+            self.dx = -abs(self.dx)
+            self.x = min(self.x, plane)
+        elif player == 0:  # Top wall - bounce down
+            self.dy = abs(self.dy)
+            self.y = max(self.y, plane)
+        elif player == 2:  # Bottom wall - bounce up
+            self.dy = -abs(self.dy)
+            self.y = min(self.y, plane)
+    
+    def escaped(self, game_rect):
+        """True if the ball is way outside the game area"""
+        return (self.x < game_rect.left - self.radius * 2 or
+                self.x > game_rect.right + self.radius * 2 or
+                self.y < game_rect.top - self.radius * 2 or
+                self.y > game_rect.bottom + self.radius * 2)
     
     def show_speed_effect(self, is_boost=False):
         """Start visual effect to show speed increase"""
-        self.effect_time = time.time()
+        self.effect_timer = self.effect_ticks
         if is_boost:
-            self.boost_color = (255, 165, 0)  # Orange for boosted ball
+            self.boost_color = BALL_BOOST_COLOR  # Orange for boosted ball
     
-    def apply_hit_boost(self):
-        """Apply speed boost from a hit"""
-        # Double the speed from current speed (allows chaining)
-        self.boost_multiplier *= 2.0
-        
-        # Calculate current direction unit vector
-        current_magnitude = math.sqrt(self.dx**2 + self.dy**2)
-        dir_x = self.dx / current_magnitude
-        dir_y = self.dy / current_magnitude
-        
-        # Apply new speed with boost multiplier
-        boosted_speed = self.base_speed * self.hit_boost * self.speed_multiplier * self.boost_multiplier
-        self.dx = dir_x * boosted_speed
-        self.dy = dir_y * boosted_speed
-        
+    def apply_hit_boost(self, hit_active=False):
+        """Speed the ball up after a paddle contact - more if the paddle was mid-hit"""
+        if hit_active:
+            self.hit_boost = min(self.hit_boost * HIT_BOOST, HIT_BOOST_CAP)
+        else:
+            self.hit_boost = min(self.hit_boost * BOUNCE_BOOST, BOUNCE_BOOST_CAP)
         self.is_boosted = True
         self.show_speed_effect(True)
     
@@ -172,154 +303,12 @@ class Ball:
             self.is_boosted = False
             self.boost_multiplier = 1.0
     
-    def check_boundaries(self, game_rect, players_alive=None):
-        """Check for collisions with game boundaries and walls for eliminated players"""
-        if self.reset_timer > 0:
-            return None
-        
-        # Add defensive boundary check - if the ball is way outside the boundaries, 
-        # reset it to the center of the screen
-        if (self.x < game_rect.left - self.radius * 2 or
-            self.x > game_rect.right + self.radius * 2 or
-            self.y < game_rect.top - self.radius * 2 or
-            self.y > game_rect.bottom + self.radius * 2):
-            print(f"WARNING: Ball escaped boundaries at ({self.x}, {self.y}). Resetting to center.")
-            self.reset(game_rect.centerx, game_rect.centery)
-            return None
-        
-        wall_thickness = int(min(game_rect.width, game_rect.height) * 0.05)
-        
-        # Check dead player walls first
-        if players_alive:
-            # Left wall (Player 4)
-            if not players_alive[3] and self.x - self.radius < game_rect.left + wall_thickness:
-                self.dx = abs(self.dx)  # Bounce right
-                # Ensure ball is inside the boundary
-                self.x = game_rect.left + wall_thickness + self.radius
-                return None
-            
-            # Right wall (Player 3) - SWAPPED
-            if not players_alive[1] and self.x + self.radius > game_rect.right - wall_thickness:
-                self.dx = -abs(self.dx)  # Bounce left
-                # Ensure ball is inside the boundary
-                self.x = game_rect.right - wall_thickness - self.radius
-                return None
-            
-            # Top wall (Player 1)
-            if not players_alive[0] and self.y - self.radius < game_rect.top + wall_thickness:
-                self.dy = abs(self.dy)  # Bounce down
-                # Ensure ball is inside the boundary
-                self.y = game_rect.top + wall_thickness + self.radius
-                return None
-            
-            # Bottom wall (Player 2) - SWAPPED
-            if not players_alive[2] and self.y + self.radius > game_rect.bottom - wall_thickness:
-                self.dy = -abs(self.dy)  # Bounce up
-                # Ensure ball is inside the boundary
-                self.y = game_rect.bottom - wall_thickness - self.radius
-                return None
-        
-        # Normal boundaries check - only for ACTIVE player walls
-        # Left wall (Player 4)
-        if self.x - self.radius < game_rect.left:
-            if players_alive is None or players_alive[3]:
-                print(f"Ball hit LEFT wall - Player 4 (index 3) loses a life")
-                return 3  # Player 4 loses a life
-            self.dx = abs(self.dx)  # Bounce right
-            # Ensure ball is inside the boundary
-            self.x = game_rect.left + self.radius
-        
-        # Right wall (Player 2)
-        elif self.x + self.radius > game_rect.right:
-            if players_alive is None or players_alive[1]:
-                print(f"Ball hit RIGHT wall - Player 2 (index 1) loses a life")
-                return 1  # Player 2 loses a life
-            self.dx = -abs(self.dx)  # Bounce left
-            # Ensure ball is inside the boundary
-            self.x = game_rect.right - self.radius
-        
-        # Top wall (Player 1)
-        elif self.y - self.radius < game_rect.top:
-            if players_alive is None or players_alive[0]:
-                print(f"Ball hit TOP wall - Player 1 (index 0) loses a life")
-                return 0  # Player 1 loses a life
-            self.dy = abs(self.dy)  # Bounce down
-            # Ensure ball is inside the boundary
-            self.y = game_rect.top + self.radius
-        
-        # Bottom wall (Player 3)
-        elif self.y + self.radius > game_rect.bottom:
-            if players_alive is None or players_alive[2]:
-                print(f"Ball hit BOTTOM wall - Player 3 (index 2) loses a life")
-                return 2  # Player 3 loses a life
-            self.dy = -abs(self.dy)  # Bounce up
-            # Ensure ball is inside the boundary
-            self.y = game_rect.bottom - self.radius
-        
-        # Safeguard against out-of-bounds ball (beyond all walls)
-        # This should never happen, but just in case the ball goes out of bounds
-        if (self.x < game_rect.left - 2*self.radius or 
-            self.x > game_rect.right + 2*self.radius or
-            self.y < game_rect.top - 2*self.radius or
-            self.y > game_rect.bottom + 2*self.radius):
-            print(f"WARNING: Ball is out of bounds at ({self.x}, {self.y}). Resetting to center.")
-            self.reset(game_rect.centerx, game_rect.centery)
-            return None
-            
-        return None
-    
-    def draw(self, screen, color):
-        """Draw the ball on the screen with speed effect"""
-        # Use boosted color if ball is boosted
-        ball_color = self.boost_color if self.is_boosted else color
-        
-        # Normal ball
-        pygame.draw.circle(screen, ball_color, (int(self.x), int(self.y)), self.radius)
-        
-        # Draw speed effect if active
-        if self.effect_time > 0:
-            current_time = time.time()
-            effect_progress = 1.0 - min(1.0, (current_time - self.effect_time) / self.effect_duration)
-            
-            # Calculate effect size
-            effect_radius = self.radius * (1 + effect_progress * 2)  # Larger effect for boost
-            
-            # Effect color depends on whether it's a boost or regular speed increase
-            effect_color = self.boost_color if self.is_boosted else (255, 255, 255)
-            effect_color = (*effect_color[:3], int(200 * effect_progress))  # Add alpha
-            
-            effect_surface = pygame.Surface((effect_radius*2, effect_radius*2), pygame.SRCALPHA)
-            pygame.draw.circle(effect_surface, effect_color, 
-                             (int(effect_radius), int(effect_radius)), int(effect_radius))
-            
-            screen.blit(effect_surface, 
-                      (int(self.x - effect_radius), int(self.y - effect_radius)))
-
-    def check_collision(self, paddle_rect):
-        """Check if the ball collides with a paddle"""
-        # Create a rect for the ball
-        ball_rect = pygame.Rect(
-            self.x - self.radius, 
-            self.y - self.radius,
-            self.radius * 2, 
-            self.radius * 2
-        )
-        
-        # Debug output for collision detection
-        if ball_rect.colliderect(paddle_rect):
-            print(f"Ball collision detected! Ball: {ball_rect}, Paddle: {paddle_rect}")
-            return True
-        
-        return False
-
     def get_rect(self):
-        """Get the ball's rectangle for collision detection"""
-        return pygame.Rect(
-            self.x - self.radius, 
-            self.y - self.radius,
-            self.radius * 2, 
-            self.radius * 2
-        )
+        """Get the ball's rectangle for collision detection (the ball's one Rect, updated in place)"""
+        rect = self.rect
+        rect.x = self.x - self.radius
+        rect.y = self.y - self.radius
+        return rect
 
     def apply_boost(self):
         """Apply speed boost to the ball"""
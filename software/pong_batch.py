@@ -0,0 +1,563 @@
+# pong_batch.py - Step thousands of Pong matches at once for balancing
+#
+# Every arena's ball, paddles, lives and fever state is held in NumPy
+# arrays and advanced in lockstep, following the same rules as
+# PongSimulation.step (the swept Ball.update, Paddle.bounce and the hit
+# boosts). Scripted policies stand in for players.
+#
+# A tick costs about a microsecond per match once there are thousands of
+# them, but matches with the tracking policy last about 150 seconds (9000
+# ticks) and the last few run on to MAX_MATCH_TICKS, so a full run takes
+# about 40 seconds for 1000 matches and a few minutes for 10,000:
+#   python pong_batch.py --arenas 1000 --speed-increment 30 45 60
+import argparse
+import itertools
+import math
+import time
+from pong_core import *
+
+# Try to import numpy (only the batch simulator needs it)
+try:
+    import numpy as np
+except ImportError:
+    print("Warning: Could not import numpy, batch simulation unavailable")
+    np = None
+
+MAX_MATCH_TICKS = SIMULATION_RATE * 60 * 5  # Matches still going after 5 minutes count as timeouts
+COMPACT_EVERY = 600  # Ticks between dropping finished matches from the arrays
+
+# Per-arena arrays, and the statistics kept for finished matches
+STATE_ARRAYS = ('x', 'y', 'dx', 'dy', 'base_speed', 'hit_boost', 'reset_timer',
+                'px', 'py', 'hit_timer', 'alive', 'lives',
+                'fever_timer', 'orb', 'orb_x', 'orb_y')
+STAT_ARRAYS = ('done', 'winner', 'ticks', 'bounces', 'hits', 'fevers', 'escapes')
+
+def sweep_circle_rects(x, y, vx, vy, radius, left, top, right, bottom, max_t):
+    """pong_ball.sweep_circle_rect over arrays (broadcast together); misses are inf"""
+    x, y, vx, vy, radius, left, top, right, bottom, max_t = np.broadcast_arrays(
+        x, y, vx, vy, radius, left, top, right, bottom, max_t)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_enter = np.zeros(x.shape)
+        t_exit = max_t.astype(float)
+        hit = np.ones(x.shape, dtype=bool)
+
+        # Slab test against the rects grown by the radius
+        for position, velocity, low, high in ((x, vx, left - radius, right + radius),
+                                              (y, vy, top - radius, bottom + radius)):
+            still = velocity == 0
+            t0 = (low - position) / velocity
+            t1 = (high - position) / velocity
+            t_enter = np.maximum(t_enter, np.where(still, -np.inf, np.minimum(t0, t1)))
+            t_exit = np.minimum(t_exit, np.where(still, np.inf, np.maximum(t0, t1)))
+            hit &= ~still | ((position >= low) & (position <= high))
+        hit &= t_enter <= t_exit
+        t = np.where(hit, t_enter, np.inf)
+
+        # Entering a corner square only counts if the rounded corner is hit
+        contact_x = x + vx * t_enter
+        contact_y = y + vy * t_enter
+        corner = hit & (((contact_x < left) | (contact_x > right)) &
+                        ((contact_y < top) | (contact_y > bottom)))
+        if corner.any():
+            # Few sweeps end in a corner square; only those need the quadratic
+            vx, vy, radius, max_t = vx[corner], vy[corner], radius[corner], max_t[corner]
+            offset_x = x[corner] - np.where(contact_x[corner] < left[corner], left[corner], right[corner])
+            offset_y = y[corner] - np.where(contact_y[corner] < top[corner], top[corner], bottom[corner])
+            a = vx * vx + vy * vy
+            b = offset_x * vx + offset_y * vy
+            c = offset_x * offset_x + offset_y * offset_y - radius * radius
+            discriminant = b * b - a * c
+            t_corner = np.where(c <= 0, 0.0, (-b - np.sqrt(np.maximum(discriminant, 0.0))) / a)
+            corner_hit = (c <= 0) | ((a > 0) & (discriminant >= 0) & (t_corner >= 0) & (t_corner <= max_t))
+            t[corner] = np.where(corner_hit, t_corner, np.inf)
+        return t
+
+
+class BatchPongSimulation:
+    """K independent Pong matches advanced together, one tick per step()"""
+    def __init__(self, arenas, width=800, height=600, player_count=4, seed=None,
+                 ball_speed_increment=BALL_SPEED_INCREMENT,
+                 paddle_length_percent=PADDLE_LENGTH_PERCENT,
+                 fever_duration=FEVER_DURATION,
+                 fever_spawn_time=(FEVER_ORB_MIN_SPAWN_TIME, FEVER_ORB_MAX_SPAWN_TIME),
+                 fever_speed_multiplier=FEVER_SPEED_MULTIPLIER):
+        if np is None:
+            raise RuntimeError("numpy is not installed")
+
+        self.arenas = arenas  # Matches still in the arrays (see compact())
+        self.matches = arenas
+        self.rng = np.random.default_rng(seed)
+        self.ball_speed_increment = ball_speed_increment  # Pixels per second, like BALL_SPEED_INCREMENT
+        self.rate = SIMULATION_RATE  # Every match steps at the game's rate
+        self.fever_duration = fever_duration
+        self.fever_speed_multiplier = fever_speed_multiplier
+
+        # PongSimulation rolls randint(0, rate * randint(min, max)) == 0 every tick;
+        # the chance of that is the same for every tick, so roll it once
+        spawn_windows = np.arange(fever_spawn_time[0], fever_spawn_time[1] + 1)
+        self.fever_spawn_chance = float(np.mean(1.0 / (self.rate * spawn_windows + 1)))
+
+        # Same geometry as PongSimulation
+        self.game_rect = square_game_rect(width, height)
+        dims = calculate_game_dimensions(width, height)
+        self.ball_radius = dims['ball_radius']
+        self.ball_speed = dims['ball_speed']
+        self.fever_orb_radius = dims['fever_orb_radius']
+
+        short_dim = min(self.game_rect.width, self.game_rect.height)
+        self.paddle_long = int(short_dim * paddle_length_percent)
+        self.paddle_short = int(short_dim * PADDLE_THICKNESS_PERCENT)
+        self.hit_distance = int(short_dim * PADDLE_REACH_PERCENT)
+        self.paddle_speed = per_tick(short_dim * PADDLE_MOVE_PERCENT, self.rate)
+        self.reset_ticks = ticks(BALL_RESET_TIME, self.rate)
+        self.hit_ticks = ticks(PADDLE_HIT_TIME, self.rate)
+        self.paddle_distance = int(short_dim * PADDLE_DISTANCE_PERCENT)
+        self.wall_thickness = int(short_dim * WALL_THICKNESS_PERCENT)
+
+        # FIELD_SIDES as arrays, for the four side columns of each bounce pass
+        self.side_players = np.array([player for player, _, _ in FIELD_SIDES])
+        self.side_on_x = np.array([axis == 'x' for _, axis, _ in FIELD_SIDES])
+        self.side_signs = np.array([sign for _, _, sign in FIELD_SIDES], dtype=float)
+        edges = {3: self.game_rect.left, 1: self.game_rect.right, 0: self.game_rect.top, 2: self.game_rect.bottom}
+        self.side_edges = np.array([edges[player] for player in self.side_players], dtype=float)
+
+        # Starting paddle positions, indexed by direction (top, right, bottom, left)
+        cx, cy, d = self.game_rect.centerx, self.game_rect.centery, self.paddle_distance
+        self.home_x = np.array([cx, cx + d, cx, cx - d], dtype=float)
+        self.home_y = np.array([cy - d, cy, cy + d, cy], dtype=float)
+
+        # A ball center inside this box can't touch a paddle (even at full
+        # reach) or a wall, so its whole move needs no sweep
+        r, wall = self.ball_radius, self.wall_thickness
+        reach = self.paddle_short + self.hit_distance
+        self.clear_left = max(cx - d + reach, self.game_rect.left + wall) + r
+        self.clear_right = min(cx + d - self.hit_distance, self.game_rect.right - wall) - r
+        self.clear_top = max(cy - d + reach, self.game_rect.top + wall) + r
+        self.clear_bottom = min(cy + d - self.hit_distance, self.game_rect.bottom - wall) - r
+
+        # Ball
+        self.x = np.full(arenas, float(cx))
+        self.y = np.full(arenas, float(cy))
+        self.dx = np.zeros(arenas)
+        self.dy = np.zeros(arenas)
+        self.base_speed = np.full(arenas, per_tick(self.ball_speed, self.rate))
+        self.hit_boost = np.ones(arenas)
+        self.reset_timer = np.zeros(arenas, dtype=int)
+
+        # Paddles
+        self.px = np.tile(self.home_x, (arenas, 1))
+        self.py = np.tile(self.home_y, (arenas, 1))
+        self.hit_timer = np.zeros((arenas, 4), dtype=int)
+
+        # Players, using the same seating as PongSimulation
+        alive = [False] * 4
+        for count, index in ((1, 0), (2, 2), (3, 1), (4, 3)):
+            alive[index] = player_count >= count
+        self.alive = np.tile(np.array(alive), (arenas, 1))
+        self.lives = np.where(self.alive, PLAYER_STARTING_LIVES, 0)
+
+        # Fever
+        self.fever_timer = np.zeros(arenas, dtype=int)
+        self.orb = np.zeros(arenas, dtype=bool)
+        self.orb_x = np.zeros(arenas)
+        self.orb_y = np.zeros(arenas)
+
+        # Match state and statistics
+        self.done = np.zeros(arenas, dtype=bool)
+        self.winner = np.full(arenas, -1)
+        self.ticks = np.zeros(arenas, dtype=int)
+        self.bounces = np.zeros(arenas, dtype=int)
+        self.hits = np.zeros(arenas, dtype=int)
+        self.fevers = np.zeros(arenas, dtype=int)
+        self.escapes = np.zeros(arenas, dtype=int)
+        self.finished = {name: [] for name in STAT_ARRAYS}
+
+        # Ball.__init__ resets once, which already adds one speed increment
+        self.reset_balls(np.ones(arenas, dtype=bool))
+
+    def reset_balls(self, mask):
+        """Ball.reset for every arena in mask"""
+        count = int(mask.sum())
+        if count == 0:
+            return
+        rect = self.game_rect
+        self.x[mask] = rect.centerx
+        self.y[mask] = rect.centery
+        self.reset_timer[mask] = self.reset_ticks
+        self.hit_boost[mask] = 1.0
+        self.base_speed[mask] = np.minimum(self.base_speed[mask] + per_tick(self.ball_speed_increment, self.rate),
+                                           per_tick(BALL_MAX_SPEED, self.rate))
+
+        # Uniform over the four quadrants, kept at least ~15 degrees off the axes
+        angle = self.rng.uniform(0, 2 * math.pi, count)
+        min_angle_offset = 0.26
+        angle_mod = angle % (0.5 * math.pi)
+        angle = np.where(angle_mod < min_angle_offset, angle + min_angle_offset,
+                         np.where(angle_mod > 0.5 * math.pi - min_angle_offset,
+                                  angle - min_angle_offset, angle))
+        self.dx[mask] = np.cos(angle)
+        self.dy[mask] = np.sin(angle)
+
+    def paddle_rects(self):
+        """Paddle.get_rect for every paddle, as (left, top, width, height) arrays of shape (K, 4)"""
+        offset = self.hit_distance * (self.hit_timer / self.hit_ticks)
+        long_, short = self.paddle_long, self.paddle_short
+        left = self.px.copy()
+        top = self.py.copy()
+        left[:, 1] -= offset[:, 1]  # Right paddle extends leftward
+        top[:, 2] -= offset[:, 2]   # Bottom paddle extends upward
+
+        # Columns 0::2 are the horizontal paddles (top, bottom), 1::2 the vertical ones
+        width = np.empty_like(offset)
+        height = np.empty_like(offset)
+        width[:, 0::2] = long_
+        height[:, 0::2] = short + offset[:, 0::2]
+        width[:, 1::2] = short + offset[:, 1::2]
+        height[:, 1::2] = long_
+        return left, top, width, height
+
+    def apply_inputs(self, moves, hits):
+        """Paddle.move and Paddle.hit for every player (moves are -1..1, hits are bools)"""
+        rect = self.game_rect
+        playing = self.alive & ~self.done[:, None]
+        amount = np.where(playing, np.clip(moves, -1.0, 1.0), 0.0) * self.paddle_speed
+
+        # Horizontal paddles clamp to their length, vertical ones to their thickness like Paddle.move
+        for pos, step, low, high in ((self.px[:, 0::2], amount[:, 0::2], rect.left, rect.right - self.paddle_long),
+                                     (self.py[:, 1::2], amount[:, 1::2], rect.top, rect.bottom - self.paddle_short)):
+            moved = pos + step
+            pos[:] = np.where(step < 0, np.maximum(low, moved), np.where(step > 0, np.minimum(high, moved), pos))
+
+        swing = hits & playing & (self.hit_timer == 0)
+        self.hit_timer[swing] = self.hit_ticks
+
+    def step(self, moves=None, hits=None):
+        """Advance every unfinished match by one tick"""
+        if moves is not None:
+            self.apply_inputs(moves, hits if hits is not None else np.zeros_like(self.alive))
+
+        active = ~self.done
+        self.ticks[active] += 1
+        r = self.ball_radius
+        rect = self.game_rect
+
+        # Paddle and fever timers
+        np.subtract(self.hit_timer, 1, out=self.hit_timer, where=self.hit_timer > 0)
+        np.subtract(self.fever_timer, 1, out=self.fever_timer, where=self.fever_timer > 0)
+
+        # Fever orb: existing orbs can be collected, empty arenas may spawn one
+        orb_r = self.fever_orb_radius
+        collected = (active & self.orb &
+                     (np.abs(self.orb_x - self.x) < orb_r + r) &
+                     (np.abs(self.orb_y - self.y) < orb_r + r))
+        self.fever_timer[collected] = int(round(self.fever_duration * self.rate))
+        self.fevers += collected
+        spawned = active & ~self.orb & (self.rng.random(self.arenas) < self.fever_spawn_chance)
+        self.orb &= ~collected
+        count = int(spawned.sum())
+        if count:
+            margin = int(rect.width * 0.15)
+            self.orb_x[spawned] = self.rng.integers(rect.left + margin, rect.right - margin + 1, count)
+            self.orb_y[spawned] = self.rng.integers(rect.top + margin, rect.bottom - margin + 1, count)
+            self.orb |= spawned
+
+        # Ball.update
+        moving = active & (self.reset_timer == 0)
+        np.subtract(self.reset_timer, 1, out=self.reset_timer, where=active & (self.reset_timer > 0))
+        loser = self.move_balls(moving)
+
+        # Defensive reset, as in Ball.update
+        escaped = moving & (loser < 0) & ((self.x < rect.left - 2 * r) | (self.x > rect.right + 2 * r) |
+                                          (self.y < rect.top - 2 * r) | (self.y > rect.bottom + 2 * r))
+        self.escapes += escaped
+        self.reset_balls(escaped)
+
+        self.lose_lives(loser)
+
+    def move_balls(self, moving):
+        """Sweep every moving ball through its tick, resolving contacts in order like Ball.update
+
+        Returns the player index who let the ball through in each arena, or -1.
+        """
+        r = self.ball_radius
+        wall = self.wall_thickness
+        loser = np.full(self.arenas, -1)
+        fever = np.where(self.fever_timer > 0, self.fever_speed_multiplier, 1.0)
+
+        # Paddles don't move during the tick
+        left, top, width, height = self.paddle_rects()
+        right, bottom = left + width, top + height
+
+        # Balls that stay clear of everything this tick just move
+        speed = self.base_speed * self.hit_boost * fever
+        end_x = self.x + self.dx * speed
+        end_y = self.y + self.dy * speed
+        clear = (moving & (np.minimum(self.x, end_x) > self.clear_left) &
+                 (np.maximum(self.x, end_x) < self.clear_right) &
+                 (np.minimum(self.y, end_y) > self.clear_top) &
+                 (np.maximum(self.y, end_y) < self.clear_bottom))
+        self.x[clear] = end_x[clear]
+        self.y[clear] = end_y[clear]
+
+        # Each pass only works on the arenas whose ball is still going, so a
+        # few multi-contact ticks don't cost a pass over every arena
+        going = np.flatnonzero(moving & ~clear)
+        remaining = np.ones(going.size)
+        for _ in range(MAX_BOUNCES_PER_STEP + 1):
+            if going.size == 0:
+                break
+            count = going.size
+            x, y = self.x[going], self.y[going]
+            speed = self.base_speed[going] * self.hit_boost[going] * fever[going]
+            vx = self.dx[going] * speed
+            vy = self.dy[going] * speed
+            alive = self.alive[going]
+
+            # Columns 0-3: paddles, 4-7: FIELD_SIDES in order (paddles win ties)
+            candidates = np.full((count, 8), np.inf)
+
+            # Only paddles the ball's swept box reaches need the exact sweep
+            end_x, end_y = x + vx * remaining, y + vy * remaining
+            paddle_left, paddle_top = left[going], top[going]
+            paddle_right, paddle_bottom = right[going], bottom[going]
+            facing = np.column_stack((vy < 0, vx > 0, vy > 0, vx < 0))  # Against each PADDLE_NORMALS
+            near = (alive & facing &
+                    ((np.minimum(x, end_x) - r)[:, None] <= paddle_right) &
+                    ((np.maximum(x, end_x) + r)[:, None] >= paddle_left) &
+                    ((np.minimum(y, end_y) - r)[:, None] <= paddle_bottom) &
+                    ((np.maximum(y, end_y) + r)[:, None] >= paddle_top))
+            rows, columns = np.nonzero(near)
+            if rows.size:
+                candidates[rows, columns] = sweep_circle_rects(
+                    x[rows], y[rows], vx[rows], vy[rows], r,
+                    paddle_left[rows, columns], paddle_top[rows, columns],
+                    paddle_right[rows, columns], paddle_bottom[rows, columns], remaining[rows])
+
+            # Where the ball's center sits when touching each side: at the edge for
+            # live players, in front of the wall for eliminated ones
+            position = np.where(self.side_on_x, x[:, None], y[:, None])
+            velocity = np.where(self.side_on_x, vx[:, None], vy[:, None])
+            inset = np.where(alive[:, self.side_players], 0.0, wall)
+            plane = self.side_edges - self.side_signs * (inset + r)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = np.maximum(0.0, (plane - position) / velocity)
+            candidates[:, 4:] = np.where((velocity * self.side_signs > 0) & (t <= remaining[:, None]), t, np.inf)
+
+            first = np.argmin(candidates, axis=1)
+            t = candidates[np.arange(count), first]
+            contact = np.isfinite(t)
+            step_t = np.where(contact, t, remaining)
+            self.x[going] = x + vx * step_t
+            self.y[going] = y + vy * step_t
+            remaining = np.where(contact, remaining - step_t, 0.0)
+
+            # Paddles bounce the ball; live players lose a life and the ball
+            # stops there; walls send it back in
+            for column in np.unique(first[contact]):
+                reached = contact & (first == column)
+                if column < 4:
+                    self.bounce(going[reached], column)
+                    continue
+                player, axis, sign = FIELD_SIDES[column - 4]
+                lost = reached & alive[:, player]
+                loser[going[lost]] = player
+                remaining[lost] = 0.0
+                walled = going[reached & ~alive[:, player]]
+                position, direction = (self.x, self.dx) if axis == 'x' else (self.y, self.dy)
+                plane = self.side_edges[column - 4] - sign * (wall + r)
+                direction[walled] = -sign * np.abs(direction[walled])
+                position[walled] = np.where(sign < 0, np.maximum(position[walled], plane),
+                                            np.minimum(position[walled], plane))
+
+            still_going = remaining > 0
+            going = going[still_going]
+            remaining = remaining[still_going]
+        return loser
+
+    def bounce(self, mask, i):
+        """Paddle.bounce for paddle i in every arena in mask (a boolean mask or arena indices)"""
+        half = self.paddle_long / 2
+        if i in (0, 2):
+            offset = (self.x[mask] - (self.px[mask, i] + half)) / half
+            new_dx, new_dy = offset * 0.8, -self.dy[mask]
+        else:
+            offset = (self.y[mask] - (self.py[mask, i] + half)) / half
+            new_dx, new_dy = -self.dx[mask], offset * 0.8
+        length = np.sqrt(new_dx**2 + new_dy**2)
+        length[length == 0] = 1.0
+        self.dx[mask] = new_dx / length
+        self.dy[mask] = new_dy / length
+
+        # A paddle mid-hit boosts harder than a plain bounce
+        swinging = self.hit_timer[mask, i] > 0
+        self.hit_boost[mask] = np.where(swinging,
+                                        np.minimum(self.hit_boost[mask] * HIT_BOOST, HIT_BOOST_CAP),
+                                        np.minimum(self.hit_boost[mask] * BOUNCE_BOOST, BOUNCE_BOOST_CAP))
+        self.bounces[mask] += 1
+        self.hits[mask] += swinging
+
+    def lose_lives(self, loser):
+        """Take a life from each arena's loser, end matches with one player left, and start the next round"""
+        lost = loser >= 0
+        if not lost.any():
+            return
+        arenas = np.nonzero(lost)[0]
+        players = loser[arenas]
+        self.lives[arenas, players] -= 1
+        self.alive[arenas, players] = self.lives[arenas, players] > 0
+
+        # Last player standing wins
+        finished = lost & (self.alive.sum(axis=1) == 1)
+        self.done |= finished
+        self.winner[finished] = np.argmax(self.alive[finished], axis=1)
+
+        self.reset_balls(lost)
+        self.px[arenas, players] = self.home_x[players]
+        self.py[arenas, players] = self.home_y[players]
+
+    def compact(self):
+        """Drop finished matches from the arrays so later steps only pay for live ones"""
+        keep = ~self.done
+        for name in STAT_ARRAYS:
+            self.finished[name].append(getattr(self, name)[self.done])
+        for name in STATE_ARRAYS + STAT_ARRAYS:
+            setattr(self, name, getattr(self, name)[keep])
+        self.arenas = int(keep.sum())
+
+    def run(self, policy=None, max_ticks=MAX_MATCH_TICKS):
+        """Play every match to the end (or max_ticks) with policy(sim) -> (moves, hits)"""
+        for tick in range(1, max_ticks + 1):
+            if self.arenas == 0:
+                break
+            if policy is None:
+                self.step()
+            else:
+                self.step(*policy(self))
+            if tick % COMPACT_EVERY == 0:
+                self.compact()
+        return self.summary()
+
+    def summary(self):
+        """Aggregate statistics over every match, finished or not"""
+        stats = {name: np.concatenate(self.finished[name] + [getattr(self, name)]) for name in STAT_ARRAYS}
+        finished = stats['done']
+        seconds = stats['ticks'][finished] / SIMULATION_RATE
+        return {
+            'matches': self.matches,
+            'finished': int(finished.sum()),
+            'timeouts': int((~finished).sum()),
+            'mean_match_seconds': float(seconds.mean()) if finished.any() else None,
+            'median_match_seconds': float(np.median(seconds)) if finished.any() else None,
+            'bounces_per_match': float(stats['bounces'].mean()),
+            'hits_per_match': float(stats['hits'].mean()),
+            'fevers_per_match': float(stats['fevers'].mean()),
+            'escapes': int(stats['escapes'].sum()),
+            'win_share': [float((stats['winner'][finished] == player).mean()) if finished.any() else 0.0
+                          for player in range(4)],
+        }
+
+
+def idle_policy(sim):
+    """Nobody moves"""
+    return np.zeros((sim.arenas, 4)), np.zeros((sim.arenas, 4), dtype=bool)
+
+
+class TrackingPolicy:
+    """Follow the ball along each paddle's axis, with aiming error and a swing when it gets close
+
+    Args:
+        skill (float): Fraction of full paddle speed the player uses (0-1)
+        error (float): Standard deviation of the aiming error, in paddle lengths
+        swing_chance (float): Chance per tick of swinging while the ball is within reach
+    """
+    def __init__(self, skill=1.0, error=0.0, swing_chance=0.0):
+        self.skill = skill
+        self.error = error
+        self.swing_chance = swing_chance
+
+    def __call__(self, sim):
+        half = sim.paddle_long / 2
+        aim_error = sim.rng.normal(0.0, self.error * sim.paddle_long, (sim.arenas, 4)) if self.error else 0.0
+
+        # Horizontal paddles chase the ball's x, vertical ones its y
+        ball = np.stack([sim.x, sim.y, sim.x, sim.y], axis=1)
+        paddle_center = np.stack([sim.px[:, 0], sim.py[:, 1], sim.px[:, 2], sim.py[:, 3]], axis=1) + half
+        moves = np.clip((ball + aim_error - paddle_center) / sim.paddle_speed, -1.0, 1.0) * self.skill
+
+        hits = np.zeros((sim.arenas, 4), dtype=bool)
+        if self.swing_chance:
+            # Distance from the ball to each paddle's face
+            gap = np.stack([sim.y - sim.py[:, 0], sim.px[:, 1] - sim.x,
+                            sim.py[:, 2] - sim.y, sim.x - sim.px[:, 3]], axis=1)
+            reach = sim.ball_radius + sim.paddle_short + sim.hit_distance
+            hits = (gap < reach) & (sim.rng.random((sim.arenas, 4)) < self.swing_chance)
+        return moves, hits
+
+
+POLICIES = {
+    'idle': idle_policy,
+    'tracking': TrackingPolicy(skill=1.0, error=0.25, swing_chance=0.2),
+    'sloppy': TrackingPolicy(skill=0.6, error=0.6, swing_chance=0.05),
+}
+
+
+def sweep(arenas, policy, speed_increments, paddle_lengths, fever_durations, fever_multipliers,
+          player_count=4, max_ticks=MAX_MATCH_TICKS, seed=None):
+    """Run a batch for every combination of parameters and return (params, summary) pairs"""
+    results = []
+    for speed_increment, paddle_length, fever_duration, fever_multiplier in itertools.product(
+            speed_increments, paddle_lengths, fever_durations, fever_multipliers):
+        params = {
+            'ball_speed_increment': speed_increment,
+            'paddle_length_percent': paddle_length,
+            'fever_duration': fever_duration,
+            'fever_speed_multiplier': fever_multiplier,
+        }
+        sim = BatchPongSimulation(arenas, player_count=player_count, seed=seed, **params)
+        results.append((params, sim.run(policy, max_ticks)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sweep Pong balance parameters over batches of simulated matches')
+    parser.add_argument('--arenas', type=int, default=1000, help='Matches per parameter combination')
+    parser.add_argument('--players', type=int, default=4, help='Players per match')
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='tracking', help='Scripted paddle policy')
+    parser.add_argument('--max-ticks', type=int, default=MAX_MATCH_TICKS, help='Ticks before a match times out')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed')
+    parser.add_argument('--speed-increment', type=float, nargs='+', default=[BALL_SPEED_INCREMENT],
+                        help='BALL_SPEED_INCREMENT values to try')
+    parser.add_argument('--paddle-length', type=float, nargs='+', default=[PADDLE_LENGTH_PERCENT],
+                        help='Paddle length as a fraction of the game area (PADDLE_LENGTH_PERCENT)')
+    parser.add_argument('--fever-duration', type=float, nargs='+', default=[FEVER_DURATION],
+                        help='Fever duration values to try, in seconds')
+    parser.add_argument('--fever-multiplier', type=float, nargs='+', default=[FEVER_SPEED_MULTIPLIER],
+                        help='Fever ball speed multipliers to try')
+    args = parser.parse_args()
+
+    if np is None:
+        print("Install numpy to run the batch simulator")
+        return
+
+    start = time.time()
+    results = sweep(args.arenas, POLICIES[args.policy], args.speed_increment, args.paddle_length,
+                    args.fever_duration, args.fever_multiplier, args.players, args.max_ticks, args.seed)
+
+    print(f"{'speed+':>7} {'paddle':>7} {'fever s':>8} {'fever x':>8} {'mean s':>8} {'median s':>9} "
+          f"{'bounces':>8} {'hits':>6} {'fevers':>7} {'timeouts':>9} {'escapes':>8}")
+    for params, summary in results:
+        mean = summary['mean_match_seconds']
+        median = summary['median_match_seconds']
+        print(f"{params['ball_speed_increment']:>7.2f} {params['paddle_length_percent']:>7.3f} "
+              f"{params['fever_duration']:>8.1f} {params['fever_speed_multiplier']:>8.2f} "
+              f"{mean if mean is not None else float('nan'):>8.1f} "
+              f"{median if median is not None else float('nan'):>9.1f} "
+              f"{summary['bounces_per_match']:>8.1f} {summary['hits_per_match']:>6.1f} "
+              f"{summary['fevers_per_match']:>7.2f} {summary['timeouts']:>9} {summary['escapes']:>8}")
+
+    matches = args.arenas * len(results)
+    print(f"Simulated {matches} matches in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
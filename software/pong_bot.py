@@ -0,0 +1,213 @@
+# pong_bot.py - Computer players for empty or idle Pong slots
+#
+# A bot looks at the ball as it was a reaction time ago, works out where
+# it will cross the bot's paddle line - following it off the walls of
+# eliminated players - and steers towards that spot, give or take an
+# aiming error. Prediction is a handful of float operations per wall
+# bounce, so bots cost microseconds a tick and can play whole matches
+# headless as load for soak tests:
+#
+#   python pong_bot.py --matches 20 --rate 240
+import os
+import sys
+import time
+import contextlib
+import random
+import argparse
+from collections import deque
+from pong_core import *
+from pong_sim import PongSimulation, NO_INPUT
+
+BOT_REACTION_TIME = 0.15  # Seconds between the ball changing course and a bot noticing
+BOT_ERROR = 0.35  # Standard deviation of the aim, as a fraction of half a paddle
+BOT_SWING_TIME = 1 / 30  # Swing when the ball is this many seconds from the paddle line
+BOT_SWING_CHANCE = 0.5  # How often a bot swings when it could
+BOT_IDLE_SECONDS = 15  # With idle takeover on, a human who hasn't touched their controls this long gets a bot
+MAX_PREDICTED_BOUNCES = 4  # Wall bounces followed before giving up on a prediction
+
+# Humans take slots in this order (see PongSimulation.starting_players)
+PLAYER_SLOTS = [0, 2, 1, 3]
+
+
+def paddle_line(paddle, radius):
+    """Where the ball's center is when it reaches the paddle's front, on the paddle's axis"""
+    if paddle.direction == 0:  # Top - front faces down
+        return paddle.y + paddle.height + radius
+    elif paddle.direction == 1:  # Right - front faces left
+        return paddle.x - radius
+    elif paddle.direction == 2:  # Bottom - front faces up
+        return paddle.y - radius
+    return paddle.x + paddle.height + radius  # Left - front faces right
+
+
+def predict_crossing(x, y, vx, vy, player, line, ball, game_rect, players_alive,
+                     max_bounces=MAX_PREDICTED_BOUNCES):
+    """
+    Where the ball will cross player's paddle line, following it off walls
+
+    Args:
+        x, y, vx, vy: Ball position and velocity per tick
+        player: Whose paddle line to predict for
+        line: The paddle line (see paddle_line)
+        ball: The Ball, for its radius and side planes
+        game_rect: The square playing field
+        players_alive: Which sides are open (alive) or walled off
+
+    Returns:
+        (position along the paddle, ticks until then), or None if the ball
+        heads for another live player first (or bounces too often to follow)
+    """
+    wall_thickness = int(min(game_rect.width, game_rect.height) * WALL_THICKNESS_PERCENT)
+    ticks = 0.0
+    for _ in range(max_bounces + 1):
+        best_t, best_side, best_axis = None, None, None
+        for side, axis, sign in FIELD_SIDES:
+            position, velocity = (x, vx) if axis == 'x' else (y, vy)
+            if velocity * sign <= 0:
+                continue
+            if side == player:
+                plane = line
+            else:
+                plane = ball.side_plane(side, game_rect, 0 if players_alive[side] else wall_thickness)
+            t = max(0.0, (plane - position) / velocity)
+            if best_t is None or t < best_t:
+                best_t, best_side, best_axis = t, side, axis
+        if best_t is None:
+            return None  # Not moving
+
+        x += vx * best_t
+        y += vy * best_t
+        ticks += best_t
+        if best_side == player:
+            return (y if best_axis == 'x' else x), ticks
+        if players_alive[best_side]:
+            return None  # Someone else's turn to return it
+
+        # Off an eliminated player's wall
+        if best_axis == 'x':
+            vx = -vx
+        else:
+            vy = -vy
+    return None
+
+
+class PongBot:
+    """Plays one side of a PongSimulation by returning (move, hit) input each tick"""
+    def __init__(self, player, simulation_rate=SIMULATION_RATE, reaction_time=BOT_REACTION_TIME,
+                 error=BOT_ERROR, swing_chance=BOT_SWING_CHANCE, seed=None):
+        self.player = player
+        self.error = error
+        self.swing_chance = swing_chance
+        self.rng = random.Random(seed)
+        # The ball as seen each tick, oldest first; the bot acts on the oldest
+        self.seen = deque(maxlen=max(0, int(round(reaction_time * simulation_rate))) + 1)
+        self.swing_ticks = max(1, int(round(BOT_SWING_TIME * simulation_rate)))
+        self.heading = None
+        self.aim_offset = 0.0
+
+    def decide(self, sim):
+        """This tick's (move, hit) for the bot's player"""
+        ball = sim.ball
+        paddle = sim.paddles[self.player]
+        if not sim.players_alive[self.player]:
+            return NO_INPUT
+
+        # Velocity per tick (a ball waiting to be served isn't going anywhere yet)
+        speed = ball.base_speed * ball.hit_boost * ball.speed_multiplier
+        if ball.reset_timer > 0 or not sim.game_started:
+            speed = 0.0
+        self.seen.append((ball.x, ball.y, ball.dx * speed, ball.dy * speed))
+        x, y, vx, vy = self.seen[0]
+
+        # Pick a new aiming error whenever the ball changes course
+        heading = (vx, vy)
+        if heading != self.heading:
+            self.heading = heading
+            self.aim_offset = self.rng.gauss(0.0, self.error) * paddle.width / 2
+
+        horizontal = self.player in [0, 2]
+        center = paddle.x + paddle.width / 2 if horizontal else paddle.y + paddle.width / 2
+        prediction = None
+        if vx or vy:
+            prediction = predict_crossing(x, y, vx, vy, self.player, paddle_line(paddle, ball.radius),
+                                          ball, sim.game_rect, sim.players_alive)
+
+        if prediction is None:
+            # Nothing coming - drift back to the middle
+            target = sim.game_rect.centerx if horizontal else sim.game_rect.centery
+            ticks = None
+        else:
+            target, ticks = prediction
+            target += self.aim_offset
+            ticks -= len(self.seen) - 1  # Time that passed since what the bot saw
+
+        gap = target - center
+        move = 0.0
+        if abs(gap) >= 1:
+            move = max(-1.0, min(1.0, gap / paddle.speed))
+
+        hit = (ticks is not None and 0 <= ticks <= self.swing_ticks and abs(gap) < paddle.width / 2
+               and paddle.hit_timer == 0 and self.rng.random() < self.swing_chance)
+        return move, hit
+
+
+def bot_inputs(bots, sim):
+    """One (move, hit) pair per player, from the bots in {player: PongBot}"""
+    inputs = [NO_INPUT] * 4
+    for player, bot in bots.items():
+        inputs[player] = bot.decide(sim)
+    return inputs
+
+
+def soak(matches, simulation_rate=SIMULATION_RATE, width=800, height=600, seed=0, max_ticks=None):
+    """
+    Play matches between four bots as fast as possible
+
+    Returns:
+        dict: Matches played, ticks, timeouts, and time spent in the bots and the simulation
+    """
+    max_ticks = max_ticks or simulation_rate * 60 * 5
+    ticks = timeouts = 0
+    bot_time = sim_time = 0.0
+    for match in range(matches):
+        sim = PongSimulation(width, height, 4, seed=seed + match, rate=simulation_rate)
+        bots = {player: PongBot(player, simulation_rate, seed=seed + match * 4 + player) for player in range(4)}
+        sim.start()
+        for _ in range(max_ticks):
+            start = time.perf_counter()
+            inputs = bot_inputs(bots, sim)
+            middle = time.perf_counter()
+            sim.step(inputs)
+            bot_time += middle - start
+            sim_time += time.perf_counter() - middle
+            ticks += 1
+            if sim.game_over:
+                break
+        else:
+            timeouts += 1
+    return {'matches': matches, 'ticks': ticks, 'timeouts': timeouts,
+            'bot_us_per_tick': bot_time / max(ticks, 1) * 1e6,
+            'sim_us_per_tick': sim_time / max(ticks, 1) * 1e6}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play headless Pong matches between bots")
+    parser.add_argument('--matches', type=int, default=10, help='Matches to play')
+    parser.add_argument('--rate', type=int, default=SIMULATION_RATE, help='Simulation ticks per second')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the first match')
+    args = parser.parse_args(argv)
+
+    # The game's debug prints would swamp the report
+    start = time.time()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        report = soak(args.matches, args.rate, seed=args.seed)
+
+    elapsed = time.time() - start
+    print(f"{report['matches']} matches, {report['ticks']} ticks ({report['timeouts']} timeouts) in {elapsed:.1f}s")
+    print(f"Four bots: {report['bot_us_per_tick']:.1f} us/tick, simulation: {report['sim_us_per_tick']:.1f} us/tick")
+    print(f"Frame budget at {args.rate} Hz: {1e6 / args.rate:.0f} us/tick")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+# pong_core.py - Constants, geometry and sizing for Pong that don't need pygame
+#
+# Everything the simulation needs lives here so it can run headless;
+# pong_utils re-exports it alongside the pygame drawing helpers.
+#
+# Speeds are per second and durations in seconds, whatever the frame
+# or simulation rate; the simulation turns them into per-tick amounts
+# with per_tick() and ticks().
+
+# Colors
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+PLAYER_COLORS = [
+    (255, 50, 50),   # Red - Player 1 (Top)
+    (50, 255, 50),   # Green - Player 2 (Right)
+    (50, 50, 255),   # Blue - Player 3 (Bottom)
+    (255, 255, 50),  # Yellow - Player 4 (Left)
+]
+WALL_COLOR = (100, 100, 100)
+
+# Game settings - will be calculated based on screen size
+GAME_MARGIN_PERCENT = 0.06  # 6% of screen size
+PADDLE_WIDTH_PERCENT = 0.12  # 12% of game area width
+PADDLE_HEIGHT_PERCENT = 0.02  # 2% of game area height
+BALL_RADIUS_PERCENT = 0.015  # 1.5% of game area width
+PADDLE_SPEED_PERCENT = 0.6  # 60% of game area width per second
+PADDLE_HIT_DISTANCE_PERCENT = 0.03  # 3% of game area width
+
+# Paddle layout used by the simulation (fractions of the square game area)
+PADDLE_LENGTH_PERCENT = 0.15  # 15% of the game area
+PADDLE_THICKNESS_PERCENT = 0.02  # 2% of the game area
+PADDLE_REACH_PERCENT = 0.05  # How far a hit pushes the paddle out
+PADDLE_MOVE_PERCENT = 3.0  # Paddle speed, in game areas per second
+PADDLE_DISTANCE_PERCENT = 0.475  # Distance from the center to each paddle
+
+# Each paddle's front faces into the field, indexed by direction (top, right, bottom, left)
+PADDLE_NORMALS = [(0, 1), (-1, 0), (0, -1), (1, 0)]
+
+# Sides of the field as (player, axis, sign): the ball is heading at a side
+# when its velocity along axis has that sign
+FIELD_SIDES = [(3, 'x', -1), (1, 'x', 1), (0, 'y', -1), (2, 'y', 1)]
+WALL_THICKNESS_PERCENT = 0.05  # Wall that replaces an eliminated player
+MAX_BOUNCES_PER_STEP = 4  # Contacts resolved within a single tick before the ball stops for it
+
+# Fixed settings
+PLAYER_STARTING_LIVES = 3
+BALL_RESET_TIME = 1.0  # Seconds to wait before moving after reset
+BALL_SPEED_INCREMENT = 45.0  # Speed increase between rounds, pixels per second
+BALL_MAX_SPEED = 60000  # Maximum ball speed, pixels per second
+HIT_BOOST = 1.2  # Ball speed-up when a paddle is mid-hit
+HIT_BOOST_CAP = 3.0
+BOUNCE_BOOST = 1.05  # Ball speed-up for a plain bounce off a paddle
+BOUNCE_BOOST_CAP = 2.0
+BALL_BOOST_COLOR = (255, 165, 0)  # Ball color after a paddle boost
+BALL_EFFECT_TIME = 0.2  # Seconds the speed-up flash around the ball lasts
+BALL_EFFECT_FRAMES = 12  # Pre-rendered steps of the flash
+COUNTDOWN_DURATION = 5
+FEVER_DURATION = 10  # Seconds
+FEVER_ORB_MIN_SPAWN_TIME = 10
+FEVER_ORB_MAX_SPAWN_TIME = 30
+FEVER_SPEED_MULTIPLIER = 2.0  # Ball speed while fever is active
+FEVER_HUE_SPEED = 120  # Degrees per second the fever colors cycle
+FEVER_ORB_HUE_SPEED = 60  # Degrees per second the orb colors cycle
+MULTI_BALL_SPLIT = 6  # Extra balls released by the multi-ball power-up
+MAX_EXTRA_BALLS = 200  # Most extra balls in play at once
+MULTI_BALL_SERVE_INTERVAL = 0.5  # Seconds between the multi-ball mode's balls coming into play
+MULTI_BALL_COLOR = (120, 220, 255)  # Multi-ball power-up orb
+PADDLE_HIT_TIME = 1 / 6  # Seconds a paddle hit lasts
+
+# Game loop timing
+SIMULATION_RATE = 60  # Fixed simulation steps per second
+DISPLAY_FPS = None  # Display frame rate cap (None = the shared clock's setting, 0 = uncapped)
+MAX_FRAME_TIME = 0.25  # Longest frame the simulation will catch up on, in seconds
+
+# Bluetooth controller tilt (pitch in degrees)
+TILT_DEADZONE = 8  # Ignore small tilts so a resting controller doesn't drift
+TILT_FULL_SCALE = 35  # Tilt at which the paddle moves at full speed
+
+def per_tick(per_second, rate=SIMULATION_RATE):
+    """A speed per second as the amount per simulation tick"""
+    return per_second / rate
+
+def ticks(seconds, rate=SIMULATION_RATE):
+    """A duration in seconds as a whole number of simulation ticks (at least one)"""
+    return max(1, int(round(seconds * rate)))
+
+class Rect:
+    """Minimal float rectangle with the parts of the pygame.Rect API the game logic uses"""
+    __slots__ = ('x', 'y', 'width', 'height')
+
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    @property
+    def left(self):
+        return self.x
+
+    @property
+    def top(self):
+        return self.y
+
+    @property
+    def right(self):
+        return self.x + self.width
+
+    @property
+    def bottom(self):
+        return self.y + self.height
+
+    @property
+    def centerx(self):
+        return self.x + self.width / 2
+
+    @property
+    def centery(self):
+        return self.y + self.height / 2
+
+    def colliderect(self, other):
+        """Same overlap rule as pygame.Rect.colliderect (touching edges don't count)"""
+        return (self.x < other.x + other.width and other.x < self.x + self.width and
+                self.y < other.y + other.height and other.y < self.y + self.height)
+
+    def __iter__(self):
+        # Lets pygame functions take a Rect anywhere they accept (x, y, w, h)
+        return iter((self.x, self.y, self.width, self.height))
+
+    def __eq__(self, other):
+        return tuple(self) == tuple(other)
+
+    def __repr__(self):
+        return f"Rect({self.x}, {self.y}, {self.width}, {self.height})"
+
+def calculate_game_dimensions(screen_width, screen_height):
+    """Calculate game dimensions based on screen size"""
+    # Calculate margin size
+    margin = int(min(screen_width, screen_height) * GAME_MARGIN_PERCENT)
+
+    # Calculate game area size
+    game_size = min(screen_width, screen_height) - (2 * margin)
+
+    # Calculate paddle dimensions
+    paddle_width = int(game_size * PADDLE_WIDTH_PERCENT)
+    paddle_height = int(game_size * PADDLE_HEIGHT_PERCENT)
+
+    # Calculate ball radius
+    ball_radius = int(game_size * BALL_RADIUS_PERCENT)
+
+    # Calculate speeds (pixels per second)
+    paddle_speed = game_size * PADDLE_SPEED_PERCENT
+    ball_speed = paddle_speed * 1.05  # Ball 1.5 times faster than original (was 0.7)
+
+    # Calculate hit distance
+    paddle_hit_distance = int(game_size * PADDLE_HIT_DISTANCE_PERCENT)
+
+    # Calculate fever orb size
+    fever_orb_radius = ball_radius * 2
+
+    return {
+        'margin': margin,
+        'game_size': game_size,
+        'paddle_width': paddle_width,
+        'paddle_height': paddle_height,
+        'ball_radius': ball_radius,
+        'paddle_speed': paddle_speed,
+        'ball_speed': ball_speed,
+        'paddle_hit_distance': paddle_hit_distance,
+        'fever_orb_radius': fever_orb_radius
+    }
+
+def square_game_rect(screen_width, screen_height):
+    """
+    Calculate a square game area centered on the screen.
+    This ensures the game is fair with equal distances on all sides.
+    """
+    # Get dimensions based on screen size
+    dims = calculate_game_dimensions(screen_width, screen_height)
+    game_size = dims['game_size']
+
+    # Calculate centered position
+    left = (screen_width - game_size) // 2
+    top = (screen_height - game_size) // 2
+
+    return Rect(left, top, game_size, game_size)
+
+def tilt_to_move(pitch):
+    """Convert a controller pitch angle into a signed paddle speed fraction (-1 to 1)"""
+    if pitch is None or abs(pitch) < TILT_DEADZONE:
+        return 0.0
+    amount = min(1.0, (abs(pitch) - TILT_DEADZONE) / (TILT_FULL_SCALE - TILT_DEADZONE))
+    return amount if pitch > 0 else -amount
+
+def hsv_to_rgb(h, s, v):
+    """Convert HSV color to RGB"""
+    if s == 0.0:
+        return (v, v, v)
+
+    i = int(h * 6)
+    f = (h * 6) - i
+    p = v * (1 - s)
+    q = v * (1 - s * f)
+    t = v * (1 - s * (1 - f))
+
+    i %= 6
+    if i == 0:
+        return (int(v * 255), int(t * 255), int(p * 255))
+    elif i == 1:
+        return (int(q * 255), int(v * 255), int(p * 255))
+    elif i == 2:
+        return (int(p * 255), int(v * 255), int(t * 255))
+    elif i == 3:
+        return (int(p * 255), int(q * 255), int(v * 255))
+    elif i == 4:
+        return (int(t * 255), int(p * 255), int(v * 255))
+    elif i == 5:
+        return (int(v * 255), int(p * 255), int(q * 255))
@@ -0,0 +1,266 @@
+# pong_multiball.py - Extra balls for multi-ball Pong, stored as arrays
+#
+# PongSimulation keeps its main Ball as is; the extra balls of the
+# multi-ball mode and power-up live here as one array per field
+# (positions, directions, speeds, boosts, radii, timers) and are moved,
+# bounced off paddles and walls and checked against the sides all at
+# once, following the same swept rules as Ball.update and
+# Paddle.bounce. That keeps 50+ balls well inside a frame, where a
+# Python Ball per ball would not be. Without NumPy the store falls
+# back to one Ball object per ball.
+import random
+from pong_core import *
+from pong_ball import Ball, serve_direction
+
+# Try to import numpy (the array-backed store needs it)
+try:
+    import numpy as np
+    from pong_batch import sweep_circle_rects
+except ImportError:
+    print("Warning: Could not import numpy, multi-ball uses one Ball object per ball")
+    np = None
+
+BALL_FIELDS = ('x', 'y', 'dx', 'dy', 'base_speed', 'hit_boost', 'radius', 'reset_timer', 'boosted')
+
+
+class BallStore:
+    """Any number of balls, advanced together one tick per step()"""
+    def __init__(self, rng=None, rate=SIMULATION_RATE):
+        self.rng = rng if rng is not None else random
+        self.rate = rate
+        self.reset_ticks = ticks(BALL_RESET_TIME, rate)
+        if np is not None:
+            self.x = np.zeros(0)
+            self.y = np.zeros(0)
+            self.dx = np.zeros(0)
+            self.dy = np.zeros(0)
+            self.base_speed = np.zeros(0)
+            self.hit_boost = np.zeros(0)
+            self.radius = np.zeros(0)
+            self.reset_timer = np.zeros(0, dtype=int)
+            self.boosted = np.zeros(0, dtype=bool)  # Bounced off a paddle since the serve (drawn orange)
+        else:
+            self.balls = []
+
+    def __len__(self):
+        return len(self.x) if np is not None else len(self.balls)
+
+    def add(self, x, y, radius, speed, directions, reset_timer=0, serve_interval=0):
+        """
+        Add a ball at (x, y) for each (dx, dy) in directions, the nth waiting reset_timer + n * serve_interval ticks
+
+        speed is per tick, like Ball.base_speed.
+        """
+        count = len(directions)
+        if count == 0:
+            return
+        if np is None:
+            for n, (dx, dy) in enumerate(directions):
+                ball = Ball(x, y, radius, 0, random.Random(0), self.rate)
+                ball.base_speed = speed
+                ball.dx, ball.dy = dx, dy
+                ball.reset_timer = reset_timer + n * serve_interval
+                ball.game_started = True
+                self.balls.append(ball)
+            return
+        dx, dy = zip(*directions)
+        new = {'x': np.full(count, float(x)), 'y': np.full(count, float(y)),
+               'dx': np.array(dx, dtype=float), 'dy': np.array(dy, dtype=float),
+               'base_speed': np.full(count, float(speed)), 'hit_boost': np.ones(count),
+               'radius': np.full(count, float(radius)), 'reset_timer': reset_timer + np.arange(count) * serve_interval,
+               'boosted': np.zeros(count, dtype=bool)}
+        for name in BALL_FIELDS:
+            setattr(self, name, np.concatenate([getattr(self, name), new[name]]))
+
+    def serve(self, indices, game_rect):
+        """Send these balls back to the center and off in a new direction after a pause, like Ball.reset"""
+        for i in indices:
+            dx, dy = serve_direction(self.rng)
+            if np is None:
+                ball = self.balls[i]
+                ball.x, ball.y = game_rect.centerx, game_rect.centery
+                ball.dx, ball.dy = dx, dy
+                ball.reset_timer = self.reset_ticks
+                ball.hit_boost = 1.0
+                ball.is_boosted = False
+                continue
+            self.x[i] = game_rect.centerx
+            self.y[i] = game_rect.centery
+            self.dx[i] = dx
+            self.dy[i] = dy
+            self.reset_timer[i] = self.reset_ticks
+            self.hit_boost[i] = 1.0
+            self.boosted[i] = False
+
+    def remove(self, indices):
+        """Drop these balls"""
+        if not indices:
+            return
+        if np is None:
+            drop = set(indices)
+            self.balls = [ball for i, ball in enumerate(self.balls) if i not in drop]
+            return
+        keep = np.ones(len(self), dtype=bool)
+        keep[list(indices)] = False
+        for name in BALL_FIELDS:
+            setattr(self, name, getattr(self, name)[keep])
+
+    def clear(self):
+        self.remove(list(range(len(self))))
+
+    def snapshot(self):
+        """Copies of every ball's state, for restore()"""
+        if np is None:
+            return [(ball, ball.x, ball.y, ball.dx, ball.dy, ball.base_speed, ball.hit_boost, ball.reset_timer,
+                     ball.is_boosted, ball.effect_timer, ball.speed_multiplier) for ball in self.balls]
+        return tuple(getattr(self, name).copy() for name in BALL_FIELDS)
+
+    def restore(self, snapshot):
+        """Put the balls back the way they were when snapshot() was taken"""
+        if np is None:
+            self.balls = []
+            for ball_state in snapshot:
+                ball = ball_state[0]
+                (ball.x, ball.y, ball.dx, ball.dy, ball.base_speed, ball.hit_boost, ball.reset_timer,
+                 ball.is_boosted, ball.effect_timer, ball.speed_multiplier) = ball_state[1:]
+                self.balls.append(ball)
+            return
+        for name, values in zip(BALL_FIELDS, snapshot):
+            setattr(self, name, values.copy())
+
+    def positions(self):
+        """(xs, ys) of every ball, as copies"""
+        if np is None:
+            return [ball.x for ball in self.balls], [ball.y for ball in self.balls]
+        return self.x.copy(), self.y.copy()
+
+    def drawables(self):
+        """(x, y, radius, boosted, waiting to be served) for every ball"""
+        if np is None:
+            return [(ball.x, ball.y, ball.radius, ball.is_boosted, ball.reset_timer > 0) for ball in self.balls]
+        return list(zip(self.x.tolist(), self.y.tolist(), self.radius.tolist(),
+                        self.boosted.tolist(), (self.reset_timer > 0).tolist()))
+
+    def step(self, game_rect, paddles, players_alive, speed_multiplier=1.0):
+        """
+        Move every ball one tick, bouncing off paddles and walls along the way
+
+        Returns:
+            (contacts, losers): (paddle index, hit_active) for every paddle bounce,
+            and (ball index, player) for every ball that got past a live player
+        """
+        if np is None:
+            contacts, losers = [], []
+            for i, ball in enumerate(self.balls):
+                ball.set_speed_multiplier(speed_multiplier)
+                ball_contacts, loser = ball.update(game_rect, paddles, players_alive)
+                contacts.extend(ball_contacts)
+                if loser is not None:
+                    losers.append((i, loser))
+            return contacts, losers
+
+        count = len(self)
+        contacts, losers = [], []
+        if count == 0:
+            return contacts, losers
+
+        # Balls waiting to be served count down instead of moving
+        moving = self.reset_timer == 0
+        np.subtract(self.reset_timer, 1, out=self.reset_timer, where=~moving)
+        remaining = np.where(moving, 1.0, 0.0)
+
+        alive = np.array(players_alive, dtype=bool)
+        normals = np.array(PADDLE_NORMALS, dtype=float)
+        rects = [paddle.get_rect() for paddle in paddles]
+        left = np.array([rect.left for rect in rects], dtype=float)
+        top = np.array([rect.top for rect in rects], dtype=float)
+        right = np.array([rect.right for rect in rects], dtype=float)
+        bottom = np.array([rect.bottom for rect in rects], dtype=float)
+        wall = int(min(game_rect.width, game_rect.height) * WALL_THICKNESS_PERCENT)
+        edges = {3: game_rect.left, 1: game_rect.right, 0: game_rect.top, 2: game_rect.bottom}
+        r = self.radius
+        loser = np.full(count, -1)
+        every = np.arange(count)
+
+        # Resolve contacts in the order they happen, for the rest of the tick after each one
+        for _ in range(MAX_BOUNCES_PER_STEP + 1):
+            going = remaining > 0
+            if not going.any():
+                break
+            speed = self.base_speed * self.hit_boost * speed_multiplier
+            vx = self.dx * speed
+            vy = self.dy * speed
+
+            # Columns 0-3: paddles, 4-7: FIELD_SIDES in order (paddles win ties)
+            candidates = np.full((count, 8), np.inf)
+            facing = vx[:, None] * normals[:, 0] + vy[:, None] * normals[:, 1] < 0
+            t_paddle = sweep_circle_rects(self.x[:, None], self.y[:, None], vx[:, None], vy[:, None], r[:, None],
+                                          left, top, right, bottom, remaining[:, None])
+            candidates[:, :4] = np.where(going[:, None] & alive & facing, t_paddle, np.inf)
+            for column, (player, axis, sign) in enumerate(FIELD_SIDES, start=4):
+                position, velocity = (self.x, vx) if axis == 'x' else (self.y, vy)
+                plane = edges[player] - sign * ((0 if alive[player] else wall) + r)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    t = np.maximum(0.0, (plane - position) / velocity)
+                candidates[:, column] = np.where(going & (velocity * sign > 0) & (t <= remaining), t, np.inf)
+
+            first = np.argmin(candidates, axis=1)
+            t = candidates[every, first]
+            contact = going & np.isfinite(t)
+            step_t = np.where(contact, t, remaining)
+            self.x += vx * step_t
+            self.y += vy * step_t
+            remaining = np.where(contact, remaining - step_t, 0.0)
+
+            for i in range(4):
+                bounced = contact & (first == i)
+                if bounced.any():
+                    self.bounce(bounced, paddles[i])
+                    contacts.extend([(i, paddles[i].hit_active)] * int(bounced.sum()))
+
+            for column, (player, axis, sign) in enumerate(FIELD_SIDES, start=4):
+                reached = contact & (first == column)
+                if not reached.any():
+                    continue
+                if alive[player]:
+                    # The ball got past a live player and stops there
+                    loser[reached] = player
+                    remaining[reached] = 0.0
+                else:
+                    # Walls send the ball back in
+                    position, direction = (self.x, self.dx) if axis == 'x' else (self.y, self.dy)
+                    plane = edges[player] - sign * (wall + r[reached])
+                    direction[reached] = -sign * np.abs(direction[reached])
+                    position[reached] = (np.maximum(position[reached], plane) if sign < 0
+                                         else np.minimum(position[reached], plane))
+
+        # Defensive check, as in Ball.update - serve anything that got out some other way
+        escaped = (loser < 0) & ((self.x < game_rect.left - 2 * r) | (self.x > game_rect.right + 2 * r) |
+                                 (self.y < game_rect.top - 2 * r) | (self.y > game_rect.bottom + 2 * r))
+        if escaped.any():
+            print(f"WARNING: {int(escaped.sum())} extra ball(s) escaped the boundaries. Serving again.")
+            self.serve(np.nonzero(escaped)[0].tolist(), game_rect)
+
+        losers = [(int(i), int(loser[i])) for i in np.nonzero(loser >= 0)[0]]
+        return contacts, losers
+
+    def bounce(self, mask, paddle):
+        """Paddle.bounce for every ball in mask"""
+        half = paddle.width / 2
+        if paddle.direction in [0, 2]:  # Top or bottom paddle
+            offset = (self.x[mask] - (paddle.x + half)) / half
+            new_dx, new_dy = offset * 0.8, -self.dy[mask]
+        else:  # Left or right paddle
+            offset = (self.y[mask] - (paddle.y + half)) / half
+            new_dx, new_dy = -self.dx[mask], offset * 0.8
+        length = np.sqrt(new_dx**2 + new_dy**2)
+        length[length == 0] = 1.0
+        self.dx[mask] = new_dx / length
+        self.dy[mask] = new_dy / length
+
+        # A paddle mid-hit boosts harder than a plain bounce, as in Ball.apply_hit_boost
+        if paddle.hit_active:
+            self.hit_boost[mask] = np.minimum(self.hit_boost[mask] * HIT_BOOST, HIT_BOOST_CAP)
+        else:
+            self.hit_boost[mask] = np.minimum(self.hit_boost[mask] * BOUNCE_BOOST, BOUNCE_BOOST_CAP)
+        self.boosted[mask] = True
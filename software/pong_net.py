@@ -0,0 +1,502 @@
+# pong_net.py - Pong between linked cabinets, each playing one paddle
+#
+# A NetServer runs the only real match: it takes every cabinet's input
+# for each frame, plays empty sides with bots, steps the simulation and
+# sends every cabinet the result. Cabinets don't wait for it. A
+# NetClient steps its own copy of the match straight away, with its own
+# input and the last input it heard from everyone else, so its paddle
+# answers the controls at once. When the server's state for a frame
+# arrives it's compared with what the client predicted for that frame;
+# if they differ the client goes back to its snapshot of that frame,
+# takes the server's state, and plays the frames since then again.
+#
+# Clients run a few frames ahead of the server so their input arrives
+# in time; the server tells each client how early its input was and the
+# client steps one frame more or less now and then to keep that steady.
+#
+# Both sides build the simulation from the same seed, so the random
+# serves and orbs match too. Extra multi-ball balls aren't sent, so net
+# matches are played with the one ball.
+#
+# Run the server, then a client on each cabinet:
+#   python pong_net.py serve [--port 5557]
+#   python pong_net.py play host [--port 5557] [--windowed]
+import sys
+import time
+import random
+import socket
+import struct
+import argparse
+from pong_core import *
+from pong_sim import PongSimulation, NO_INPUT
+from pong_bot import PongBot, PLAYER_SLOTS
+from pong_fever import FeverOrb
+from pong_replay import MOVE_STEPS
+
+NET_PORT = 5557
+NET_MAGIC = b'PGNT'
+JOIN, WELCOME, INPUT, STATE, LEAVE = range(5)  # Packet kinds
+INPUT_REDUNDANCY = 8  # Frames of input repeated in every input packet, so a lost packet costs nothing
+INPUT_SLACK = 2  # Frames early a client aims for its input to reach the server
+MAX_ROLLBACK_TIME = 0.25  # Seconds of frames a client keeps to go back to
+LEAD_ADJUST_TIME = 0.1  # Seconds between a client's one-frame speed-ups and slow-downs
+NET_TIMEOUT = 5.0  # Seconds without a packet before the other side is given up on
+JOIN_INTERVAL = 0.25  # Seconds between a joining client's requests
+NET_WIDTH, NET_HEIGHT = 1280, 720  # Size of the shared match (the displaymode render size)
+
+PACKET = struct.Struct('<4sB')  # magic, kind
+WELCOME_BODY = struct.Struct('<bHHHQI')  # player (-1 = full), width, height, rate, seed, server frame
+INPUT_HEADER = struct.Struct('<IB')  # newest frame, number of frames
+INPUT_ENTRY = struct.Struct('<bB')  # move in 1/MOVE_STEPS, hit
+STATE_HEADER = struct.Struct('<Ib')  # frame, how many frames early the client's input arrived
+INPUTS = struct.Struct('<4bB')  # every player's move this frame, hit bits
+# tick, status, winner, alive bits, lives; ball; paddles; fever; fever orb and multi-ball orb
+WORLD = struct.Struct('<IBbB4B7diiB' + 'ddiB' * 4 + 'Bid' + 'Bddd' * 2)
+GAME_STARTED, GAME_OVER = 1, 2  # status bits
+BALL_STARTED, BALL_BOOSTED = 1, 2  # ball flag bits
+
+
+def quantize(move, hit):
+    """An input as it's sent: move in whole 1/MOVE_STEPS, hit as 0 or 1"""
+    return round(max(-1.0, min(1.0, move)) * MOVE_STEPS), 1 if hit else 0
+
+
+def dequantize(step, hit):
+    return step / MOVE_STEPS, bool(hit)
+
+
+def local_input(inputs):
+    """Every control on a cabinet drives its one paddle: the (move, hit) of all local inputs together"""
+    move = sum(move for move, _ in inputs)
+    return max(-1.0, min(1.0, move)), any(hit for _, hit in inputs)
+
+
+def world(sim):
+    """The server's say on a simulation, packed: everything but the random generator and extra balls"""
+    ball, fever = sim.ball, sim.fever_effect
+    values = [sim.tick, (GAME_STARTED if sim.game_started else 0) | (GAME_OVER if sim.game_over else 0),
+              -1 if sim.winner is None else sim.winner,
+              sum(1 << i for i, alive in enumerate(sim.players_alive) if alive)]
+    values += sim.player_lives
+    values += [ball.x, ball.y, ball.dx, ball.dy, ball.base_speed, ball.hit_boost, ball.speed_multiplier,
+               ball.reset_timer, ball.effect_timer,
+               (BALL_STARTED if ball.game_started else 0) | (BALL_BOOSTED if ball.is_boosted else 0)]
+    for paddle in sim.paddles:
+        values += [paddle.x, paddle.y, paddle.hit_timer, paddle.hit_active]
+    values += [fever.active, fever.timer, fever.hue]
+    for orb in (sim.fever_orb, sim.multi_ball_orb):
+        values += [True, orb.x, orb.y, orb.hue] if orb else [False, 0.0, 0.0, 0.0]
+    return WORLD.pack(*values)
+
+
+def apply_world(sim, data):
+    """Overwrite a simulation with a packed world() from the server"""
+    values = WORLD.unpack(data)
+    sim.tick, status, winner, alive = values[:4]
+    sim.game_started = bool(status & GAME_STARTED)
+    sim.game_over = bool(status & GAME_OVER)
+    sim.winner = None if winner < 0 else winner
+    sim.players_alive = [bool(alive >> i & 1) for i in range(4)]
+    sim.player_lives = list(values[4:8])
+
+    ball = sim.ball
+    (ball.x, ball.y, ball.dx, ball.dy, ball.base_speed, ball.hit_boost, ball.speed_multiplier,
+     ball.reset_timer, ball.effect_timer, flags) = values[8:18]
+    ball.game_started = bool(flags & BALL_STARTED)
+    ball.is_boosted = bool(flags & BALL_BOOSTED)
+    if ball.is_boosted:
+        ball.boost_color = BALL_BOOST_COLOR
+
+    offset = 18
+    for paddle in sim.paddles:
+        paddle.x, paddle.y, paddle.hit_timer, hit_active = values[offset:offset + 4]
+        paddle.hit_active = bool(hit_active)
+        offset += 4
+
+    fever = sim.fever_effect
+    active, fever.timer, fever.hue = values[offset:offset + 3]
+    fever.active = bool(active)
+    offset += 3
+
+    for name in ('fever_orb', 'multi_ball_orb'):
+        present, x, y, hue = values[offset:offset + 4]
+        offset += 4
+        orb = getattr(sim, name)
+        if not present:
+            setattr(sim, name, None)
+            continue
+        if orb is None:
+            # Its own generator, so making it doesn't use up the match's random numbers
+            orb = FeverOrb(sim.game_rect, sim.fever_orb_radius, random.Random(0), sim.rate)
+            setattr(sim, name, orb)
+        orb.x, orb.y, orb.hue = x, y, hue
+
+
+class NetServer:
+    """Runs the match every cabinet plays, with bots on the sides nobody has joined"""
+    def __init__(self, host='', port=NET_PORT, rate=SIMULATION_RATE, seed=None,
+                 width=NET_WIDTH, height=NET_HEIGHT):
+        self.host = host
+        self.port = port
+        self.socket = None
+        self.sim = PongSimulation(width, height, 4, seed, rate=rate)
+        self.frame = 0
+        self.bots = {player: PongBot(player, rate) for player in range(4)}
+        self.clients = {}  # address -> player
+        self.players = {}  # player -> [address, {frame: input}, last input, slack, time last heard from]
+        self.last_inputs = [quantize(*NO_INPUT)] * 4
+
+    def start(self):
+        """Open the socket; returns False if the port is taken"""
+        try:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.bind((self.host, self.port))
+            self.socket.setblocking(False)
+            self.port = self.socket.getsockname()[1]
+            print(f"Net server on port {self.port}")
+            return True
+        except OSError as e:
+            print(f"Failed to start net server: {e}")
+            self.close()
+            return False
+
+    def send(self, kind, body, address):
+        try:
+            self.socket.sendto(PACKET.pack(NET_MAGIC, kind) + body, address)
+        except OSError as e:
+            print(f"Error sending to {address[0]}:{address[1]}: {e}")
+
+    def poll(self):
+        """Handle every join, input and goodbye waiting on the socket"""
+        now = time.perf_counter()
+        while True:
+            try:
+                packet, address = self.socket.recvfrom(512)
+            except (BlockingIOError, ConnectionResetError):
+                break
+            if len(packet) < PACKET.size or packet[:4] != NET_MAGIC:
+                continue
+            kind = packet[4]
+            if kind == JOIN:
+                self.join(address, now)
+            elif kind == LEAVE:
+                self.leave(address)
+            elif kind == INPUT and address in self.clients:
+                self.receive_input(self.players[self.clients[address]], packet, now)
+
+    def join(self, address, now):
+        player = self.clients.get(address)
+        if player is None:
+            free = [slot for slot in PLAYER_SLOTS if slot not in self.players]
+            if not free:
+                self.send(WELCOME, WELCOME_BODY.pack(-1, 0, 0, 0, 0, 0), address)
+                return
+            player = free[0]
+            self.clients[address] = player
+            self.players[player] = [address, {}, self.last_inputs[player], 0, now]
+            print(f"Player {player + 1} joined from {address[0]}:{address[1]}")
+            if not self.sim.game_started and not self.sim.game_over:
+                self.sim.start()
+        sim = self.sim
+        self.send(WELCOME, WELCOME_BODY.pack(player, sim.width, sim.height, sim.rate, sim.seed, self.frame), address)
+
+    def leave(self, address):
+        player = self.clients.pop(address, None)
+        if player is None:
+            return
+        del self.players[player]
+        print(f"Player {player + 1} left; a bot takes over")
+        if not self.players and self.sim.game_over:
+            # Everyone has seen the result; set up the next match
+            self.sim.reset_game()
+
+    def receive_input(self, client, packet, now):
+        newest, count = INPUT_HEADER.unpack_from(packet, PACKET.size)
+        offset = PACKET.size + INPUT_HEADER.size
+        count = min(count, (len(packet) - offset) // INPUT_ENTRY.size)
+        frame = newest - count + 1
+        for entry in INPUT_ENTRY.iter_unpack(packet[offset:offset + count * INPUT_ENTRY.size]):
+            if frame > self.frame:
+                client[1][frame] = entry
+            frame += 1
+        client[3] = max(-128, min(127, newest - self.frame))
+        client[4] = now
+
+    def step(self):
+        """Play the next frame with everyone's input and send the result; returns the simulation's events"""
+        if self.socket is not None:
+            self.poll()
+        self.frame += 1
+        now = time.perf_counter()
+
+        inputs = []
+        for player in range(4):
+            client = self.players.get(player)
+            if client is not None and now - client[4] > NET_TIMEOUT:
+                print(f"Player {player + 1} timed out")
+                self.leave(client[0])
+                client = None
+            if client is None:
+                entry = quantize(*self.bots[player].decide(self.sim))
+            else:
+                # Input that hasn't arrived yet is guessed the same way the clients guess it
+                entry = client[1].pop(self.frame, client[2])
+                client[2] = entry
+                for frame in [frame for frame in client[1] if frame < self.frame]:
+                    del client[1][frame]
+            inputs.append(entry)
+        self.last_inputs = inputs
+
+        events = self.sim.step([dequantize(*entry) for entry in inputs])
+        if self.socket is not None and self.players:
+            self.broadcast()
+        return events
+
+    def broadcast(self):
+        moves = [move for move, _ in self.last_inputs]
+        hits = sum(hit << player for player, (_, hit) in enumerate(self.last_inputs))
+        body = INPUTS.pack(*moves, hits) + world(self.sim)
+        for client in list(self.players.values()):
+            self.send(STATE, STATE_HEADER.pack(self.frame, client[3]) + body, client[0])
+
+    def run(self):
+        """Play in real time until interrupted"""
+        frame_time = 1.0 / self.sim.rate
+        next_frame = time.perf_counter()
+        try:
+            while True:
+                for event in self.step():
+                    if event['type'] == 'game_over':
+                        print(f"Player {event['winner'] + 1} wins")
+                next_frame += frame_time
+                delay = next_frame - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -MAX_FRAME_TIME:
+                    next_frame = time.perf_counter()  # Too far behind to catch up
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        if self.socket:
+            self.socket.close()
+            self.socket = None
+
+
+class NetClient:
+    """A cabinet's copy of the server's match, predicted ahead and corrected as the server's state arrives"""
+    def __init__(self, host='localhost', port=NET_PORT):
+        self.address = (host, port)
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+        self.sim = None  # Created once the server welcomes us
+        self.player = None
+        self.frame = 0  # Newest frame predicted
+        self.confirmed = 0  # Newest frame the server's state arrived for
+        self.history = {}  # frame -> (snapshot, world) after that frame
+        self.inputs = {}  # frame -> this cabinet's input
+        self.remote_inputs = [quantize(*NO_INPUT)] * 4  # Everyone's latest input from the server
+        self.slack = None
+        self.max_rollback = 0
+        self.adjust_frames = 0
+        self.last_adjust = 0
+        self.last_join = None
+        self.join_time = None
+        self.last_heard = None
+        self.events = []  # Events from corrections, handed out with the next step
+        self.rollbacks = self.resimulated = 0
+
+    @property
+    def connected(self):
+        return self.last_heard is not None and time.perf_counter() - self.last_heard < NET_TIMEOUT
+
+    def send(self, kind, body=b''):
+        try:
+            self.socket.sendto(PACKET.pack(NET_MAGIC, kind) + body, self.address)
+        except OSError as e:
+            print(f"Error sending to net server: {e}")
+
+    def connect(self, timeout=NET_TIMEOUT):
+        """Ask to join until the server answers; returns True once we have a side to play"""
+        deadline = time.perf_counter() + timeout
+        while self.sim is None and time.perf_counter() < deadline:
+            self.poll()
+            if self.player == -1:
+                print("The game is full")
+                return False
+            time.sleep(0.005)
+        if self.sim is None:
+            print(f"No answer from the net server at {self.address[0]}:{self.address[1]}")
+        return self.sim is not None
+
+    def poll(self):
+        """Ask to join if we haven't been let in, then read every packet and act on the newest state"""
+        now = time.perf_counter()
+        if self.sim is None and (self.last_join is None or now - self.last_join >= JOIN_INTERVAL):
+            self.send(JOIN)
+            self.last_join = now
+            if self.join_time is None:
+                self.join_time = now
+
+        newest = None
+        while True:
+            try:
+                packet, _ = self.socket.recvfrom(2048)
+            except (BlockingIOError, ConnectionResetError):
+                break
+            if len(packet) < PACKET.size or packet[:4] != NET_MAGIC:
+                continue
+            self.last_heard = now
+            kind = packet[4]
+            if kind == WELCOME and self.sim is None:
+                self.welcome(packet, now)
+            elif kind == STATE and self.sim is not None:
+                frame = STATE_HEADER.unpack_from(packet, PACKET.size)[0]
+                if frame > self.confirmed and (newest is None or frame > newest[0]):
+                    newest = (frame, packet)
+        if newest is not None:
+            self.reconcile(newest[1])
+
+    def welcome(self, packet, now):
+        player, width, height, rate, seed, frame = WELCOME_BODY.unpack_from(packet, PACKET.size)
+        self.player = player
+        if player < 0:
+            return
+        self.sim = PongSimulation(width, height, 4, seed, rate=rate)
+        self.max_rollback = ticks(MAX_ROLLBACK_TIME, rate)
+        self.adjust_frames = ticks(LEAD_ADJUST_TIME, rate)
+        # Start far enough ahead that our input gets there in time
+        lead = int((now - self.join_time) / 2 * rate) + INPUT_SLACK + 1
+        self.frame = self.confirmed = frame
+        self.history = {frame: (self.sim.snapshot(), world(self.sim))}
+        for _ in range(lead):
+            self.advance(NO_INPUT)
+        print(f"Joined as player {player + 1} ({width}x{height} at {rate} Hz)")
+
+    def reconcile(self, packet):
+        """Check a frame of the server's state against our prediction, playing it again if it was wrong"""
+        frame, slack = STATE_HEADER.unpack_from(packet, PACKET.size)
+        offset = PACKET.size + STATE_HEADER.size
+        *moves, hits = INPUTS.unpack_from(packet, offset)
+        state = packet[offset + INPUTS.size:offset + INPUTS.size + WORLD.size]
+        self.remote_inputs = [(move, hits >> player & 1) for player, move in enumerate(moves)]
+        self.confirmed = frame
+        self.slack = slack
+
+        predicted = self.history.get(frame)
+        for old in [old for old in self.history if old < frame]:
+            del self.history[old]
+            self.inputs.pop(old, None)
+        if predicted is not None and predicted[1] == state:
+            return  # We got it right
+
+        # Go back to that frame, take the server's word for it, and play the frames since again
+        was_over = self.sim.game_over
+        if predicted is not None:
+            self.sim.restore(predicted[0])
+        apply_world(self.sim, state)
+        self.history[frame] = (self.sim.snapshot(), state)
+        if frame >= self.frame:
+            self.frame = frame  # We had fallen behind the server
+        for replayed in range(frame + 1, self.frame + 1):
+            self.sim.step(self.frame_inputs(replayed))
+            self.history[replayed] = (self.sim.snapshot(), world(self.sim))
+        self.rollbacks += 1
+        self.resimulated += self.frame - frame
+        if self.sim.game_over and not was_over:
+            self.events.append({'type': 'game_over', 'winner': self.sim.winner})
+
+    def frame_inputs(self, frame):
+        """Inputs to predict a frame with: ours for that frame, everyone else's latest"""
+        inputs = list(self.remote_inputs)
+        inputs[self.player] = self.inputs.get(frame, inputs[self.player])
+        return [dequantize(*entry) for entry in inputs]
+
+    def advance(self, move_hit):
+        """Predict one more frame with our input"""
+        self.frame += 1
+        self.inputs[self.frame] = quantize(*move_hit)
+        events = self.sim.step(self.frame_inputs(self.frame))
+        self.history[self.frame] = (self.sim.snapshot(), world(self.sim))
+        # Frames too old to go back to; a state older than this resyncs from scratch
+        self.history.pop(self.frame - self.max_rollback, None)
+        return events
+
+    def step(self, inputs):
+        """
+        Play one frame of the local (move, hit) inputs; returns the events to react to
+
+        Usually one frame is predicted. Now and then it's two or none, to keep our
+        input arriving INPUT_SLACK frames early at the server.
+        """
+        self.poll()
+        events, self.events = self.events, []
+        move_hit = local_input(inputs)
+        frames = 1
+        if self.slack is not None and self.frame - self.last_adjust >= self.adjust_frames:
+            if self.slack < INPUT_SLACK - 1:
+                frames = 2
+            elif self.slack > INPUT_SLACK + 1:
+                frames = 0
+            if frames != 1:
+                self.last_adjust = self.frame
+        for _ in range(frames):
+            events += self.advance(move_hit)
+        self.send_inputs()
+        return events
+
+    def send_inputs(self):
+        first = max(self.frame - INPUT_REDUNDANCY + 1, self.confirmed + 1)
+        entries = [self.inputs.get(frame, (0, 0)) for frame in range(first, self.frame + 1)]
+        body = INPUT_HEADER.pack(self.frame, len(entries))
+        body += b''.join(INPUT_ENTRY.pack(*entry) for entry in entries)
+        self.send(INPUT, body)
+
+    def close(self):
+        self.send(LEAVE)
+        self.socket.close()
+
+
+def play(host, port=NET_PORT, fullscreen=True):
+    """Join a net match and play it in a window of our own; returns the winner or -1"""
+    import pygame
+    from displaymode import open_display
+    from pong import run_pong
+
+    client = NetClient(host, port)
+    if not client.connect():
+        client.close()
+        return -1
+    pygame.init()
+    screen = open_display((client.sim.width, client.sim.height), fullscreen)
+    pygame.display.set_caption(f"Pong - Player {client.player + 1}")
+    return run_pong(screen, 4, simulation_rate=client.sim.rate, net=client)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pong between linked cabinets")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help="Run the match the cabinets play")
+    serve.add_argument('--port', type=int, default=NET_PORT)
+    serve.add_argument('--rate', type=int, default=SIMULATION_RATE, help="Simulation ticks per second")
+    serve.add_argument('--seed', type=int)
+    join = commands.add_parser('play', help="Play one side of a match")
+    join.add_argument('host')
+    join.add_argument('--port', type=int, default=NET_PORT)
+    join.add_argument('--windowed', action='store_true', help="Don't go fullscreen")
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        server = NetServer(port=args.port, rate=args.rate, seed=args.seed)
+        if not server.start():
+            return 1
+        server.run()
+        return 0
+    play(args.host, args.port, not args.windowed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,12 @@
 # pong_paddle.py - Paddle class for Pong game
-import pygame
 import math
-from pong_utils import *
+from pong_core import *
 
 class Paddle:
-    def __init__(self, x, y, width, height, direction, hit_distance):
+    __slots__ = ('x', 'y', 'width', 'height', 'direction', 'hit_active', 'hit_timer', 'hit_distance', 'speed',
+                 'hit_ticks', 'rect')
+
+    def __init__(self, x, y, width, height, direction, hit_distance, speed=None, rate=SIMULATION_RATE):
         self.x = x
         self.y = y
         self.width = width
@@ -13,6 +15,9 @@ class Paddle:
         self.hit_active = False
         self.hit_timer = 0
         self.hit_distance = hit_distance  # Dynamic hit distance based on screen size
+        self.speed = speed if speed is not None else hit_distance  # Movement per tick at full input
+        self.hit_ticks = ticks(PADDLE_HIT_TIME, rate)
+        self.rect = Rect(x, y, width, height)  # Reused by get_rect()
     
     def activate_hit(self):
         """Activate the hit state for the paddle"""
@@ -27,8 +32,9 @@ class Paddle:
                 self.hit_active = False
     
     def hit(self):
-        """Trigger hit animation"""
-        self.hit_timer = PADDLE_HIT_DURATION
+        """Trigger hit animation (the paddle counts as hitting until it finishes)"""
+        self.hit_active = True
+        self.hit_timer = self.hit_ticks
     
     def move(self, direction, amount, game_rect):
         """Move paddle left/right or up/down depending on orientation"""
@@ -43,79 +49,65 @@ class Paddle:
             elif direction == "down":
                 self.y = min(game_rect.bottom - self.height, self.y + amount)
     
-    def get_rect(self):
-        """Get the paddle rectangle with hit animation applied"""
+    def get_rect(self, position=None):
+        """
+        Get the paddle rectangle with hit animation applied (at position if given)
+        
+        This is the paddle's one Rect, updated in place - copy it to keep it past the next call.
+        """
+        x, y = position if position is not None else (self.x, self.y)
+        
         paddle_hit_offset = 0
         if self.hit_timer > 0:
-            paddle_hit_offset = self.hit_distance * (self.hit_timer / PADDLE_HIT_DURATION)
+            paddle_hit_offset = self.hit_distance * (self.hit_timer / self.hit_ticks)
         
+        rect = self.rect
         if self.direction == 0:  # Top - extend downward
-            return pygame.Rect(self.x, self.y, self.width, self.height + paddle_hit_offset)
+            rect.x, rect.y, rect.width, rect.height = x, y, self.width, self.height + paddle_hit_offset
         elif self.direction == 1:  # Right - extend leftward
-            return pygame.Rect(self.x - paddle_hit_offset, self.y, 
-                             self.height + paddle_hit_offset, self.width)
+            rect.x, rect.y = x - paddle_hit_offset, y
+            rect.width, rect.height = self.height + paddle_hit_offset, self.width
         elif self.direction == 2:  # Bottom - extend upward
-            return pygame.Rect(self.x, self.y - paddle_hit_offset, 
-                             self.width, self.height + paddle_hit_offset)
+            rect.x, rect.y = x, y - paddle_hit_offset
+            rect.width, rect.height = self.width, self.height + paddle_hit_offset
         elif self.direction == 3:  # Left - extend rightward
-            return pygame.Rect(self.x, self.y, 
-                             self.height + paddle_hit_offset, self.width)
+            rect.x, rect.y, rect.width, rect.height = x, y, self.height + paddle_hit_offset, self.width
+        return rect
+    
+    def faces(self, vx, vy):
+        """True if something moving by (vx, vy) is heading into the paddle's front"""
+        normal_x, normal_y = PADDLE_NORMALS[self.direction]
+        return vx * normal_x + vy * normal_y < 0
     
-    def check_collision(self, ball):
-        """Check if the ball collides with this paddle and handle the collision"""
-        paddle_rect = self.get_rect()
+    def bounce(self, ball):
+        """Send the ball back into the field, angled by where it hit; returns whether the paddle was mid-hit"""
+        if self.direction in [0, 2]:  # Top or bottom paddle
+            paddle_center_x = self.x + self.width / 2
+            # Calculate how far from the center the ball hit (normalized to [-1, 1])
+            hit_position = (ball.x - paddle_center_x) / (self.width / 2)
+            
+            # Reflect the ball's y direction
+            ball.dy = -ball.dy
+            
+            # Adjust x direction based on where the ball hit the paddle
+            ball.dx = hit_position * 0.8  # Scale factor to control the angle
+        else:  # Left or right paddle
+            paddle_center_y = self.y + self.width / 2  # width is the vertical size for vertical paddles
+            # Calculate how far from the center the ball hit (normalized to [-1, 1])
+            hit_position = (ball.y - paddle_center_y) / (self.width / 2)
+            
+            # Reflect the ball's x direction
+            ball.dx = -ball.dx
+            
+            # Adjust y direction based on where the ball hit the paddle
+            ball.dy = hit_position * 0.8  # Scale factor to control the angle
         
-        # Check if the ball's rect intersects with the paddle's rect
-        if ball.check_collision(paddle_rect):
-            # Get the center of the paddle
-            if self.direction in [0, 2]:  # Top or bottom paddle
-                paddle_center_x = self.x + self.width / 2
-                # Calculate how far from the center the ball hit (normalized to [-1, 1])
-                hit_position = (ball.x - paddle_center_x) / (self.width / 2)
-                
-                # Reflect the ball's y direction
-                ball.dy = -ball.dy
-                
-                # Adjust x direction based on where the ball hit the paddle
-                ball.dx = hit_position * 0.8  # Scale factor to control the angle
-                
-                # Normalize the direction vector
-                length = math.sqrt(ball.dx**2 + ball.dy**2)
-                if length > 0:
-                    ball.dx /= length
-                    ball.dy /= length
-                    
-                # Apply hit boost
-                ball.apply_hit_boost()
-                
-                print(f"Collision with {'top' if self.direction == 0 else 'bottom'} paddle! New direction: ({ball.dx}, {ball.dy})")
-                return self.hit_active
-                
-            else:  # Left or right paddle
-                paddle_center_y = self.y + self.width / 2  # width is the vertical size for vertical paddles
-                # Calculate how far from the center the ball hit (normalized to [-1, 1])
-                hit_position = (ball.y - paddle_center_y) / (self.width / 2)
-                
-                # Reflect the ball's x direction
-                ball.dx = -ball.dx
-                
-                # Adjust y direction based on where the ball hit the paddle
-                ball.dy = hit_position * 0.8  # Scale factor to control the angle
-                
-                # Normalize the direction vector
-                length = math.sqrt(ball.dx**2 + ball.dy**2)
-                if length > 0:
-                    ball.dx /= length
-                    ball.dy /= length
-                    
-                # Apply hit boost
-                ball.apply_hit_boost()
-                
-                print(f"Collision with {'left' if self.direction == 3 else 'right'} paddle! New direction: ({ball.dx}, {ball.dy})")
-                return self.hit_active
+        # Normalize the direction vector
+        length = math.sqrt(ball.dx**2 + ball.dy**2)
+        if length > 0:
+            ball.dx /= length
+            ball.dy /= length
         
-        return None  # No collision
-    
-    def draw(self, screen, color):
-        """Draw the paddle on the screen"""
-        pygame.draw.rect(screen, color, self.get_rect())
\ No newline at end of file
+        # Apply hit boost
+        ball.apply_hit_boost(self.hit_active)
+        return self.hit_active
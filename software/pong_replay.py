@@ -0,0 +1,212 @@
+# pong_replay.py - Record a Pong match's inputs and play them back
+#
+# A PongSimulation is deterministic given its seed and the (move, hit)
+# pair of every player on every tick, so that's all a replay stores:
+# one flags byte (swings, started, reset) and one signed byte of
+# movement per player per tick, zlib-compressed. A few minutes of play
+# is a few KB. Playing a log back re-runs the simulation headless, as
+# fast as the CPU allows, and checks it ends in exactly the state the
+# match did.
+#
+#   python pong_replay.py replays/pong-20250101-120000.pongreplay
+import os
+import sys
+import time
+import zlib
+import struct
+from pong_core import SIMULATION_RATE
+from pong_sim import PongSimulation, NO_INPUT
+
+REPLAY_MAGIC = b'PGRP'
+REPLAY_VERSION = 3
+REPLAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "replays")
+MOVE_STEPS = 127  # Movement is stored as a signed byte: -127..127 -> -1.0..1.0
+
+# magic, version, seed, width, height, players, extra balls, multi-ball power-up, simulation rate,
+# ticks, final state checksum
+HEADER = struct.Struct('<4sBQHHBHBHII')
+
+# Flag bits in each tick's first byte (bits 0-3 are the players' swings)
+FLAG_STARTED = 1 << 4  # The game had started when this tick ran
+FLAG_RESET = 1 << 5    # The match was reset just before this tick
+TICK_SIZE = 5  # Flags byte plus four movement bytes
+
+
+def state_checksum(sim):
+    """CRC of everything that matters in a simulation's state, exact to the bit"""
+    values = [sim.tick, sim.ball.x, sim.ball.y, sim.ball.dx, sim.ball.dy,
+              sim.ball.base_speed, sim.ball.hit_boost, sim.ball.reset_timer,
+              sim.fever_effect.timer]
+    for paddle in sim.paddles:
+        values += [paddle.x, paddle.y, paddle.hit_timer]
+    values += sim.player_lives
+    if sim.fever_orb:
+        values += [sim.fever_orb.x, sim.fever_orb.y]
+    xs, ys = sim.balls.positions()
+    values += list(xs) + list(ys)
+    return zlib.crc32(struct.pack(f'<{len(values)}d', *values))
+
+
+class InputLog:
+    """The seed, screen size and per-tick inputs of one match"""
+    def __init__(self, seed, width, height, player_count=4, multi_ball=0, multi_ball_powerup=False,
+                 rate=SIMULATION_RATE):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.player_count = player_count
+        self.multi_ball = multi_ball
+        self.multi_ball_powerup = multi_ball_powerup
+        self.rate = rate
+        self.ticks = bytearray()
+        self.reset_pending = False
+        self.checksum = 0
+
+    @classmethod
+    def for_simulation(cls, sim):
+        """An empty log for a match that's about to start"""
+        return cls(sim.seed, sim.width, sim.height, sim.player_count,
+                   sim.multi_ball, sim.multi_ball_powerup, sim.rate)
+
+    def __len__(self):
+        return len(self.ticks) // TICK_SIZE
+
+    def mark_reset(self):
+        """Note that the match was reset; recorded with the next tick"""
+        self.reset_pending = True
+
+    def record(self, sim, inputs):
+        """
+        Log the inputs about to be passed to sim.step()
+
+        Returns the inputs as they'll be replayed (movement rounded to what the
+        log stores) - pass these to sim.step() so the match and its replay agree.
+        """
+        flags = FLAG_STARTED if sim.game_started else 0
+        if self.reset_pending:
+            flags |= FLAG_RESET
+            self.reset_pending = False
+
+        stored = []
+        moves = []
+        for player in range(4):
+            move, hit = inputs[player] if inputs is not None and player < len(inputs) else NO_INPUT
+            step = round(max(-1.0, min(1.0, move)) * MOVE_STEPS)
+            if hit:
+                flags |= 1 << player
+            moves.append(step)
+            stored.append((step / MOVE_STEPS, bool(hit)))
+
+        self.ticks.append(flags)
+        self.ticks += struct.pack('<4b', *moves)
+        return stored
+
+    def finish(self, sim):
+        """Remember the state the match ended in, for checking replays"""
+        self.checksum = state_checksum(sim)
+
+    def encode(self):
+        """The log as bytes: a fixed header then the compressed ticks"""
+        header = HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, self.width, self.height,
+                             self.player_count, self.multi_ball, self.multi_ball_powerup,
+                             self.rate, len(self), self.checksum)
+        return header + zlib.compress(bytes(self.ticks), 9)
+
+    @classmethod
+    def decode(cls, data):
+        """Read a log written by encode()"""
+        if data[:4] != REPLAY_MAGIC or data[4] != REPLAY_VERSION:
+            raise ValueError("Not a Pong replay (or from an incompatible version)")
+        (magic, version, seed, width, height, player_count, multi_ball, multi_ball_powerup,
+         rate, ticks, checksum) = HEADER.unpack_from(data)
+        log = cls(seed, width, height, player_count, multi_ball, bool(multi_ball_powerup), rate)
+        log.ticks = bytearray(zlib.decompress(data[HEADER.size:]))
+        log.checksum = checksum
+        if len(log) != ticks:
+            raise ValueError(f"Replay is truncated: {len(log)} of {ticks} ticks")
+        return log
+
+    def save(self, directory=REPLAY_DIR, name='pong'):
+        """Write the log to directory/name-<time>.pongreplay; returns the path"""
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.pongreplay")
+            with open(path, 'wb') as f:
+                f.write(self.encode())
+            print(f"Replay written to {path} ({len(self)} ticks)")
+            return path
+        except Exception as e:
+            print(f"Error writing replay: {e}")
+            return None
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.decode(f.read())
+
+    def tick_inputs(self, index):
+        """(flags, inputs) for tick index"""
+        offset = index * TICK_SIZE
+        flags = self.ticks[offset]
+        moves = struct.unpack_from('<4b', self.ticks, offset + 1)
+        return flags, [(moves[player] / MOVE_STEPS, bool(flags & (1 << player))) for player in range(4)]
+
+
+def replay(log, on_events=None):
+    """
+    Re-run a logged match headless
+
+    Args:
+        log (InputLog): The match to replay
+        on_events: Optional callback(tick index, events) for every tick
+
+    Returns:
+        PongSimulation: The simulation in its final state
+    """
+    sim = PongSimulation(log.width, log.height, log.player_count, seed=log.seed,
+                         multi_ball=log.multi_ball, multi_ball_powerup=log.multi_ball_powerup, rate=log.rate)
+    for index in range(len(log)):
+        flags, inputs = log.tick_inputs(index)
+        if flags & FLAG_RESET:
+            sim.reset_game()
+        if flags & FLAG_STARTED:
+            sim.start()
+        else:
+            sim.game_started = False
+            sim.ball.game_started = False
+        events = sim.step(inputs)
+        if on_events is not None and events:
+            on_events(index, events)
+    return sim
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python pong_replay.py <replay file>")
+        return 1
+    log = InputLog.load(argv[0])
+    print(f"Seed {log.seed}, {log.width}x{log.height}, {log.player_count} players, {len(log)} ticks at {log.rate} Hz")
+
+    counts = {}
+
+    def count(index, events):
+        for event in events:
+            counts[event['type']] = counts.get(event['type'], 0) + 1
+            if event['type'] in ('life_lost', 'game_over'):
+                print(f"  tick {index}: {event}")
+
+    start = time.perf_counter()
+    sim = replay(log, count)
+    elapsed = time.perf_counter() - start
+    print(f"Replayed in {elapsed:.2f}s ({len(log) / max(elapsed, 1e-9):.0f} ticks/s)")
+    print(f"Events: {counts}")
+    if log.checksum and state_checksum(sim) != log.checksum:
+        print("Final state does NOT match the recording")
+        return 2
+    print("Final state matches the recording")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+# pong_sim.py - Headless Pong simulation (ball, paddles, lives, fever)
+#
+# Nothing here imports pygame: PongGame feeds inputs in and draws the
+# result, and the same simulation can run thousands of frames a second
+# on its own for tests, bots and replays. Every random choice comes from
+# the match's own seeded RNG, so the seed plus the inputs of each tick
+# replay a match exactly (see pong_replay.py).
+import random
+from pong_core import *
+from pong_paddle import Paddle
+from pong_ball import Ball, serve_direction
+from pong_fever import FeverOrb, FeverEffect
+from pong_multiball import BallStore
+
+# What one player does during a step: move is a signed fraction of the
+# paddle's speed (-1 = full speed left/up, 1 = full speed right/down)
+NO_INPUT = (0.0, False)
+
+class PongSimulation:
+    def __init__(self, width, height, player_count=4, seed=None, multi_ball=0, multi_ball_powerup=False,
+                 rate=SIMULATION_RATE):
+        """
+        Set up a match on a width x height screen, with a random seed unless one is given
+
+        step() advances the match by 1 / rate seconds; speeds and durations
+        are given per second and turned into per-tick amounts here.
+
+        multi_ball extra balls are in play the whole match (served again whenever one
+        gets past a player); multi_ball_powerup spawns orbs that split the main ball.
+        """
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.seed)
+        self.rate = rate
+        self.width = width
+        self.height = height
+        self.player_count = player_count
+        self.game_rect = square_game_rect(width, height)
+
+        dims = calculate_game_dimensions(width, height)
+        self.ball_radius = dims['ball_radius']
+        self.ball_speed = dims['ball_speed']
+        self.fever_orb_radius = dims['fever_orb_radius']
+
+        # Determine the short dimension for consistent positioning
+        short_dim = min(self.game_rect.width, self.game_rect.height)
+        paddle_long = int(short_dim * PADDLE_LENGTH_PERCENT)
+        paddle_short = int(short_dim * PADDLE_THICKNESS_PERCENT)
+        hit_distance = int(short_dim * PADDLE_REACH_PERCENT)
+        paddle_speed = per_tick(short_dim * PADDLE_MOVE_PERCENT, rate)
+
+        # Top, right, bottom, left
+        self.paddles = [Paddle(0, 0, paddle_long, paddle_short, direction, hit_distance, paddle_speed, rate)
+                        for direction in range(4)]
+        for paddle in self.paddles:
+            self.reset_paddle_position(paddle)
+
+        self.ball = Ball(self.game_rect.centerx, self.game_rect.centery,
+                         self.ball_radius, self.ball_speed, self.rng, rate)
+        self.fever_effect = FeverEffect(FEVER_DURATION, rate)
+        self.fever_orb = None
+
+        # Extra balls, stored as arrays
+        self.multi_ball = multi_ball
+        self.multi_ball_powerup = multi_ball_powerup
+        self.balls = BallStore(self.rng, rate)
+        self.multi_ball_orb = None
+        self.serve_extra_balls()
+
+        self.tick = 0
+        self.game_started = False
+        self.game_over = False
+        self.winner = None
+        self.players_alive, self.player_lives = self.starting_players(player_count)
+
+    @staticmethod
+    def starting_players(player_count):
+        """Return (players_alive, player_lives) for a match with player_count players"""
+        players_alive = [False, False, False, False]
+        player_lives = [0, 0, 0, 0]
+
+        # SWAPPED LOGIC: Player 1 (top) is always active, player 2 is the bottom
+        # paddle, player 3 the right and player 4 the left
+        for count, index in ((1, 0), (2, 2), (3, 1), (4, 3)):
+            if player_count >= count:
+                players_alive[index] = True
+                player_lives[index] = PLAYER_STARTING_LIVES
+        return players_alive, player_lives
+
+    def start(self):
+        """Let the ball start moving"""
+        self.game_started = True
+        self.ball.game_started = True
+
+    def reset_game(self):
+        """Reset the match with every player back in"""
+        self.game_started = False
+        self.game_over = False
+        self.winner = None
+        self.players_alive = [True, True, True, True]
+        self.player_lives = [PLAYER_STARTING_LIVES] * 4
+        self.ball.reset(self.game_rect.centerx, self.game_rect.centery)
+        for paddle in self.paddles:
+            self.reset_paddle_position(paddle)
+        self.fever_orb = None
+        self.multi_ball_orb = None
+        self.balls.clear()
+        self.serve_extra_balls()
+
+    def serve_extra_balls(self):
+        """Put the multi-ball mode's extra balls in play from the center, one after another"""
+        if self.multi_ball <= 0:
+            return
+        directions = [serve_direction(self.rng) for _ in range(min(self.multi_ball, MAX_EXTRA_BALLS))]
+        self.balls.add(self.game_rect.centerx, self.game_rect.centery, self.ball_radius,
+                       self.ball.base_speed, directions, self.ball.reset_ticks,
+                       ticks(MULTI_BALL_SERVE_INTERVAL, self.rate))
+
+    def split_ball(self):
+        """Multi-ball power-up: release extra balls from where the main ball is"""
+        count = min(MULTI_BALL_SPLIT, MAX_EXTRA_BALLS - len(self.balls))
+        directions = [serve_direction(self.rng) for _ in range(count)]
+        self.balls.add(self.ball.x, self.ball.y, self.ball_radius, self.ball.base_speed, directions)
+        return count
+
+    def snapshot(self):
+        """
+        Everything that changes during a match, for restore()
+
+        Cheap enough to take every tick, so a networked game can roll back
+        and play ticks again when the real inputs arrive.
+        """
+        ball, fever = self.ball, self.fever_effect
+        orbs = tuple((orb, orb.x, orb.y, orb.hue) if orb else None for orb in (self.fever_orb, self.multi_ball_orb))
+        return (self.tick, self.game_started, self.game_over, self.winner,
+                tuple(self.players_alive), tuple(self.player_lives), self.rng.getstate(),
+                (ball.x, ball.y, ball.dx, ball.dy, ball.base_speed, ball.hit_boost, ball.speed_multiplier,
+                 ball.reset_timer, ball.game_started, ball.effect_timer, ball.is_boosted, ball.boost_color),
+                tuple((paddle.x, paddle.y, paddle.hit_active, paddle.hit_timer) for paddle in self.paddles),
+                (fever.active, fever.timer, fever.hue), orbs, self.balls.snapshot())
+
+    def restore(self, snapshot):
+        """Go back to the state a snapshot() was taken in"""
+        (self.tick, self.game_started, self.game_over, self.winner, alive, lives, rng_state,
+         ball_state, paddle_states, fever_state, orbs, balls) = snapshot
+        self.players_alive = list(alive)
+        self.player_lives = list(lives)
+        self.rng.setstate(rng_state)
+        ball = self.ball
+        (ball.x, ball.y, ball.dx, ball.dy, ball.base_speed, ball.hit_boost, ball.speed_multiplier,
+         ball.reset_timer, ball.game_started, ball.effect_timer, ball.is_boosted, ball.boost_color) = ball_state
+        for paddle, paddle_state in zip(self.paddles, paddle_states):
+            paddle.x, paddle.y, paddle.hit_active, paddle.hit_timer = paddle_state
+        fever = self.fever_effect
+        fever.active, fever.timer, fever.hue = fever_state
+        for name, orb_state in zip(('fever_orb', 'multi_ball_orb'), orbs):
+            orb = None
+            if orb_state is not None:
+                orb, orb.x, orb.y, orb.hue = orb_state
+            setattr(self, name, orb)
+        self.balls.restore(balls)
+
+    def reset_paddle_position(self, paddle):
+        """Reset paddle to its starting position"""
+        center_x = self.game_rect.centerx
+        center_y = self.game_rect.centery
+        short_dim = min(self.game_rect.width, self.game_rect.height)
+
+        # Distance from center to paddles
+        paddle_distance = int(short_dim * PADDLE_DISTANCE_PERCENT)
+
+        if paddle.direction == 0:  # Top
+            paddle.x = center_x
+            paddle.y = center_y - paddle_distance
+        elif paddle.direction == 1:  # Right
+            paddle.x = center_x + paddle_distance
+            paddle.y = center_y
+        elif paddle.direction == 2:  # Bottom
+            paddle.x = center_x
+            paddle.y = center_y + paddle_distance
+        elif paddle.direction == 3:  # Left
+            paddle.x = center_x - paddle_distance
+            paddle.y = center_y
+
+    def apply_input(self, player, move, hit):
+        """Move and/or swing one player's paddle"""
+        if not self.players_alive[player]:
+            return
+
+        paddle = self.paddles[player]
+        if move:
+            if player in [0, 2]:  # Top/Bottom
+                direction = "right" if move > 0 else "left"
+            else:  # Right/Left
+                direction = "down" if move > 0 else "up"
+            paddle.move(direction, paddle.speed * min(abs(move), 1.0), self.game_rect)
+
+        if hit and self.game_started and paddle.hit_timer == 0:
+            paddle.hit()
+
+    def step(self, inputs=None):
+        """
+        Advance the match by one fixed tick
+
+        Args:
+            inputs: One (move, hit) pair per player, or None for no input
+
+        Returns:
+            list: Event dicts for anything that happened this tick
+        """
+        events = []
+        if inputs is not None:
+            for player, (move, hit) in enumerate(inputs):
+                self.apply_input(player, move, hit)
+
+        if not self.game_started or self.game_over:
+            return events
+        self.tick += 1
+
+        # Update paddles
+        for paddle in self.paddles:
+            paddle.update()
+
+        # Update fever effect
+        self.fever_effect.update()
+
+        # Update fever orb if it exists
+        if self.fever_orb:
+            self.fever_orb.update()
+
+            # Check for collision with ball
+            if self.fever_orb.check_collision(self.ball.get_rect()):
+                self.fever_effect.activate()
+                self.fever_orb = None
+                events.append({'type': 'fever'})
+        else:
+            # Spawn new fever orb randomly
+            if self.rng.randint(0, self.rate * self.rng.randint(FEVER_ORB_MIN_SPAWN_TIME, FEVER_ORB_MAX_SPAWN_TIME)) == 0:
+                self.fever_orb = FeverOrb(self.game_rect, self.fever_orb_radius, self.rng, self.rate)
+
+        # Multi-ball power-up orb, spawned like the fever orb
+        if self.multi_ball_powerup:
+            if self.multi_ball_orb:
+                self.multi_ball_orb.update()
+                if self.multi_ball_orb.check_collision(self.ball.get_rect()):
+                    self.multi_ball_orb = None
+                    events.append({'type': 'multi_ball', 'balls': self.split_ball()})
+            elif self.rng.randint(0, self.rate * self.rng.randint(FEVER_ORB_MIN_SPAWN_TIME, FEVER_ORB_MAX_SPAWN_TIME)) == 0:
+                self.multi_ball_orb = FeverOrb(self.game_rect, self.fever_orb_radius, self.rng, self.rate)
+
+        # Apply fever speed boost if active
+        speed_multiplier = FEVER_SPEED_MULTIPLIER if self.fever_effect.active else 1.0
+        self.ball.set_speed_multiplier(speed_multiplier)
+        self.ball.game_started = self.game_started
+
+        # Move the ball, bouncing off paddles and walls on the way
+        contacts, player_hit = self.ball.update(self.game_rect, self.paddles, self.players_alive)
+        for i, hit_active in contacts:
+            events.append({'type': 'paddle', 'player': i, 'hit': bool(hit_active)})
+
+        # Handle player elimination
+        if player_hit is not None:
+            self.lose_life(player_hit, events)
+
+            # Reset ball and the paddle of the player who missed
+            self.ball.reset(self.game_rect.centerx, self.game_rect.centery)
+            self.reset_paddle_position(self.paddles[player_hit])
+
+        # Extra balls, all at once
+        if len(self.balls) and not self.game_over:
+            contacts, losers = self.balls.step(self.game_rect, self.paddles, self.players_alive, speed_multiplier)
+            for i, hit_active in contacts:
+                events.append({'type': 'paddle', 'player': i, 'hit': bool(hit_active)})
+
+            # Extra balls that get past a player cost a life too, then go back
+            # to the center in multi-ball mode or are gone after a power-up
+            for index, player in losers:
+                if self.players_alive[player] and not self.game_over:
+                    self.lose_life(player, events)
+            indices = [index for index, player in losers]
+            if self.multi_ball > 0:
+                self.balls.serve(indices, self.game_rect)
+            else:
+                self.balls.remove(indices)
+
+        return events
+
+    def lose_life(self, player, events):
+        """Take a life from player, eliminating them (and ending the match) at zero"""
+        self.player_lives[player] -= 1
+        events.append({'type': 'life_lost', 'player': player,
+                       'lives': self.player_lives[player]})
+
+        if self.player_lives[player] <= 0:
+            self.players_alive[player] = False
+            events.append({'type': 'eliminated', 'player': player})
+
+            # The game is over when exactly one player is left
+            if sum(self.players_alive) == 1:
+                self.game_over = True
+                self.winner = self.players_alive.index(True)
+                events.append({'type': 'game_over', 'winner': self.winner})
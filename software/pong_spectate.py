@@ -0,0 +1,443 @@
+# pong_spectate.py - Streaming a Pong match to spectator screens
+#
+# The game's SpectatorServer sends the state a spectator needs to draw
+# the match (ball, paddles, lives, fever) over UDP after every tick.
+# Each snapshot is a short list of integers (positions in 1/8 pixels),
+# sent as the differences from the last snapshot that spectator
+# acknowledged: a bit mask of the fields that changed, then each change
+# as a zigzag varint. A spectator that hasn't acknowledged anything the
+# server still remembers gets a full snapshot instead. A typical tick
+# is 15-25 bytes.
+#
+# SpectatorClient keeps the recent snapshots and draws the match a few
+# ticks in the past, interpolating between the two snapshots around that
+# moment, so lost or late packets don't show. The game only streams
+# when started with --spectate, and only to this machine unless given
+# --spectate-host 0.0.0.0. Run the viewer with:
+#   python pong_spectate.py [host] [port] [--windowed]
+import sys
+import time
+import socket
+import struct
+import argparse
+from collections import deque
+from pong_core import *
+
+SPECTATOR_PORT = 5558  # 5555-5557 are taken by the event, feedback and network play ports
+SPECTATOR_MAGIC = b'PGSS'
+HELLO, SNAPSHOT, ACK, BYE = range(4)  # Packet kinds
+SNAPSHOT_HISTORY = 64  # Ticks of snapshots kept to encode and decode deltas against
+SPECTATOR_TIMEOUT = 5.0  # Seconds without an ack before a spectator is dropped
+HELLO_INTERVAL = 1.0  # Seconds between a waiting spectator's hellos
+INTERPOLATION_DELAY = 0.05  # How far behind the game spectators draw, in seconds
+POSITION_SCALE = 8  # Positions are sent in 1/8 pixels
+
+PACKET = struct.Struct('<4sB')  # magic, kind
+SNAPSHOT_HEADER = struct.Struct('<IHI')  # tick, ticks since the base (0 = full snapshot), changed fields
+INFO = struct.Struct('<HHHB')  # width, height, simulation rate, players - full snapshots only
+ACK_BODY = struct.Struct('<I')  # tick
+
+# One integer each, in this order
+FIELDS = ('ball_x', 'ball_y', 'ball_state',
+          'paddle0_x', 'paddle0_y', 'paddle0_hit', 'paddle1_x', 'paddle1_y', 'paddle1_hit',
+          'paddle2_x', 'paddle2_y', 'paddle2_hit', 'paddle3_x', 'paddle3_y', 'paddle3_hit',
+          'lives0', 'lives1', 'lives2', 'lives3',
+          'fever_timer', 'fever_hue', 'orb_x', 'orb_y', 'orb_hue', 'status')
+POSITIONS = [FIELDS.index(name) for name in FIELDS if name.endswith('_x') or name.endswith('_y')]
+BALL_BOOSTED, BALL_WAITING = 1, 2  # ball_state bits; the effect timer is in the bits above them
+GAME_STARTED, GAME_OVER = 1, 2  # status bits; the winner + 1 is in the bits above them
+
+
+def capture(sim):
+    """The spectator snapshot of a simulation, as a tuple of ints in FIELDS order"""
+    ball = sim.ball
+    ball_state = ((BALL_BOOSTED if ball.is_boosted else 0) | (BALL_WAITING if ball.reset_timer > 0 else 0) |
+                  ball.effect_timer << 2)
+    state = [round(ball.x * POSITION_SCALE), round(ball.y * POSITION_SCALE), ball_state]
+    for paddle in sim.paddles:
+        state += [round(paddle.x * POSITION_SCALE), round(paddle.y * POSITION_SCALE), paddle.hit_timer]
+    state += sim.player_lives
+    fever = sim.fever_effect
+    state += [fever.timer if fever.active else 0, int(fever.hue)]
+    orb = sim.fever_orb
+    if orb:
+        state += [round(orb.x * POSITION_SCALE), round(orb.y * POSITION_SCALE), int(orb.hue)]
+    else:
+        state += [-1, -1, 0]
+    winner = sim.winner + 1 if sim.winner is not None else 0
+    state.append((GAME_STARTED if sim.game_started else 0) | (GAME_OVER if sim.game_over else 0) | winner << 2)
+    return tuple(state)
+
+
+def write_varint(out, value):
+    """Append a signed int to out as a zigzag varint (small values of either sign take one byte)"""
+    value = value << 1 if value >= 0 else (-value << 1) - 1
+    while value >= 0x80:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, offset):
+    """Read a zigzag varint; returns (value, offset after it)"""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        if byte < 0x80:
+            break
+    return (value >> 1 if not value & 1 else -((value + 1) >> 1)), offset
+
+
+def encode_snapshot(tick, state, base_tick=None, base=None, info=None):
+    """
+    A snapshot packet: state as changes from base (the snapshot at base_tick), or in full
+
+    Full snapshots (no base) also carry info: (width, height, rate, player_count).
+    """
+    if base is None:
+        base = (0,) * len(FIELDS)
+        age = 0
+    else:
+        age = tick - base_tick
+    mask = 0
+    body = bytearray()
+    for i, (value, old) in enumerate(zip(state, base)):
+        if value != old:
+            mask |= 1 << i
+            write_varint(body, value - old)
+    packet = PACKET.pack(SPECTATOR_MAGIC, SNAPSHOT) + SNAPSHOT_HEADER.pack(tick, age, mask)
+    if age == 0:
+        packet += INFO.pack(*info)
+    return packet + bytes(body)
+
+
+def decode_snapshot(packet, bases):
+    """
+    Read a snapshot packet, looking its base up in {tick: state}
+
+    Returns:
+        (tick, state, info): info is None for deltas; state is None if the base is unknown
+    """
+    tick, age, mask = SNAPSHOT_HEADER.unpack_from(packet, PACKET.size)
+    offset = PACKET.size + SNAPSHOT_HEADER.size
+    info = None
+    if age == 0:
+        info = INFO.unpack_from(packet, offset)
+        offset += INFO.size
+        base = (0,) * len(FIELDS)
+    else:
+        base = bases.get(tick - age)
+        if base is None:
+            return tick, None, None
+    state = list(base)
+    for i in range(len(FIELDS)):
+        if mask >> i & 1:
+            change, offset = read_varint(packet, offset)
+            state[i] += change
+    return tick, tuple(state), info
+
+
+class SpectatorServer:
+    """Sends every tick's snapshot to the spectators that said hello"""
+    def __init__(self, host='localhost', port=SPECTATOR_PORT):
+        self.host = host  # '' or '0.0.0.0' lets spectators on other machines watch
+        self.port = port
+        self.socket = None
+        self.clients = {}  # address -> [last acked tick or None, time last heard from]
+        self.history = {}  # tick -> state, for the last SNAPSHOT_HISTORY ticks
+        self.packets_sent = self.full_sent = self.bytes_sent = 0
+
+    def start(self):
+        """Open the socket; returns False (and streams nothing) if the port is taken"""
+        try:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.bind((self.host, self.port))
+            self.socket.setblocking(False)
+            self.port = self.socket.getsockname()[1]
+            print(f"Spectator server on port {self.port}")
+            return True
+        except OSError as e:
+            print(f"Failed to start spectator server: {e}")
+            self.close()
+            return False
+
+    def poll(self):
+        """Handle every hello, ack and goodbye waiting on the socket"""
+        now = time.perf_counter()
+        while True:
+            try:
+                packet, address = self.socket.recvfrom(64)
+            except (BlockingIOError, ConnectionResetError):
+                break
+            if len(packet) < PACKET.size or packet[:4] != SPECTATOR_MAGIC:
+                continue
+            kind = packet[4]
+            if kind == BYE:
+                self.clients.pop(address, None)
+                continue
+            if address not in self.clients:
+                print(f"Spectator joined from {address[0]}:{address[1]}")
+                self.clients[address] = [None, now]
+            client = self.clients[address]
+            client[1] = now
+            if kind == ACK and len(packet) >= PACKET.size + ACK_BODY.size:
+                tick, = ACK_BODY.unpack_from(packet, PACKET.size)
+                if client[0] is None or tick > client[0]:
+                    client[0] = tick
+
+    def broadcast(self, sim):
+        """Send the simulation's current tick to every spectator"""
+        if self.socket is None:
+            return
+        self.poll()
+        if not self.clients:
+            return  # Nothing to do until someone is watching
+
+        tick = sim.tick
+        state = capture(sim)
+        self.history[tick] = state
+        self.history.pop(tick - SNAPSHOT_HISTORY, None)
+        info = (sim.width, sim.height, sim.rate, sim.player_count)
+
+        now = time.perf_counter()
+        for address, (acked, heard) in list(self.clients.items()):
+            if now - heard > SPECTATOR_TIMEOUT:
+                print(f"Spectator {address[0]}:{address[1]} timed out")
+                del self.clients[address]
+                continue
+            base = self.history.get(acked) if acked is not None and tick - acked < SNAPSHOT_HISTORY else None
+            packet = encode_snapshot(tick, state, acked, base, info)
+            try:
+                self.socket.sendto(packet, address)
+            except OSError as e:
+                print(f"Error sending to spectator {address[0]}:{address[1]}: {e}")
+                continue
+            self.packets_sent += 1
+            self.full_sent += base is None
+            self.bytes_sent += len(packet)
+
+    def close(self):
+        if self.socket:
+            self.socket.close()
+            self.socket = None
+
+
+class SpectatorClient:
+    """Receives snapshots from a SpectatorServer and works out what to draw when"""
+    def __init__(self, host='localhost', port=SPECTATOR_PORT):
+        self.address = (host, port)
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+        self.info = None  # (width, height, rate, player_count) once a full snapshot arrived
+        self.states = {}  # tick -> state, to decode deltas against
+        self.timeline = deque(maxlen=SNAPSHOT_HISTORY)  # (tick, state), oldest first
+        self.latest = None  # Newest tick received
+        self.latest_time = 0.0
+        self.last_hello = None
+        self.packets_received = self.bytes_received = 0
+
+    def send(self, kind, body=b''):
+        try:
+            self.socket.sendto(PACKET.pack(SPECTATOR_MAGIC, kind) + body, self.address)
+        except OSError as e:
+            print(f"Error sending to spectator server: {e}")
+
+    def poll(self):
+        """Say hello until snapshots arrive, then read and acknowledge them; returns how many were new"""
+        now = time.perf_counter()
+        if self.latest is None and (self.last_hello is None or now - self.last_hello >= HELLO_INTERVAL):
+            self.send(HELLO)
+            self.last_hello = now
+
+        new = 0
+        while True:
+            try:
+                packet, _ = self.socket.recvfrom(2048)
+            except (BlockingIOError, ConnectionResetError):
+                break
+            if len(packet) < PACKET.size or packet[:4] != SPECTATOR_MAGIC or packet[4] != SNAPSHOT:
+                continue
+            self.packets_received += 1
+            self.bytes_received += len(packet)
+            new += self.receive(packet, now)
+        return new
+
+    def receive(self, packet, now):
+        """Store one snapshot packet and acknowledge it; returns 1 if it was new"""
+        tick, state, info = decode_snapshot(packet, self.states)
+        if state is None:
+            return 0  # Its base is gone - the server sends a full snapshot once it notices
+        if self.latest is not None and tick <= self.latest:
+            if info is None:
+                return 0  # Late or duplicate
+            # A full snapshot from the past: the game restarted, forget the old one
+            self.states.clear()
+            self.timeline.clear()
+            self.latest = None
+        if info is not None:
+            self.info = info
+        self.states[tick] = state
+        self.states.pop(tick - SNAPSHOT_HISTORY, None)
+        self.timeline.append((tick, state))
+        self.latest = tick
+        self.latest_time = now
+        self.send(ACK, ACK_BODY.pack(tick))
+        return 1
+
+    def server_tick(self, now=None):
+        """The tick the game has probably reached by now"""
+        now = time.perf_counter() if now is None else now
+        return self.latest + (now - self.latest_time) * self.info[2]
+
+    def state_at(self, tick):
+        """
+        The state at a (fractional) tick, interpolated between the snapshots on either side
+
+        Positions are blended unless something jumped (a serve or a reset);
+        everything else comes from the earlier snapshot.
+        """
+        if not self.timeline:
+            return None
+        earlier = later = None
+        for snapshot in self.timeline:
+            if snapshot[0] <= tick:
+                earlier = snapshot
+            else:
+                later = snapshot
+                break
+        if earlier is None:
+            return self.timeline[0][1]
+        if later is None:
+            return earlier[1]
+
+        (tick_a, a), (tick_b, b) = earlier, later
+        alpha = (tick - tick_a) / (tick_b - tick_a)
+        max_step = square_game_rect(*self.info[:2]).width * 0.25 * POSITION_SCALE
+        state = list(a)
+        for i in POSITIONS:
+            if i < 2 and (a[2] | b[2]) & BALL_WAITING:
+                state[i] = b[i]  # The ball is being served from the center
+            elif abs(b[i] - a[i]) > max_step or (a[i] < 0) != (b[i] < 0):
+                state[i] = b[i]  # A reset, or the orb appearing
+            else:
+                state[i] = a[i] + (b[i] - a[i]) * alpha
+        return state
+
+    def close(self):
+        self.send(BYE)
+        self.socket.close()
+
+
+def apply_state(sim, state):
+    """Write a spectator snapshot into a PongSimulation used only for drawing"""
+    from pong_fever import FeverOrb
+
+    ball = sim.ball
+    ball.x, ball.y = state[0] / POSITION_SCALE, state[1] / POSITION_SCALE
+    ball.is_boosted = bool(state[2] & BALL_BOOSTED)
+    ball.boost_color = BALL_BOOST_COLOR if ball.is_boosted else (255, 255, 100)
+    ball.reset_timer = 1 if state[2] & BALL_WAITING else 0
+    ball.effect_timer = int(state[2]) >> 2
+    for i, paddle in enumerate(sim.paddles):
+        paddle.x = state[3 + i * 3] / POSITION_SCALE
+        paddle.y = state[4 + i * 3] / POSITION_SCALE
+        paddle.hit_timer = state[5 + i * 3]
+    sim.player_lives = list(state[15:19])
+    sim.players_alive = [lives > 0 for lives in sim.player_lives]
+
+    fever = sim.fever_effect
+    fever.timer, fever.hue = state[19], state[20]
+    fever.active = fever.timer > 0
+    if state[21] < 0:
+        sim.fever_orb = None
+    else:
+        if sim.fever_orb is None:
+            sim.fever_orb = FeverOrb(sim.game_rect, sim.fever_orb_radius)
+        sim.fever_orb.x, sim.fever_orb.y = state[21] / POSITION_SCALE, state[22] / POSITION_SCALE
+        sim.fever_orb.hue = state[23]
+
+    status = int(state[24])
+    sim.game_started = bool(status & GAME_STARTED)
+    sim.game_over = bool(status & GAME_OVER)
+    sim.winner = (status >> 2) - 1 if status >> 2 else None
+
+
+def draw_match(screen, sim, font):
+    """Draw a spectated match: the field, walls, orb, ball, paddles, fever and lives"""
+    import pygame
+    from pong_utils import (draw_walls, draw_fever_orb, draw_ball, draw_paddle, draw_fever_overlay,
+                            draw_player_status_with_lives)
+
+    screen.fill(BLACK)
+    pygame.draw.rect(screen, WALL_COLOR, tuple(sim.game_rect), 2)
+    draw_walls(screen, sim.players_alive, sim.game_rect)
+    if sim.fever_orb:
+        draw_fever_orb(screen, sim.fever_orb)
+    draw_ball(screen, sim.ball, WHITE)
+    for i, paddle in enumerate(sim.paddles):
+        if sim.players_alive[i]:
+            draw_paddle(screen, paddle, PLAYER_COLORS[i])
+    draw_fever_overlay(screen, sim.fever_effect)
+    draw_player_status_with_lives(screen, sim.players_alive, sim.player_lives, font, sim.width, sim.height)
+
+
+def run_spectator(host='localhost', port=SPECTATOR_PORT, fullscreen=True):
+    """Watch a match until the window is closed or Escape is pressed"""
+    import pygame
+    from assets import fonts
+    from gameclock import clock
+    from displaymode import open_display
+    from pong_sim import PongSimulation
+
+    pygame.init()
+    screen = open_display(fullscreen=fullscreen)  # Reopened below only if the game draws at another size
+    pygame.display.set_caption("Pong - Spectator")
+    font = fonts.font(28)
+    client = SpectatorClient(host, port)
+    sim = None
+    clock.restart()
+    try:
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    return
+
+            client.poll()
+            if client.info is not None and (sim is None or (sim.width, sim.height) != client.info[:2]):
+                # Draw at the game's own resolution, scaled to this screen
+                width, height, rate, player_count = client.info
+                if screen.get_size() != (width, height):
+                    screen = open_display((width, height), fullscreen)
+                    pygame.display.set_caption("Pong - Spectator")
+                sim = PongSimulation(width, height, player_count, rate=rate)
+
+            if sim is None:
+                screen.fill(BLACK)
+                text = fonts.render(font, f"Waiting for the game at {host}:{port}", True, WHITE)
+                screen.blit(text, (screen.get_width() // 2 - text.get_width() // 2, screen.get_height() // 2))
+            else:
+                render_tick = client.server_tick() - INTERPOLATION_DELAY * client.info[2]
+                apply_state(sim, client.state_at(render_tick))
+                draw_match(screen, sim, font)
+            pygame.display.flip()
+            clock.tick()
+    finally:
+        client.close()
+        pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a Pong match streamed by the game")
+    parser.add_argument('host', nargs='?', default='localhost')
+    parser.add_argument('port', nargs='?', type=int, default=SPECTATOR_PORT)
+    parser.add_argument('--windowed', action='store_true', help="Don't go fullscreen")
+    args = parser.parse_args(argv)
+    run_spectator(args.host, args.port, not args.windowed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
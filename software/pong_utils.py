@@ -1,89 +1,16 @@
 # pong_utils.py - Utility functions and constants for Pong game
 import pygame
+from assets import fonts, overlays
 import math
 
-# Colors
-BLACK = (0, 0, 0)
-WHITE = (255, 255, 255)
-PLAYER_COLORS = [
-    (255, 50, 50),   # Red - Player 1 (Top)
-    (50, 255, 50),   # Green - Player 2 (Right)
-    (50, 50, 255),   # Blue - Player 3 (Bottom)
-    (255, 255, 50),  # Yellow - Player 4 (Left)
-]
-WALL_COLOR = (100, 100, 100)
-
-# Game settings - will be calculated based on screen size
-GAME_MARGIN_PERCENT = 0.06  # 6% of screen size
-PADDLE_WIDTH_PERCENT = 0.12  # 12% of game area width
-PADDLE_HEIGHT_PERCENT = 0.02  # 2% of game area height
-BALL_RADIUS_PERCENT = 0.015  # 1.5% of game area width
-PADDLE_SPEED_PERCENT = 0.01  # 1% of game area width
-PADDLE_HIT_DISTANCE_PERCENT = 0.03  # 3% of game area width
-
-# Fixed settings
-PLAYER_STARTING_LIVES = 3
-BALL_RESET_DURATION = 60
-BALL_SPEED_INCREMENT = 0.3
-BALL_MAX_SPEED = 100
-COUNTDOWN_DURATION = 5
-FEVER_DURATION = 10
-FEVER_ORB_MIN_SPAWN_TIME = 10
-FEVER_ORB_MAX_SPAWN_TIME = 30
-PADDLE_HIT_DURATION = 10  # Duration of paddle hit animation in frames
-
-def calculate_game_dimensions(screen_width, screen_height):
-    """Calculate game dimensions based on screen size"""
-    # Calculate margin size
-    margin = int(min(screen_width, screen_height) * GAME_MARGIN_PERCENT)
-    
-    # Calculate game area size
-    game_size = min(screen_width, screen_height) - (2 * margin)
-    
-    # Calculate paddle dimensions
-    paddle_width = int(game_size * PADDLE_WIDTH_PERCENT)
-    paddle_height = int(game_size * PADDLE_HEIGHT_PERCENT)
-    
-    # Calculate ball radius
-    ball_radius = int(game_size * BALL_RADIUS_PERCENT)
-    
-    # Calculate speeds
-    paddle_speed = int(game_size * PADDLE_SPEED_PERCENT)
-    ball_speed = paddle_speed * 1.05  # Ball 1.5 times faster than original (was 0.7)
-    
-    # Calculate hit distance
-    paddle_hit_distance = int(game_size * PADDLE_HIT_DISTANCE_PERCENT)
-    
-    # Calculate fever orb size
-    fever_orb_radius = ball_radius * 2
-    
-    return {
-        'margin': margin,
-        'game_size': game_size,
-        'paddle_width': paddle_width,
-        'paddle_height': paddle_height,
-        'ball_radius': ball_radius,
-        'paddle_speed': paddle_speed,
-        'ball_speed': ball_speed,
-        'paddle_hit_distance': paddle_hit_distance,
-        'fever_orb_radius': fever_orb_radius
-    }
+from pong_core import *
 
 def get_square_game_rect(screen_width, screen_height):
     """
     Calculate a square game area centered on the screen.
     This ensures the game is fair with equal distances on all sides.
     """
-    # Get dimensions based on screen size
-    dims = calculate_game_dimensions(screen_width, screen_height)
-    margin = dims['margin']
-    game_size = dims['game_size']
-    
-    # Calculate centered position
-    left = (screen_width - game_size) // 2
-    top = (screen_height - game_size) // 2
-    
-    return pygame.Rect(left, top, game_size, game_size)
+    return pygame.Rect(*square_game_rect(screen_width, screen_height))
 
 def create_paddles(screen_width, screen_height):
     """Create all four paddles for the game in a square layout"""
@@ -121,16 +48,17 @@ def create_paddles(screen_width, screen_height):
     
     return paddles
 
-def handle_player_input(paddles, players_alive, keys, game_started, paddle_speed=None):
-    """Handle keyboard input for player movement"""
+def handle_player_input(paddles, players_alive, keys, game_started, paddle_speed=None, dt=1 / SIMULATION_RATE):
+    """Handle keyboard input for player movement over dt seconds"""
     # Define the game rectangle for boundary checking
     screen_width, screen_height = pygame.display.get_surface().get_size()
     game_rect = get_square_game_rect(screen_width, screen_height)
     
-    # Use calculated paddle speed if not provided
+    # Use calculated paddle speed (per second) if not provided
     if paddle_speed is None:
         dims = calculate_game_dimensions(screen_width, screen_height)
         paddle_speed = dims['paddle_speed']
+    paddle_speed *= dt
     
     # Player 1 (Top) controls - W/A/S/D
     if players_alive[0]:
@@ -168,16 +96,17 @@ def handle_player_input(paddles, players_alive, keys, game_started, paddle_speed
         if keys[pygame.K_KP6] and game_started and paddles[3].hit_timer == 0:
             paddles[3].hit()
 
-def handle_external_events(paddles, players_alive, external_events, game_started, paddle_speed=None):
-    """Handle external events for player movement"""
+def handle_external_events(paddles, players_alive, external_events, game_started, paddle_speed=None, dt=1 / SIMULATION_RATE):
+    """Handle external events for player movement over dt seconds"""
     # Define the game rectangle for boundary checking
     screen_width, screen_height = pygame.display.get_surface().get_size()
     game_rect = get_square_game_rect(screen_width, screen_height)
     
-    # Use calculated paddle speed if not provided
+    # Use calculated paddle speed (per second) if not provided
     if paddle_speed is None:
         dims = calculate_game_dimensions(screen_width, screen_height)
         paddle_speed = dims['paddle_speed']
+    paddle_speed *= dt
     
     for event in external_events:
         action = event.get('action')
@@ -217,7 +146,7 @@ def draw_player_status(screen, players_alive, font, screen_width, screen_height)
     for i, alive in enumerate(players_alive):
         status = "Alive" if alive else "Dead"
         color = PLAYER_COLORS[i] if alive else WALL_COLOR
-        text = font.render(f"Player {i+1}: {status}", True, color)
+        text = fonts.render(font, f"Player {i+1}: {status}", True, color)
         
         if i == 0:  # Top
             screen.blit(text, (10, 10))
@@ -234,9 +163,7 @@ def draw_countdown(screen, current_time, countdown_start, font, large_font, scre
     center_x, center_y = screen_width // 2, screen_height // 2
     
     # Semi-transparent overlay
-    overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 128))  # Black with 50% transparency
-    screen.blit(overlay, (0, 0))
+    overlays.draw(screen, (0, 0, 0, 128))  # Black with 50% transparency
     
     # Calculate remaining time
     remaining = COUNTDOWN_DURATION - (current_time - countdown_start)
@@ -246,12 +173,12 @@ def draw_countdown(screen, current_time, countdown_start, font, large_font, scre
         countdown_text = str(int(remaining) + 1)
     
     # Draw countdown text
-    text_surface = large_font.render(countdown_text, True, WHITE)
+    text_surface = fonts.render(large_font, countdown_text, True, WHITE)
     text_rect = text_surface.get_rect(center=(center_x, center_y))
     screen.blit(text_surface, text_rect)
     
     # Draw "Get Ready" text
-    ready_text = font.render("Get Ready!", True, WHITE)
+    ready_text = fonts.render(font, "Get Ready!", True, WHITE)
     ready_rect = ready_text.get_rect(center=(center_x, center_y - 80))
     screen.blit(ready_text, ready_rect)
     
@@ -266,7 +193,7 @@ def draw_countdown(screen, current_time, countdown_start, font, large_font, scre
     for i, control in enumerate(controls):
         if i < len(PLAYER_COLORS) and i < 4:
             # Only show controls for active players
-            control_text = font.render(control, True, PLAYER_COLORS[i])
+            control_text = fonts.render(font, control, True, PLAYER_COLORS[i])
             control_rect = control_text.get_rect(center=(center_x, center_y + 80 + i * 30))
             screen.blit(control_text, control_rect)
 
@@ -286,7 +213,7 @@ def draw_player_status_with_lives(screen, players_alive, player_lives, font, scr
             status = "ELIMINATED"
             color = WALL_COLOR
         
-        text = font.render(f"Player {i+1}: {status}", True, color)
+        text = fonts.render(font, f"Player {i+1}: {status}", True, color)
         
         if i == 0:  # Top
             screen.blit(text, (10, 10))
@@ -298,27 +225,125 @@ def draw_player_status_with_lives(screen, players_alive, player_lives, font, scr
             screen.blit(text, (screen_width - text.get_width() - 10, 
                              screen_height - text.get_height() - 10))
 
-def hsv_to_rgb(h, s, v):
-    """Convert HSV color to RGB"""
-    if s == 0.0:
-        return (v, v, v)
+# Pre-rendered speed-effect frames: (radius, color) -> {step: (surface, effect_radius)}
+_ball_effect_frames = {}
+
+def ball_effect_frames(radius, color):
+    """The speed-effect flash for a ball of radius in color, in BALL_EFFECT_FRAMES steps"""
+    key = (radius, tuple(color[:3]))
+    frames = _ball_effect_frames.get(key)
+    if frames is None:
+        frames = {}
+        for step in range(1, BALL_EFFECT_FRAMES + 1):
+            effect_progress = step / BALL_EFFECT_FRAMES
+            
+            # Calculate effect size
+            effect_radius = radius * (1 + effect_progress * 2)  # Larger effect for boost
+            effect_color = (*key[1], int(200 * effect_progress))  # Add alpha
+            
+            effect_surface = pygame.Surface((effect_radius*2, effect_radius*2), pygame.SRCALPHA)
+            pygame.draw.circle(effect_surface, effect_color,
+                               (int(effect_radius), int(effect_radius)), int(effect_radius))
+            frames[step] = (effect_surface, effect_radius)
+        _ball_effect_frames[key] = frames
+    return frames
+
+def prepare_ball_effects(radius, colors):
+    """Render the speed-effect frames for every color the ball can flash, ahead of the game"""
+    for color in colors:
+        ball_effect_frames(radius, color)
+
+def draw_ball(screen, ball, color, position=None):
+    """Draw the ball with its speed effect (at position if given, e.g. interpolated); returns the area drawn"""
+    x, y = position if position is not None else (ball.x, ball.y)
+    
+    # Use boosted color if ball is boosted
+    ball_color = ball.boost_color if ball.is_boosted else color
+    
+    # Normal ball
+    drawn = pygame.draw.circle(screen, ball_color, (int(x), int(y)), ball.radius)
+    
+    # Draw speed effect if active, picking the frame from how much of it is left
+    if ball.effect_timer > 0:
+        # Effect color depends on whether it's a boost or regular speed increase
+        effect_color = ball.boost_color if ball.is_boosted else (255, 255, 255)
+        frames = ball_effect_frames(ball.radius, effect_color)
+        step = math.ceil(BALL_EFFECT_FRAMES * min(ball.effect_timer / ball.effect_ticks, 1.0))
+        effect_surface, effect_radius = frames[step]
+        
+        drawn = drawn.union(screen.blit(effect_surface,
+                                        (int(x - effect_radius), int(y - effect_radius))))
+    
+    return drawn
+
+def draw_extra_balls(screen, balls, previous=None, alpha=1.0):
+    """
+    Draw multi-ball's extra balls; returns the areas drawn
     
-    i = int(h * 6)
-    f = (h * 6) - i
-    p = v * (1 - s)
-    q = v * (1 - s * f)
-    t = v * (1 - s * (1 - f))
+    Args:
+        balls: (x, y, radius, boosted, waiting) per ball, from BallStore.drawables()
+        previous: (xs, ys) lists from before the last simulation step, to interpolate from
+        alpha: How far to blend from previous to the current positions
+    """
+    drawn = []
+    for i, (x, y, radius, boosted, waiting) in enumerate(balls):
+        if previous is not None and not waiting:
+            prev_x, prev_y = previous[0][i], previous[1][i]
+            x = prev_x + (x - prev_x) * alpha
+            y = prev_y + (y - prev_y) * alpha
+        color = BALL_BOOST_COLOR if boosted else (255, 255, 255)
+        drawn.append(pygame.draw.circle(screen, color, (int(x), int(y)), int(radius)))
+    return drawn
+
+def draw_paddle(screen, paddle, color, position=None):
+    """Draw a paddle, including its hit extension (at position if given); returns the area drawn"""
+    return pygame.draw.rect(screen, color, tuple(paddle.get_rect(position)))
+
+def draw_fever_orb(screen, orb):
+    """Draw the fever orb; returns the area drawn"""
+    try:
+        r, g, b = hsv_to_rgb(orb.hue/360, 1, 1)
+        drawn = pygame.draw.circle(screen, (r, g, b), (int(orb.x), int(orb.y)), int(orb.radius))
+        
+        # Draw inner highlight
+        highlight_radius = orb.radius * 0.7
+        r, g, b = hsv_to_rgb((orb.hue + 30)/360, 0.5, 1)
+        pygame.draw.circle(screen, (r, g, b), (int(orb.x), int(orb.y)), int(highlight_radius))
+        return drawn
+    except Exception as e:
+        print(f"Error drawing FeverOrb: {e}")
+        # Fallback drawing
+        try:
+            return pygame.draw.circle(screen, (255, 0, 255), (int(orb.x), int(orb.y)), int(orb.radius))
+        except:
+            return None
+
+def draw_multi_ball_orb(screen, orb):
+    """Draw the multi-ball power-up orb; returns the area drawn"""
+    x, y, radius = int(orb.x), int(orb.y), int(orb.radius)
+    drawn = pygame.draw.circle(screen, MULTI_BALL_COLOR, (x, y), radius)
+    
+    # Three little balls circling inside
+    for k in range(3):
+        angle = math.radians(orb.hue * 2 + k * 120)
+        pygame.draw.circle(screen, (255, 255, 255),
+                           (int(x + math.cos(angle) * radius * 0.5), int(y + math.sin(angle) * radius * 0.5)),
+                           max(2, radius // 5))
+    return drawn
+
+def draw_fever_overlay(screen, fever_effect):
+    """Draw the fever effect overlay"""
+    if not fever_effect.active:
+        return
     
-    i %= 6
-    if i == 0:
-        return (int(v * 255), int(t * 255), int(p * 255))
-    elif i == 1:
-        return (int(q * 255), int(v * 255), int(p * 255))
-    elif i == 2:
-        return (int(p * 255), int(v * 255), int(t * 255))
-    elif i == 3:
-        return (int(p * 255), int(q * 255), int(v * 255))
-    elif i == 4:
-        return (int(t * 255), int(p * 255), int(v * 255))
-    elif i == 5:
-        return (int(v * 255), int(p * 255), int(q * 255))
\ No newline at end of file
+    try:
+        try:
+            r, g, b = hsv_to_rgb(fever_effect.hue/360, 0.7, 1)
+            color = (r, g, b, 30)  # Translucent color overlay
+        except:
+            # Fallback color
+            color = (255, 0, 255, 30)
+        
+        overlays.draw(screen, color)
+    except Exception as e:
+        print(f"Error drawing FeverEffect: {e}")
@@ -0,0 +1,161 @@
+# profiler.py - Per-frame phase timings for the game loop
+#
+# The loop marks each phase of a frame (event pump, controller drain,
+# input, simulation update, draw, flip/vsync wait); the profiler keeps
+# the last few seconds of frames for rolling percentiles, can draw them
+# as a graph on top of the game, and writes a JSON summary.
+import os
+import json
+import math
+import time
+from collections import deque
+import pygame
+
+PHASES = ('events', 'controllers', 'input', 'update', 'draw', 'flip')
+PHASE_COLORS = {
+    'events': (80, 160, 255),
+    'controllers': (80, 220, 220),
+    'input': (160, 255, 120),
+    'update': (255, 220, 80),
+    'draw': (255, 140, 60),
+    'flip': (200, 100, 255),
+}
+PROFILE_WINDOW = 600  # Frames kept for the rolling percentiles (10 seconds at 60 FPS)
+FRAME_BUDGET_MS = 1000.0 / 60  # One frame at 60 FPS
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+
+GRAPH_FRAMES = 240  # Frames shown in the on-screen graph
+GRAPH_HEIGHT = 120  # Pixels for two frame budgets
+
+
+def percentile(values, pct):
+    """The pct-th percentile of values (nearest rank), or 0 if there are none"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class FrameProfiler:
+    def __init__(self, window=PROFILE_WINDOW, budget_ms=FRAME_BUDGET_MS):
+        self.window = window
+        self.budget_ms = budget_ms
+        self.samples = {phase: deque(maxlen=window) for phase in PHASES + ('total',)}
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = None
+        self.phase_name = None
+        self.phase_start = 0.0
+        self.frames = 0
+        self.over_budget = 0
+        self.visible = False
+
+    def begin_frame(self):
+        """Start timing a new frame"""
+        for phase in PHASES:
+            self.current[phase] = 0.0
+        self.phase_name = None
+        self.frame_start = time.perf_counter()
+
+    def start(self, phase):
+        """Start timing phase (ending the phase before it, if any)"""
+        now = time.perf_counter()
+        if self.phase_name is not None:
+            self.current[self.phase_name] += now - self.phase_start
+        self.phase_name = phase
+        self.phase_start = now
+
+    def stop(self):
+        """Stop timing the current phase"""
+        if self.phase_name is not None:
+            self.current[self.phase_name] += time.perf_counter() - self.phase_start
+            self.phase_name = None
+
+    def end_frame(self):
+        """Record the frame's phase times, in milliseconds"""
+        if self.frame_start is None:
+            return
+        self.stop()
+        total = (time.perf_counter() - self.frame_start) * 1000.0
+        for phase in PHASES:
+            self.samples[phase].append(self.current[phase] * 1000.0)
+        self.samples['total'].append(total)
+        self.frames += 1
+        if total > self.budget_ms:
+            self.over_budget += 1
+        self.frame_start = None
+
+    def toggle(self):
+        """Show or hide the on-screen graph"""
+        self.visible = not self.visible
+
+    def summary(self):
+        """Rolling percentiles per phase (milliseconds) over the last window of frames"""
+        phases = {}
+        for phase, values in self.samples.items():
+            values = list(values)
+            phases[phase] = {
+                'mean': sum(values) / len(values) if values else 0.0,
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                'p99': percentile(values, 99),
+                'max': max(values) if values else 0.0,
+            }
+        return {
+            'frames': self.frames,
+            'window': len(self.samples['total']),
+            'budget_ms': self.budget_ms,
+            'over_budget': self.over_budget,
+            'phases': phases,
+        }
+
+    def write_summary(self, name, extra=None, directory=PROFILE_DIR):
+        """Write summary() (plus any extra fields) to directory/name-<time>.json; returns the path"""
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+            report = self.summary()
+            if extra:
+                report.update(extra)
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"Frame profile written to {path}")
+            return path
+        except Exception as e:
+            print(f"Error writing frame profile: {e}")
+            return None
+
+    def draw(self, screen, font):
+        """Draw the recent frames as stacked phase bars, with the frame budget marked"""
+        width = GRAPH_FRAMES + 10
+        height = GRAPH_HEIGHT + 30 + 18 * (len(PHASES) + 1)
+        left = screen.get_width() - width - 10
+        top = 10
+        pygame.draw.rect(screen, (0, 0, 0), (left, top, width, height))
+        scale = GRAPH_HEIGHT / (2 * self.budget_ms)
+        base = top + 5 + GRAPH_HEIGHT
+
+        # One column per frame, phases stacked bottom to top
+        count = min(GRAPH_FRAMES, len(self.samples['total']))
+        start = len(self.samples['total']) - count
+        for column in range(count):
+            y = base
+            for phase in PHASES:
+                h = self.samples[phase][start + column] * scale
+                if h >= 1:
+                    top_y = max(top + 5, int(y - h))
+                    pygame.draw.line(screen, PHASE_COLORS[phase], (left + 5 + column, int(y)), (left + 5 + column, top_y))
+                    y -= h
+
+        # Frame budget line
+        budget_y = int(base - self.budget_ms * scale)
+        pygame.draw.line(screen, (255, 60, 60), (left + 5, budget_y), (left + 5 + GRAPH_FRAMES, budget_y))
+
+        # p95 per phase
+        y = base + 8
+        for phase in PHASES + ('total',):
+            values = list(self.samples[phase])
+            color = PHASE_COLORS.get(phase, (255, 255, 255))
+            text = font.render(f"{phase}: p95 {percentile(values, 95):.1f} ms", True, color)
+            screen.blit(text, (left + 5, y))
+            y += 18
@@ -0,0 +1,95 @@
+# resources.py - Images and sounds shared by the menu and every game
+#
+# main.main() starts one ResourceStore and hands it to each game, so
+# going from the menu into a game doesn't wait on disk reads or MP3
+# decoding. Games run on their own fall back to the shared `store`,
+# which loads things the first time they're asked for.
+import os
+import threading
+import pygame
+from assets import assets, ASSET_DIR
+
+# Everything the menu and games use, read while the menu is showing
+PRELOAD_IMAGES = [
+    "pong-bg.jpg",
+    "nightsky.jpg",
+    "star.jpg",
+    "bulbasaur.png",
+    "charmander.png",
+    "squirtle.png",
+    "pikachu.png",
+]
+PRELOAD_SOUNDS = [
+    "win-sound.mp3",
+]
+
+
+class ResourceStore:
+    """Loads images and sounds once, optionally ahead of time on a background thread"""
+    def __init__(self, asset_manager=assets, base_dir=ASSET_DIR):
+        self.assets = asset_manager
+        self.base_dir = base_dir
+        self.sounds = {}  # path -> pygame.mixer.Sound, or None if it couldn't be loaded
+        self.lock = threading.Lock()
+        self.thread = None
+        self.ready = threading.Event()
+
+    def path(self, name):
+        """Full path of a resource, relative to the resource directory unless absolute"""
+        return name if os.path.isabs(name) else os.path.join(self.base_dir, name)
+
+    def start(self, images=PRELOAD_IMAGES, sounds=PRELOAD_SOUNDS):
+        """Start reading images and decoding sounds in the background"""
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self.preload, args=(images, sounds), daemon=True)
+        self.thread.start()
+
+    def preload(self, images=PRELOAD_IMAGES, sounds=PRELOAD_SOUNDS):
+        """Read every image and decode every sound (conversion for the display happens on first use)"""
+        for name in images:
+            try:
+                self.assets.load(self.assets.path(name))
+            except Exception as e:
+                print(f"Could not preload image {name}: {e}")
+        for name in sounds:
+            self.sound(name)
+        self.ready.set()
+
+    def wait(self, timeout=None):
+        """Block until preloading has finished (True) or timeout seconds have passed (False)"""
+        if self.thread is None:
+            return True
+        return self.ready.wait(timeout)
+
+    def image(self, name, size=None):
+        """An image converted for the display, scaled to size if given (see AssetManager.image)"""
+        return self.assets.image(name, size)
+
+    def sound(self, name, volume=None):
+        """
+        A decoded sound effect, loaded the first time it's asked for
+
+        Returns:
+            pygame.mixer.Sound, or None if the mixer isn't available or the file can't be loaded
+        """
+        path = self.path(name)
+        with self.lock:
+            if path in self.sounds:
+                sound = self.sounds[path]
+            else:
+                sound = None
+                try:
+                    if not pygame.mixer.get_init():
+                        pygame.mixer.init()
+                    sound = pygame.mixer.Sound(path)
+                except Exception as e:
+                    print(f"Could not load sound {name}: {e}")
+                self.sounds[path] = sound
+        if sound is not None and volume is not None:
+            sound.set_volume(volume)
+        return sound
+
+
+# Used by games that weren't handed a store (e.g. run on their own)
+store = ResourceStore()
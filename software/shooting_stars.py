@@ -4,13 +4,20 @@ import time
 import math
 import os
 import sys
+from assets import sprites, fonts, overlays
+from resources import store
+from audio import audio
+from gameclock import clock
 
 # Constants
 GAME_DURATION = 30  # game lasts 30 seconds
 STAR_SPAWN_RATE = 1.0  # stars spawn every second
-POKEMON_SPEED = 8  # speed of pokemon movement
-BULLET_SPEED = 15  # speed of bullets moving right
-STAR_SPEED = 4  # increased star speed (was 2)
+POKEMON_SPEED = 480  # speed of pokemon movement, pixels per second
+BULLET_SPEED = 900  # speed of bullets moving right, pixels per second
+STAR_SPEED = 240  # increased star speed (was 120), pixels per second
+STAR_WOBBLE_RATE = 0.6  # average direction changes per second for each star
+STAR_WOBBLE = 0.2 * STAR_SPEED / 4  # biggest nudge to each velocity component (0.2 when stars moved 4 per frame)
+NUDGE_TIME = 1 / 60  # a controller up/down event moves a Pokemon this many seconds' worth
 COUNTDOWN_DURATION = 5  # countdown before game starts
 
 # Sizes
@@ -35,6 +42,8 @@ POKEMON_NAMES = [
 ]
 
 class Star:
+    __slots__ = ('x', 'y', 'size', 'active', 'angle', 'speed', 'vx', 'vy')
+
     def __init__(self, x, y, size=STAR_SIZE):
         self.x = x
         self.y = y
@@ -47,10 +56,10 @@ class Star:
         self.vx = math.cos(self.angle) * self.speed
         self.vy = math.sin(self.angle) * self.speed
         
-    def update(self, width, height):
-        # Move the star using velocity components
-        self.x += self.vx
-        self.y += self.vy
+    def update(self, width, height, dt):
+        # Move the star using velocity components (pixels per second)
+        self.x += self.vx * dt
+        self.y += self.vy * dt
         
         # Bounce off walls
         radius = self.size // 2
@@ -71,10 +80,10 @@ class Star:
             self.vy = -abs(self.vy)  # Reverse y direction (make negative)
         
         # Occasionally change direction slightly
-        if random.random() < 0.01:  # 1% chance per frame
+        if random.random() < STAR_WOBBLE_RATE * dt:  # Same rate whatever the frame rate
             # Add small random changes to velocity
-            self.vx += random.uniform(-0.2, 0.2)
-            self.vy += random.uniform(-0.2, 0.2)
+            self.vx += random.uniform(-STAR_WOBBLE, STAR_WOBBLE)
+            self.vy += random.uniform(-STAR_WOBBLE, STAR_WOBBLE)
             
             # Normalize speed to maintain consistent velocity
             current_speed = math.sqrt(self.vx**2 + self.vy**2)
@@ -93,9 +102,9 @@ class Star:
             # pygame.draw.circle(screen, (255, 0, 0), (int(self.x), int(self.y)), self.size // 2, 1)
             
     def is_hit(self, bullet_x, bullet_y):
-        # Check if bullet hits star (simple circle collision)
-        distance = math.sqrt((bullet_x - self.x)**2 + (bullet_y - self.y)**2)
-        return distance < self.size // 2 and self.active
+        # Check if bullet hits star (simple circle collision, compared squared to skip the sqrt)
+        radius = self.size // 2
+        return (bullet_x - self.x) ** 2 + (bullet_y - self.y) ** 2 < radius * radius and self.active
         
     def is_out_of_bounds(self, width, height):
         # Check if star is out of screen bounds
@@ -104,6 +113,8 @@ class Star:
                 self.y < -self.size or self.y > height + self.size)
 
 class Bullet:
+    __slots__ = ('x', 'y', 'speed', 'active', 'player_id', 'size')
+
     def __init__(self, x, y, player_id):
         self.x = x
         self.y = y
@@ -112,9 +123,9 @@ class Bullet:
         self.player_id = player_id
         self.size = BULLET_SIZE  # Larger bullets using the constant
         
-    def update(self):
+    def update(self, dt):
         # Bullets now move rightward
-        self.x += self.speed
+        self.x += self.speed * dt
         
     def draw(self, screen):
         if self.active:
@@ -128,6 +139,8 @@ class Bullet:
         return self.x < 0 or self.x > width
 
 class Pokemon:
+    __slots__ = ('x', 'y', 'size', 'player_id', 'color', 'pokemon_name', 'score', 'image')
+
     def __init__(self, x, y, player_id, size=POKEMON_SIZE):
         self.x = x
         self.y = y
@@ -138,9 +151,9 @@ class Pokemon:
         self.score = 0
         self.image = None  # Will be loaded later
         
-    def move(self, direction, screen_height):
-        # Move up or down within screen bounds
-        new_y = self.y + direction * POKEMON_SPEED
+    def move(self, direction, screen_height, dt=NUDGE_TIME):
+        # Move up or down within screen bounds, for dt seconds
+        new_y = self.y + direction * POKEMON_SPEED * dt
         if 50 <= new_y <= screen_height - 50:
             self.y = new_y
             
@@ -158,17 +171,15 @@ class Pokemon:
             pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size // 2)
             
         # Draw a score indicator next to the Pokemon
-        font = pygame.font.Font(None, 30)  # Slightly bigger score text
+        font = fonts.font(30)  # Slightly bigger score text
         score_text = f"{self.score}"
-        score_render = font.render(score_text, True, self.color)
+        score_render = fonts.render(font, score_text, True, self.color)
         screen.blit(score_render, (self.x - 40, self.y - self.size // 2))
 
 def draw_win_screen(screen, winner, pokemon_shooters, pokemon_images, width, height, font, big_font):
     """Draw a dedicated win screen showing the winner's Pokémon"""
-    # Create semi-transparent overlay
-    overlay = pygame.Surface((width, height), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 200))  # Black with 200/255 alpha
-    screen.blit(overlay, (0, 0))
+    # Semi-transparent overlay (reused between frames)
+    overlays.draw(screen, (0, 0, 0, 200))  # Black with 200/255 alpha
     
     # Get center coordinates
     center_x = width // 2
@@ -176,9 +187,9 @@ def draw_win_screen(screen, winner, pokemon_shooters, pokemon_images, width, hei
     
     # Draw winner title
     if winner == -1:
-        title_text = big_font.render("It's a tie!", True, (255, 255, 255))
+        title_text = fonts.render(big_font, "It's a tie!", True, (255, 255, 255))
     else:
-        title_text = big_font.render(f"Player {winner + 1} Wins!", True, PLAYER_COLORS[winner])
+        title_text = fonts.render(big_font, f"Player {winner + 1} Wins!", True, PLAYER_COLORS[winner])
     
     screen.blit(title_text, (center_x - title_text.get_width() // 2, center_y - 200))
     
@@ -189,7 +200,7 @@ def draw_win_screen(screen, winner, pokemon_shooters, pokemon_images, width, hei
         if pokemon_sprite:
             # Create a large sprite for display
             display_size = int(min(width, height) * 0.3)  # 30% of screen size
-            scaled_sprite = pygame.transform.scale(pokemon_sprite, (display_size, display_size))
+            scaled_sprite = sprites.scale(pokemon_sprite, (display_size, display_size))
             
             # Draw centered sprite
             sprite_x = center_x - display_size // 2
@@ -199,20 +210,20 @@ def draw_win_screen(screen, winner, pokemon_shooters, pokemon_images, width, hei
     # Show final scores
     scores_y = center_y + (50 if winner == -1 else 150)  # Adjust position based on whether there's a winner
     scores_text = "Final Scores:"
-    scores_render = font.render(scores_text, True, (255, 255, 255))
+    scores_render = fonts.render(font, scores_text, True, (255, 255, 255))
     screen.blit(scores_render, (center_x - scores_render.get_width() // 2, scores_y))
     
     for i, pokemon in enumerate(pokemon_shooters):
         p_score_text = f"Player {i+1}: {pokemon.score}"
-        p_score_render = font.render(p_score_text, True, pokemon.color)
+        p_score_render = fonts.render(font, p_score_text, True, pokemon.color)
         screen.blit(p_score_render, (center_x - p_score_render.get_width() // 2, scores_y + 40 + (i * 30)))
     
     # Draw continue instructions
-    instructions_text = font.render("Press any key to continue", True, (255, 255, 255))
+    instructions_text = fonts.render(font, "Press any key to continue", True, (255, 255, 255))
     screen.blit(instructions_text, 
                 (center_x - instructions_text.get_width() // 2, height - 100))
 
-def run_shooting_stars(screen, player_count, external_events=None):
+def run_shooting_stars(screen, player_count, external_events=None, resources=None):
     # Initialize pygame if not already initialized
     if not pygame.get_init():
         pygame.init()
@@ -225,24 +236,18 @@ def run_shooting_stars(screen, player_count, external_events=None):
     width, height = screen.get_size()
     center_x, center_y = width // 2, height // 2
     
-    # Load sounds
-    try:
-        # Get current script directory
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # Load background music
-        bg_music_path = os.path.join(current_dir, "shooting-stars.mp3")
-        pygame.mixer.music.load(bg_music_path)
-        pygame.mixer.music.set_volume(0.5)  # Set volume to 50%
-        pygame.mixer.music.play(-1)  # Loop indefinitely (-1)
-        
-        # Load win sound
-        win_sound_path = os.path.join(current_dir, "win-sound.mp3")
-        win_sound = pygame.mixer.Sound(win_sound_path)
-        win_sound.set_volume(0.7)  # Set volume to 70%
-    except Exception as e:
-        print(f"Error loading sounds: {e}")
-        win_sound = None
+    # Images and sounds come from the menu's store when it handed us one
+    if resources is None:
+        resources = store
+    
+    # Get current script directory
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    
+    # Background music, faded in over the menu's
+    audio.play_music("shooting-stars.mp3", 0.5)  # Set volume to 50%
+    
+    # Win sound (already decoded if the menu preloaded it)
+    win_sound = resources.sound("win-sound.mp3", 0.7)  # Set volume to 70%
     
     # Load images
     try:
@@ -250,21 +255,16 @@ def run_shooting_stars(screen, player_count, external_events=None):
         star_img_path = os.path.join(current_dir, "star.jpg")
         bg_img_path = os.path.join(current_dir, "nightsky.jpg")
         
-        # Load and scale images
-        star_img = pygame.image.load(star_img_path)
-        star_img = pygame.transform.scale(star_img, (STAR_SIZE, STAR_SIZE))
-        
-        bg_img = pygame.image.load(bg_img_path)
-        bg_img = pygame.transform.scale(bg_img, (width, height))
+        # Load and scale images (converted for the display, cached between games)
+        star_img = resources.image(star_img_path, (STAR_SIZE, STAR_SIZE))
+        bg_img = resources.image(bg_img_path, (width, height))
         
         # Load Pokemon images
         pokemon_images = {}
         for pokemon in POKEMON_NAMES:
             try:
                 pokemon_path = os.path.join(current_dir, f"{pokemon}.png")
-                pokemon_img = pygame.image.load(pokemon_path)
-                pokemon_img = pygame.transform.scale(pokemon_img, (POKEMON_SIZE, POKEMON_SIZE))
-                pokemon_images[pokemon] = pokemon_img
+                pokemon_images[pokemon] = resources.image(pokemon_path, (POKEMON_SIZE, POKEMON_SIZE))
             except Exception as e:
                 print(f"Could not load {pokemon} image: {e}")
                 
@@ -280,11 +280,10 @@ def run_shooting_stars(screen, player_count, external_events=None):
         pokemon_images = {}
     
     # Font for score display
-    font = pygame.font.Font(None, 36)
-    big_font = pygame.font.Font(None, 72)
+    font = fonts.font(36)
+    big_font = fonts.font(72)
     
     # Game variables
-    clock = pygame.time.Clock()
     running = True
     game_started = False
     game_over = False
@@ -324,12 +323,19 @@ def run_shooting_stars(screen, player_count, external_events=None):
     countdown_done = False
     
     # Main game loop
+    clock.restart()
     while running:
+        # Time since the last frame - everything moves by speed * dt
+        dt = clock.tick()
+        
+        # Start the next music track once the last one has faded out
+        audio.update()
+        
         # Process pygame events for local play
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
-                pygame.mixer.music.stop()  # Stop music when exiting
+                audio.stop_music()  # Stop music when exiting
                 return -1
             elif event.type == pygame.KEYDOWN:
                 key_pressed[event.key] = True
@@ -338,7 +344,7 @@ def run_shooting_stars(screen, player_count, external_events=None):
                 # Check for escape key to quit
                 if event.key == pygame.K_ESCAPE:
                     running = False
-                    pygame.mixer.music.stop()  # Stop music when exiting
+                    audio.stop_music()  # Stop music when exiting
                     return -1
             elif event.type == pygame.KEYUP:
                 key_held[event.key] = False
@@ -350,7 +356,7 @@ def run_shooting_stars(screen, player_count, external_events=None):
                 if isinstance(event, dict):  # Ensure it's a dictionary
                     if event.get('type') == 'QUIT':
                         running = False
-                        pygame.mixer.music.stop()  # Stop music when exiting
+                        audio.stop_music()  # Stop music when exiting
                         return -1
                     elif event.get('type') == 'KEYDOWN':
                         key = event.get('key')
@@ -361,7 +367,7 @@ def run_shooting_stars(screen, player_count, external_events=None):
                             # Also check for escape
                             if key == pygame.K_ESCAPE:
                                 running = False
-                                pygame.mixer.music.stop()  # Stop music when exiting
+                                audio.stop_music()  # Stop music when exiting
                                 return -1
                     elif event.get('type') == 'KEYUP':
                         key = event.get('key')
@@ -400,7 +406,7 @@ def run_shooting_stars(screen, player_count, external_events=None):
             # Allow exiting during countdown with escape key or controller
             if key_pressed.get(pygame.K_ESCAPE, False):
                 running = False
-                pygame.mixer.music.stop()  # Stop music when exiting
+                audio.stop_music()  # Stop music when exiting
                 return -1
                 
             # Check for exit via middleware during countdown
@@ -419,7 +425,7 @@ def run_shooting_stars(screen, player_count, external_events=None):
                             # Check for escape action
                             if event.get('action') == 'escape' or event.get('action') == 'quit':
                                 running = False
-                                pygame.mixer.music.stop()
+                                audio.stop_music()
                                 return -1
                             # Check for any action that should exit the win screen
                             elif (event.get('action') == 'select' or 
@@ -439,10 +445,10 @@ def run_shooting_stars(screen, player_count, external_events=None):
             # Player 1 controls (arrows) - now UP/DOWN
             if player_count >= 1:
                 if key_held.get(pygame.K_UP, False):
-                    pokemon_shooters[0].move(-1, height)
+                    pokemon_shooters[0].move(-1, height, dt)
                     print("Player 1 moving up")
                 if key_held.get(pygame.K_DOWN, False):
-                    pokemon_shooters[0].move(1, height)
+                    pokemon_shooters[0].move(1, height, dt)
                     print("Player 1 moving down")
                 if key_pressed.get(pygame.K_RIGHT, False):
                     bullets.append(Bullet(pokemon_shooters[0].x + pokemon_shooters[0].size // 2, pokemon_shooters[0].y, 0))
@@ -452,10 +458,10 @@ def run_shooting_stars(screen, player_count, external_events=None):
             # Player 2 controls (WASD) - now W/S
             if player_count >= 2:
                 if key_held.get(pygame.K_w, False):
-                    pokemon_shooters[1].move(-1, height)
+                    pokemon_shooters[1].move(-1, height, dt)
                     print("Player 2 moving up")
                 if key_held.get(pygame.K_s, False):
-                    pokemon_shooters[1].move(1, height)
+                    pokemon_shooters[1].move(1, height, dt)
                     print("Player 2 moving down")
                 if key_pressed.get(pygame.K_d, False):
                     bullets.append(Bullet(pokemon_shooters[1].x + pokemon_shooters[1].size // 2, pokemon_shooters[1].y, 1))
@@ -465,10 +471,10 @@ def run_shooting_stars(screen, player_count, external_events=None):
             # Player 3 controls (IJKL) - now I/K
             if player_count >= 3:
                 if key_held.get(pygame.K_i, False):
-                    pokemon_shooters[2].move(-1, height)
+                    pokemon_shooters[2].move(-1, height, dt)
                     print("Player 3 moving up")
                 if key_held.get(pygame.K_k, False):
-                    pokemon_shooters[2].move(1, height)
+                    pokemon_shooters[2].move(1, height, dt)
                     print("Player 3 moving down")
                 if key_pressed.get(pygame.K_l, False):
                     bullets.append(Bullet(pokemon_shooters[2].x + pokemon_shooters[2].size // 2, pokemon_shooters[2].y, 2))
@@ -478,10 +484,10 @@ def run_shooting_stars(screen, player_count, external_events=None):
             # Player 4 controls (NUM pad) - now 8/5
             if player_count >= 4:
                 if key_held.get(pygame.K_KP8, False):
-                    pokemon_shooters[3].move(-1, height)
+                    pokemon_shooters[3].move(-1, height, dt)
                     print("Player 4 moving up")
                 if key_held.get(pygame.K_KP5, False):
-                    pokemon_shooters[3].move(1, height)
+                    pokemon_shooters[3].move(1, height, dt)
                     print("Player 4 moving down")
                 if key_pressed.get(pygame.K_KP6, False):
                     bullets.append(Bullet(pokemon_shooters[3].x + pokemon_shooters[3].size // 2, pokemon_shooters[3].y, 3))
@@ -498,25 +504,22 @@ def run_shooting_stars(screen, player_count, external_events=None):
                 last_spawn_time = current_time
         
         # Update game objects
-        for star in stars[:]:
-            star.update(width, height)  # Pass width and height for bouncing off walls
+        for star in stars:
+            star.update(width, height, dt)  # Pass width and height for bouncing off walls
                 
-        for bullet in bullets[:]:
-            bullet.update()
+        for bullet in bullets:
+            bullet.update(dt)
             # Check collision with stars
-            hit_detected = False
-            for star in stars[:]:
+            for star in stars:
                 if star.is_hit(bullet.x, bullet.y):
                     pokemon_shooters[bullet.player_id].score += 1
                     print(f"Player {bullet.player_id + 1} hit a star! Score: {pokemon_shooters[bullet.player_id].score}")
                     stars.remove(star)
-                    hit_detected = True
+                    bullet.active = False
                     break
-            
-            if hit_detected:
-                bullets.remove(bullet)
-            elif bullet.is_out_of_bounds(width, height):
-                bullets.remove(bullet)
+        
+        # Drop spent bullets in one pass rather than removing them one at a time
+        bullets = [bullet for bullet in bullets if bullet.active and not bullet.is_out_of_bounds(width, height)]
         
         # Check if game is over
         if game_started and not game_over:
@@ -525,7 +528,7 @@ def run_shooting_stars(screen, player_count, external_events=None):
                 game_over = True
                 show_win_screen = True
                 # Fade out music over 2 seconds
-                pygame.mixer.music.fadeout(2000)
+                audio.stop_music(2000)
                 
                 # Determine winner
                 max_score = -1
@@ -581,7 +584,7 @@ def run_shooting_stars(screen, player_count, external_events=None):
                             # Check for escape action
                             if event.get('action') == 'escape' or event.get('action') == 'quit':
                                 running = False
-                                pygame.mixer.music.stop()
+                                audio.stop_music()
                                 return -1
                             # Check for any action that should exit the win screen
                             elif (event.get('action') == 'select' or 
@@ -598,7 +601,7 @@ def run_shooting_stars(screen, player_count, external_events=None):
                     
             if any_key_pressed:
                 # Make sure win sound stops playing when exiting
-                pygame.mixer.stop()
+                audio.stop_effects()
                 running = False
         else:
             # Draw regular game elements
@@ -619,35 +622,35 @@ def run_shooting_stars(screen, player_count, external_events=None):
                     countdown_text = "Get ready!"
                 else:
                     countdown_text = str(countdown_value)
-                countdown_render = big_font.render(countdown_text, True, (255, 255, 255))
+                countdown_render = fonts.render(big_font, countdown_text, True, (255, 255, 255))
                 screen.blit(countdown_render, (center_x - countdown_render.get_width() // 2, center_y - 150))
             elif game_started and not game_over:
                 # Show remaining time
                 remaining_time = max(0, int(GAME_DURATION - (current_time - start_time)))
                 time_text = f"Time: {remaining_time}s"
-                time_render = font.render(time_text, True, (255, 255, 255))
+                time_render = fonts.render(font, time_text, True, (255, 255, 255))
                 screen.blit(time_render, (width - time_render.get_width() - 20, 20))
             
             # Draw scores at the top
             score_y = 20
             score_text = "Scores:"
-            score_render = font.render(score_text, True, (255, 255, 255))
+            score_render = fonts.render(font, score_text, True, (255, 255, 255))
             screen.blit(score_render, (center_x - score_render.get_width() // 2, score_y))
             
             # Draw instructions
             controls_y = height - 80
             if player_count >= 1:
                 p1_text = "P1: ↑/↓ to move, → to shoot"
-                p1_render = font.render(p1_text, True, PLAYER_COLORS[0])
+                p1_render = fonts.render(font, p1_text, True, PLAYER_COLORS[0])
                 screen.blit(p1_render, (20, controls_y))
                 
             if player_count >= 2:
                 p2_text = "P2: W/S to move, D to shoot"
-                p2_render = font.render(p2_text, True, PLAYER_COLORS[1])
+                p2_render = fonts.render(font, p2_text, True, PLAYER_COLORS[1])
                 screen.blit(p2_render, (20, controls_y + 25))
                 
             # Draw "Press ESC to quit" text
-            quit_text = font.render("Press ESC to quit", True, (200, 200, 200))
+            quit_text = fonts.render(font, "Press ESC to quit", True, (200, 200, 200))
             screen.blit(quit_text, (center_x - quit_text.get_width() // 2, height - 40))
             
             # Debug text for key presses
@@ -661,15 +664,14 @@ def run_shooting_stars(screen, player_count, external_events=None):
                 ]):
                     if i < player_count:
                         debug_text = f"P{i+1} keys: {player_keys[0]} [{player_keys[1]}/{player_keys[2]}]"
-                        debug_render = font.render(debug_text, True, PLAYER_COLORS[i])
+                        debug_render = fonts.render(font, debug_text, True, PLAYER_COLORS[i])
                         screen.blit(debug_render, (width - 300, debug_y + i * 25))
         
         # Update display
         pygame.display.flip()
-        clock.tick(60)
     
     # Stop music before exiting
-    pygame.mixer.music.stop()
+    audio.stop_music()
     
     return winner
 
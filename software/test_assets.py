@@ -0,0 +1,105 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+from assets import AssetManager, SpriteCache, FontCache, OverlayCache
+
+def test_images_are_loaded_once_and_cached_per_size():
+    pygame.display.init()
+    pygame.display.set_mode((320, 240))
+    manager = AssetManager()
+
+    background = manager.image("pong-bg.jpg", (320, 240))
+    assert background.get_size() == (320, 240)
+    assert manager.image("pong-bg.jpg", (320, 240)) is background
+    assert manager.image("pong-bg.jpg", (64, 48)).get_size() == (64, 48)
+    assert len(manager.loaded) == 1
+    assert len(manager.converted) == 2
+
+    # Converted to the display's format, keeping transparency where the image has it
+    assert background.get_bitsize() == pygame.display.get_surface().get_bitsize()
+    assert manager.image("star.png").get_flags() & pygame.SRCALPHA
+    assert manager.image("pikachu.png").get_colorkey() is not None
+
+def test_changing_the_display_mode_reconverts_from_memory():
+    pygame.display.init()
+    pygame.display.set_mode((320, 240))
+    manager = AssetManager()
+    first = manager.image("star.png", (50, 50))
+
+    pygame.display.set_mode((400, 300))
+    second = manager.image("star.png", (50, 50))
+    assert second is not first
+    assert len(manager.loaded) == 1
+
+def test_missing_images_raise_for_callers_to_handle():
+    pygame.display.init()
+    pygame.display.set_mode((320, 240))
+    try:
+        AssetManager().image("does-not-exist.png")
+    except (FileNotFoundError, pygame.error):
+        pass
+    else:
+        assert False, "expected an error"
+
+def test_sprite_cache_reuses_transforms_and_evicts_the_oldest():
+    cache = SpriteCache(max_entries=2)
+    sprite = pygame.Surface((10, 10))
+    sprite.fill((200, 100, 50))
+
+    scaled = cache.scale(sprite, (20, 20))
+    assert scaled.get_size() == (20, 20)
+    assert cache.scale(sprite, (20, 20)) is scaled
+    assert cache.tint(sprite, (128, 255, 255)).get_at((0, 0))[:3] == (100, 100, 50)
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'entries': 2}
+
+    # A third transform pushes out the least recently used one (the tint)
+    cache.scale(sprite, (20, 20))
+    cache.rotate(sprite, 90)
+    assert cache.scale(sprite, (20, 20)) is scaled
+    cache.tint(sprite, (128, 255, 255))
+    assert cache.misses == 4
+
+    # Same parameters on a different surface is a different sprite
+    assert cache.scale(pygame.Surface((10, 10)), (20, 20)) is not scaled
+
+def test_text_is_rendered_once_per_font_string_and_color():
+    cache = FontCache(max_entries=2)
+    font = cache.font(36)
+    assert cache.font(36) is font
+    assert cache.font(72) is not font
+
+    label = cache.render(font, "P1", True, (255, 50, 50))
+    assert cache.render(font, "P1", True, (255, 50, 50)) is label
+    assert cache.render(font, "P1", True, (0, 0, 0)) is not label
+    assert cache.render(cache.font(72), "P1", True, (255, 50, 50)).get_height() > label.get_height()
+
+    # Only the two most recent strings are kept
+    assert cache.render(font, "P1", True, (255, 50, 50)) is not label
+    assert cache.stats() == {'hits': 1, 'misses': 4, 'entries': 2}
+
+def test_overlays_are_reused_and_blend_like_a_per_pixel_alpha_fill():
+    pygame.display.init()
+    screen = pygame.display.set_mode((320, 240))
+    cache = OverlayCache()
+    fever = cache.get((320, 240), (255, 0, 255, 30))
+    assert cache.get((320, 240), (0, 0, 0, 200)) is fever
+    assert len(cache.surfaces) == 1
+
+    expected = pygame.Surface((320, 240))
+    expected.fill((100, 150, 200))
+    tint = pygame.Surface((320, 240), pygame.SRCALPHA)
+    tint.fill((10, 20, 30, 30))
+    expected.blit(tint, (0, 0))
+
+    screen.fill((100, 150, 200))
+    cache.draw(screen, (10, 20, 30, 30))
+    assert screen.get_at((5, 5)) == expected.get_at((5, 5))
+
+if __name__ == "__main__":
+    test_images_are_loaded_once_and_cached_per_size()
+    test_changing_the_display_mode_reconverts_from_memory()
+    test_missing_images_raise_for_callers_to_handle()
+    test_sprite_cache_reuses_transforms_and_evicts_the_oldest()
+    test_text_is_rendered_once_per_font_string_and_color()
+    test_overlays_are_reused_and_blend_like_a_per_pixel_alpha_fill()
+    print("All asset tests passed")
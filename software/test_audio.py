@@ -0,0 +1,61 @@
+import os
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import time
+import pygame
+from resources import ResourceStore
+from audio import AudioEngine
+
+def mixer_ready():
+    try:
+        pygame.mixer.init()
+    except pygame.error as e:
+        print(f"No audio device, skipping: {e}")
+        return False
+    return True
+
+def test_switching_tracks_fades_without_blocking():
+    if not mixer_ready():
+        return
+    engine = AudioEngine(ResourceStore())
+    engine.play_music("main-menu.mp3", fade_ms=100)
+    assert pygame.mixer.music.get_busy()
+    assert engine.current.endswith("main-menu.mp3")
+
+    # Asking for the same track again doesn't restart it
+    engine.play_music("main-menu.mp3", fade_ms=100)
+    assert engine.pending is None
+
+    start = time.time()
+    engine.play_music("shooting-stars.mp3", fade_ms=100)
+    engine.update()
+    assert time.time() - start < 0.05
+    assert engine.pending is not None
+
+    # The next track starts from update() once the old one has faded out
+    deadline = time.time() + 2
+    while engine.pending is not None and time.time() < deadline:
+        engine.update()
+        time.sleep(0.01)
+    assert engine.pending is None
+    assert engine.current.endswith("shooting-stars.mp3")
+    assert pygame.mixer.music.get_busy()
+    engine.stop_music()
+
+def test_missing_tracks_fade_out_the_music_and_effects_play_from_memory():
+    if not mixer_ready():
+        return
+    engine = AudioEngine(ResourceStore())
+    engine.play_music("main-menu.mp3", fade_ms=0)
+    engine.play_music("no-such-track.mp3", fade_ms=0)
+    assert engine.current is None
+    assert not pygame.mixer.music.get_busy()
+
+    channel = engine.play_effect("win-sound.mp3", 0.7, maxtime=100)
+    assert channel is not None
+    assert engine.play_effect("no-such-sound.mp3") is None
+    engine.stop_effects()
+
+if __name__ == "__main__":
+    test_switching_tracks_fades_without_blocking()
+    test_missing_tracks_fade_out_the_music_and_effects_play_from_memory()
+    print("All audio tests passed")
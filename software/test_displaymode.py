@@ -0,0 +1,27 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+from displaymode import open_display
+from pong_core import calculate_game_dimensions, square_game_rect
+
+def test_games_draw_at_the_internal_resolution():
+    pygame.display.init()
+    screen = open_display((640, 360))
+    assert screen.get_size() == (640, 360)
+    assert pygame.display.get_surface() is screen
+
+    # Everything laid out from the screen's size is in internal coordinates
+    dims = calculate_game_dimensions(*screen.get_size())
+    game_rect = square_game_rect(*screen.get_size())
+    assert dims['game_size'] == game_rect.width == 360 - 2 * dims['margin']
+    assert game_rect.left + game_rect.width <= 640
+
+def test_no_render_size_draws_at_the_native_resolution():
+    pygame.display.init()
+    screen = open_display(None)
+    assert screen.get_size() == pygame.display.get_desktop_sizes()[0]
+
+if __name__ == "__main__":
+    test_games_draw_at_the_internal_resolution()
+    test_no_render_size_draws_at_the_native_resolution()
+    print("All display tests passed")
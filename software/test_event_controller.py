@@ -0,0 +1,36 @@
+import json
+import time
+import socket
+from event_controller import EventController
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_a_relay_connection_stays_open_between_batches():
+    controller = EventController('127.0.0.1', 0)
+    controller.start()
+    port = controller.socket.getsockname()[1]
+    try:
+        relay = socket.create_connection(('127.0.0.1', port))
+        for pitch in (10, 20):
+            relay.sendall((json.dumps({'action': 'pitch', 'player_id': 1, 'pitch': pitch}) + '\n').encode())
+            assert wait_for(lambda: controller.get_pitch().get(1) == pitch)
+
+        # One-off senders still work alongside it, with or without a trailing newline
+        with socket.create_connection(('127.0.0.1', port)) as once:
+            once.sendall(json.dumps({'action': 'select'}).encode())
+        assert wait_for(lambda: controller.events)
+        assert controller.get_events() == [{'action': 'select'}]
+
+        relay.sendall(b'{"action": "hit"}\n')
+        assert wait_for(lambda: controller.events)
+        relay.close()
+    finally:
+        controller.stop()
+
+if __name__ == "__main__":
+    test_a_relay_connection_stays_open_between_batches()
+    print("All event controller tests passed")
@@ -0,0 +1,68 @@
+import time
+from feedback import FeedbackService
+
+class FakeWriter:
+    """Records what the service writes, and when"""
+    def __init__(self):
+        self.written = []
+        self.closed = False
+
+    def write(self, player, command):
+        self.written.append((time.time(), player, command))
+        return True
+
+    def close(self):
+        self.closed = True
+
+def commands(writer, player=0):
+    return [command for _, written_player, command in writer.written if written_player == player]
+
+def test_repeated_commands_within_the_interval_collapse_to_the_latest():
+    writer = FakeWriter()
+    service = FeedbackService(writer, min_interval=0.2)
+    service.start()
+    try:
+        service.feedback(0, 'rumble', duration=100)
+        time.sleep(0.05)  # Sent at once; the device is now cooling down
+        for duration in (200, 300, 400):
+            service.feedback(0, 'rumble', duration=duration)
+        time.sleep(0.35)
+    finally:
+        service.stop()
+    assert commands(writer) == ["RUMBLE 100", "RUMBLE 400"]
+
+def test_each_device_is_sent_at_most_one_command_per_interval():
+    writer = FakeWriter()
+    service = FeedbackService(writer, min_interval=0.05)
+    service.start()
+    try:
+        # Different kinds don't replace each other, so there's always something to send
+        end = time.time() + 0.5
+        while time.time() < end:
+            for kind in ('rumble', 'tone', 'led'):
+                service.feedback(0, kind)
+                service.feedback(1, kind)
+            time.sleep(0.005)
+    finally:
+        service.stop()
+    for player in (0, 1):
+        times = [sent for sent, written_player, _ in writer.written if written_player == player]
+        assert 5 <= len(times) <= 0.5 / 0.05 + 2
+        assert all(later - earlier >= 0.05 - 1e-3 for earlier, later in zip(times, times[1:]))
+
+def test_stop_joins_the_writer_thread_and_closes_the_writer():
+    writer = FakeWriter()
+    service = FeedbackService(writer)
+    service.start()
+    service.feedback(2, 'led', mask=1)
+    time.sleep(0.05)
+    service.stop()
+    assert not service.thread.is_alive()
+    assert writer.closed
+    assert commands(writer, 2) == ["LED 1 100"]
+
+if __name__ == "__main__":
+    test_repeated_commands_within_the_interval_collapse_to_the_latest()
+    test_each_device_is_sent_at_most_one_command_per_interval()
+    test_stop_joins_the_writer_thread_and_closes_the_writer()
+    print("All feedback tests passed")
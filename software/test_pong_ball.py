@@ -0,0 +1,76 @@
+from pong_core import Rect, WALL_THICKNESS_PERCENT
+from pong_ball import Ball, sweep_circle_rect
+from testutil import quiet
+
+GAME_RECT = Rect(100, 0, 600, 600)
+
+def make_ball(x, y, dx, dy, speed):
+    """A ball already in play at (x, y) heading along (dx, dy)"""
+    ball = quiet(Ball, x, y, 10, speed)
+    ball.x, ball.y = x, y
+    ball.dx, ball.dy = dx, dy
+    ball.base_speed = speed
+    ball.reset_timer = 0
+    ball.game_started = True
+    return ball
+
+def test_sweep_finds_the_exact_time_of_impact():
+    rect = Rect(100, 100, 50, 10)
+    # Straight down onto the top face: touches when the center is 10 above it
+    assert sweep_circle_rect(120, 0, 0, 100, 10, rect) == 0.9
+    # Passing beside the rect misses
+    assert sweep_circle_rect(200, 0, 0, 100, 10, rect, 2.0) is None
+    # Not reached within max_t
+    assert sweep_circle_rect(120, 0, 0, 100, 10, rect, 0.5) is None
+    # Already overlapping
+    assert sweep_circle_rect(120, 105, 0, 100, 10, rect) == 0.0
+
+def test_sweep_rounds_the_corners():
+    rect = Rect(100, 100, 50, 10)
+    # Cutting across the grown rect's corner square but clear of the rounded corner
+    assert sweep_circle_rect(80, 104, 100, -100, 10, rect) is None
+    # Clipping the corner lands on the circle around it
+    t = sweep_circle_rect(80, 108, 100, -100, 10, rect)
+    assert t is not None
+    assert abs((80 + 100 * t - 100) ** 2 + (108 - 100 * t - 100) ** 2 - 10 ** 2) < 1e-9
+
+def test_fast_ball_bounces_off_several_walls_in_one_tick():
+    ball = make_ball(400, 300, 1.0, 0.0, 2000)
+    contacts, loser = ball.update(GAME_RECT, (), [True, False, True, False])
+
+    # Right wall, left wall, right wall, left wall, then the tick runs out
+    wall = int(GAME_RECT.width * WALL_THICKNESS_PERCENT)
+    low, high = GAME_RECT.left + wall + 10, GAME_RECT.right - wall - 10
+    travel = 2000 - (high - 400) - 3 * (high - low)
+    assert loser is None and contacts == []
+    assert ball.dx > 0
+    assert abs(ball.x - (low + travel)) < 1e-9
+
+def test_fast_ball_never_escapes_past_walls():
+    # Only the top player is left; every other side is walled off
+    ball = make_ball(400, 300, 0.6, 0.8, 250)
+    alive = [True, False, False, False]
+    for _ in range(1000):
+        contacts, loser = quiet(ball.update, GAME_RECT, (), alive)
+        assert not ball.escaped(GAME_RECT)
+        if loser is not None:
+            break
+    assert loser == 0
+    assert abs(ball.y - (GAME_RECT.top + ball.radius)) < 1e-9
+
+def test_speed_effect_lasts_a_fixed_number_of_ticks():
+    ball = make_ball(400, 300, 1.0, 0.0, 1)
+    ball.apply_hit_boost()
+    assert ball.effect_timer == ball.effect_ticks
+    for _ in range(ball.effect_ticks):
+        assert ball.effect_timer > 0
+        ball.update(GAME_RECT)
+    assert ball.effect_timer == 0
+
+if __name__ == "__main__":
+    test_sweep_finds_the_exact_time_of_impact()
+    test_sweep_rounds_the_corners()
+    test_fast_ball_bounces_off_several_walls_in_one_tick()
+    test_fast_ball_never_escapes_past_walls()
+    test_speed_effect_lasts_a_fixed_number_of_ticks()
+    print("All ball tests passed")
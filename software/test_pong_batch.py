@@ -0,0 +1,83 @@
+import random
+from pong_sim import PongSimulation
+import pong_batch
+from pong_batch import np, BatchPongSimulation, TrackingPolicy, POLICIES, sweep
+from testutil import quiet
+
+def test_batch_follows_the_same_rules_as_pong_simulation():
+    if np is None:
+        print("numpy not installed, skipping")
+        return
+
+    for seed in range(6):
+        random.seed(seed)
+        policy = TrackingPolicy(skill=0.8, error=0.5, swing_chance=0.5)
+        sim = quiet(PongSimulation, 800, 600, 4)
+        quiet(sim.start)
+        batch = BatchPongSimulation(1, seed=seed, fever_spawn_time=(10**6, 10**6))
+
+        for _ in range(3000):
+            # New rounds pick a random direction; give both the same one
+            if sim.ball.reset_timer == sim.ball.reset_ticks:
+                batch.dx[0], batch.dy[0] = sim.ball.dx, sim.ball.dy
+                batch.base_speed[0] = sim.ball.base_speed
+
+            moves, hits = policy(batch)
+            events = quiet(sim.step, [(moves[0, i], bool(hits[0, i])) for i in range(4)])
+            batch.step(moves, hits)
+            if sim.game_over or any(event['type'] == 'fever' for event in events):
+                break
+
+            assert abs(sim.ball.x - batch.x[0]) < 1e-4
+            assert abs(sim.ball.y - batch.y[0]) < 1e-4
+            assert abs(sim.ball.hit_boost - batch.hit_boost[0]) < 1e-9
+            assert sim.player_lives == list(batch.lives[0])
+            for i, paddle in enumerate(sim.paddles):
+                assert abs(paddle.x - batch.px[0, i]) < 1e-9
+                assert abs(paddle.y - batch.py[0, i]) < 1e-9
+                assert paddle.hit_timer == batch.hit_timer[0, i]
+
+def test_every_match_in_a_sweep_is_accounted_for():
+    if np is None:
+        print("numpy not installed, skipping")
+        return
+
+    results = sweep(500, None, [45, 90], [0.15], [10], [2.0], seed=1)
+
+    assert len(results) == 2
+    for params, summary in results:
+        assert summary['matches'] == 500
+        assert summary['finished'] + summary['timeouts'] == 500
+        assert abs(sum(summary['win_share']) - 1.0) < 1e-9
+    # Faster rounds end matches sooner
+    assert results[1][1]['mean_match_seconds'] < results[0][1]['mean_match_seconds']
+
+def test_bounce_passes_only_sweep_the_balls_still_moving():
+    if np is None:
+        print("numpy not installed, skipping")
+        return
+
+    # Every pass used to sweep every paddle of every arena, costing
+    # MAX_BOUNCES_PER_STEP + 1 passes whenever any one ball bounced more than once
+    swept = [0]
+    original = pong_batch.sweep_circle_rects
+
+    def counting_sweep(x, *args):
+        swept[0] += len(x)
+        return original(x, *args)
+
+    arenas, ticks = 500, 300
+    sim = BatchPongSimulation(arenas, seed=1)
+    pong_batch.sweep_circle_rects = counting_sweep
+    try:
+        for _ in range(ticks):
+            sim.step(*POLICIES['tracking'](sim))
+    finally:
+        pong_batch.sweep_circle_rects = original
+    assert swept[0] < 1.5 * arenas * ticks
+
+if __name__ == "__main__":
+    test_batch_follows_the_same_rules_as_pong_simulation()
+    test_every_match_in_a_sweep_is_accounted_for()
+    test_bounce_passes_only_sweep_the_balls_still_moving()
+    print("All batch simulation tests passed")
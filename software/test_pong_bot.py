@@ -0,0 +1,47 @@
+import time
+from pong_sim import PongSimulation
+from pong_bot import PongBot, predict_crossing, paddle_line, bot_inputs
+from testutil import quiet
+
+def test_prediction_follows_the_ball_off_dead_players_walls():
+    sim = quiet(PongSimulation, 800, 600, 2)  # Left and right are walls
+    sim.start()
+    ball = sim.ball
+    ball.reset_timer = 0
+    ball.x, ball.y = sim.game_rect.centerx, sim.game_rect.centery
+    ball.dx, ball.dy = 0.8, 0.6  # Off the right wall on its way to the bottom paddle
+    speed = ball.base_speed
+    line = paddle_line(sim.paddles[2], ball.radius)
+    predicted, ticks = predict_crossing(ball.x, ball.y, ball.dx * speed, ball.dy * speed, 2, line,
+                                        ball, sim.game_rect, sim.players_alive)
+
+    # Step the real simulation until the ball gets to the paddle line
+    sim.paddles[2].x = sim.game_rect.left - 1000  # Out of the way
+    for tick in range(1, 1000):
+        quiet(sim.step)
+        if ball.y >= line:
+            break
+    assert ball.dx < 0  # It did come off the right wall
+    assert abs(tick - ticks) <= 1
+    assert abs(ball.x - predicted) <= speed
+
+def test_bots_play_a_match_in_microseconds_a_tick():
+    sim = quiet(PongSimulation, 800, 600, 4, 3, 0, False, 240)
+    bots = {player: PongBot(player, 240, seed=player) for player in range(4)}
+    sim.start()
+    bot_time = 0.0
+    for tick in range(1, 200000):
+        start = time.perf_counter()
+        inputs = bot_inputs(bots, sim)
+        bot_time += time.perf_counter() - start
+        quiet(sim.step, inputs)
+        if sim.game_over:
+            break
+
+    assert sim.game_over
+    assert bot_time / tick < 250e-6  # Four bots, well inside a 240 Hz tick
+
+if __name__ == "__main__":
+    test_prediction_follows_the_ball_off_dead_players_walls()
+    test_bots_play_a_match_in_microseconds_a_tick()
+    print("All bot tests passed")
@@ -0,0 +1,61 @@
+from pong_core import *
+from pong_sim import PongSimulation
+from pong_ball import Ball
+from pong_multiball import BallStore
+from pong_replay import InputLog, replay, state_checksum
+from testutil import quiet
+
+def test_stored_balls_move_exactly_like_ball_objects():
+    sim = quiet(PongSimulation, 800, 600, 2)  # Left and right are walls
+    directions = [(0.6, 0.8), (-0.8, 0.6), (0.28, -0.96), (-0.96, -0.28)]
+    balls = [quiet(Ball, 400, 300, sim.ball_radius, 8) for _ in directions]
+    store = BallStore()
+    store.add(400, 300, sim.ball_radius, 8, directions)
+    for ball, (dx, dy) in zip(balls, directions):
+        ball.dx, ball.dy = dx, dy
+        ball.base_speed = 8
+        ball.reset_timer = 0
+        ball.game_started = True
+
+    # Put the paddles where the balls are headed so there are paddle bounces too
+    sim.paddles[0].x = 440
+    sim.paddles[2].x = 570
+    bounces = 0
+    for tick in range(200):
+        contacts, losers = store.step(sim.game_rect, sim.paddles, sim.players_alive)
+        bounces += len(contacts)
+        expected = [quiet(ball.update, sim.game_rect, sim.paddles, sim.players_alive) for ball in balls]
+        assert sorted(contacts) == sorted(c for ball_contacts, _ in expected for c in ball_contacts)
+        assert losers == [(i, loser) for i, (_, loser) in enumerate(expected) if loser is not None]
+        xs, ys = store.positions()
+        for i, ball in enumerate(balls):
+            if expected[i][1] is None:
+                assert (xs[i], ys[i]) == (ball.x, ball.y)
+        if losers:
+            break
+    assert bounces > 0
+
+def test_multi_ball_matches_end_and_replay_exactly():
+    sim = quiet(PongSimulation, 800, 600, 4, 5, multi_ball=60)
+    assert len(sim.balls) == 60
+    log = InputLog.for_simulation(sim)
+    sim.start()
+    lost = 0
+    for _ in range(20000):
+        events = quiet(sim.step, log.record(sim, None))
+        lost += sum(event['type'] == 'life_lost' for event in events)
+        if sim.game_over:
+            break
+    assert sim.game_over
+    assert lost == 4 * PLAYER_STARTING_LIVES - sim.player_lives[sim.winner]
+    assert len(sim.balls) == 60  # Served again rather than dropped in multi-ball mode
+    log.finish(sim)
+
+    replayed = quiet(replay, InputLog.decode(log.encode()))
+    assert replayed.multi_ball == 60
+    assert state_checksum(replayed) == log.checksum
+
+if __name__ == "__main__":
+    test_stored_balls_move_exactly_like_ball_objects()
+    test_multi_ball_matches_end_and_replay_exactly()
+    print("All multi-ball tests passed")
@@ -0,0 +1,72 @@
+import time
+from pong_sim import PongSimulation
+from pong_bot import PongBot, bot_inputs
+from pong_net import NetServer, NetClient, world, apply_world
+from testutil import quiet
+
+def test_world_copies_the_server_state():
+    sim = quiet(PongSimulation, 800, 600, 4, 4)
+    bots = {player: PongBot(player, seed=player) for player in range(4)}
+    sim.start()
+    for _ in range(400):
+        quiet(sim.step, bot_inputs(bots, sim))
+    copy = quiet(PongSimulation, 800, 600, 4, 4)
+    apply_world(copy, world(sim))
+    assert world(copy) == world(sim)
+
+def test_clients_follow_the_server_over_loopback():
+    server = NetServer('127.0.0.1', 0, seed=6, width=800, height=600)
+    assert quiet(server.start)
+    clients = [NetClient('127.0.0.1', server.port) for _ in range(2)]
+    try:
+        for client in clients:
+            client.poll()  # Join
+        quiet(server.poll)
+        time.sleep(0.01)
+        for client in clients:
+            quiet(client.poll)
+        assert [client.player for client in clients] == [0, 2]
+        bots = {client.player: PongBot(client.player, seed=client.player) for client in clients}
+
+        served = {}
+        for _ in range(600):
+            quiet(server.step)
+            served[server.frame] = world(server.sim)
+            for client in clients:
+                move_hit = bots[client.player].decide(client.sim)
+                quiet(client.step, [move_hit])
+        time.sleep(0.01)
+        for client in clients:
+            quiet(client.poll)
+    finally:
+        for client in clients:
+            client.close()
+        server.close()
+
+    for client in clients:
+        # Whatever was predicted, the server's frames are what the client ends up with
+        assert client.confirmed >= server.frame - 2
+        assert client.history[client.confirmed][1] == served[client.confirmed]
+        assert client.frame > client.confirmed  # Running ahead of the server
+        assert client.rollbacks > 0
+
+def test_a_rollback_fits_in_a_frame():
+    sim = quiet(PongSimulation, 800, 600, 4, 7)
+    bots = {player: PongBot(player, seed=player) for player in range(4)}
+    sim.start()
+    snapshot = sim.snapshot()
+    inputs = [bot_inputs(bots, sim)] * 30
+    start = time.perf_counter()
+    for _ in range(10):
+        sim.restore(snapshot)
+        for tick_inputs in inputs:
+            quiet(sim.step, tick_inputs)
+            sim.snapshot()
+    # Going back 30 ticks and playing them again takes well under a 60 Hz frame
+    assert (time.perf_counter() - start) / 10 < 1 / 60
+
+if __name__ == "__main__":
+    test_world_copies_the_server_state()
+    test_clients_follow_the_server_over_loopback()
+    test_a_rollback_fits_in_a_frame()
+    print("All net play tests passed")
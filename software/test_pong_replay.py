@@ -0,0 +1,51 @@
+import time
+import random
+from pong_sim import PongSimulation
+from pong_replay import InputLog, replay, state_checksum
+from testutil import quiet
+
+def record_match(seed, max_ticks=60000):
+    """Play a match with jittery random inputs, logging it the way PongGame does"""
+    sim = quiet(PongSimulation, 800, 600, 4, seed)
+    log = InputLog.for_simulation(sim)
+    players = random.Random(seed + 1)
+    for tick in range(max_ticks):
+        if tick == 30:
+            sim.start()
+        inputs = [(players.uniform(-1, 1), players.random() < 0.05) for _ in range(4)]
+        quiet(sim.step, log.record(sim, inputs))
+        if sim.game_over:
+            break
+    log.finish(sim)
+    return sim, log
+
+def test_replay_reproduces_the_match_exactly():
+    sim, log = record_match(1234)
+    assert sim.game_over
+
+    data = log.encode()
+    assert len(data) < len(log) * 5  # Compressed below the raw tick records
+
+    start = time.perf_counter()
+    replayed = quiet(replay, InputLog.decode(data))
+    elapsed = time.perf_counter() - start
+
+    assert replayed.tick == sim.tick
+    assert (replayed.ball.x, replayed.ball.y, replayed.ball.dx, replayed.ball.dy) == \
+           (sim.ball.x, sim.ball.y, sim.ball.dx, sim.ball.dy)
+    assert replayed.player_lives == sim.player_lives
+    assert replayed.winner == sim.winner
+    assert state_checksum(replayed) == log.checksum
+    assert elapsed < len(log) / 60.0  # Faster than the match took to play
+
+def test_seed_decides_the_serves_and_orbs():
+    first = quiet(PongSimulation, 800, 600, 4, 7)
+    second = quiet(PongSimulation, 800, 600, 4, 7)
+    other = quiet(PongSimulation, 800, 600, 4, 8)
+    assert (first.ball.dx, first.ball.dy) == (second.ball.dx, second.ball.dy)
+    assert (first.ball.dx, first.ball.dy) != (other.ball.dx, other.ball.dy)
+
+if __name__ == "__main__":
+    test_replay_reproduces_the_match_exactly()
+    test_seed_decides_the_serves_and_orbs()
+    print("All replay tests passed")
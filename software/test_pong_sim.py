@@ -0,0 +1,101 @@
+import subprocess
+import sys
+import os
+from pong_core import BALL_SPEED_INCREMENT
+from pong_sim import PongSimulation, NO_INPUT
+from testutil import quiet
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def test_simulation_does_not_import_pygame():
+    code = "import sys, pong_sim; sys.exit('pygame' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=HERE).returncode == 0
+
+def test_match_without_input_ends_with_a_winner():
+    sim = quiet(PongSimulation, 800, 600, 4)
+    sim.start()
+    events = []
+    for _ in range(200000):
+        events.extend(quiet(sim.step))
+        if sim.game_over:
+            break
+
+    assert sim.game_over
+    assert sim.players_alive.count(True) == 1
+    assert sim.winner == sim.players_alive.index(True)
+    assert events[-1] == {'type': 'game_over', 'winner': sim.winner}
+    assert sum(1 for e in events if e['type'] == 'life_lost') == 3 * 3 + (3 - sim.player_lives[sim.winner])
+
+def test_inputs_move_paddles_within_the_game_area():
+    sim = quiet(PongSimulation, 800, 600, 4)
+    start_x = sim.paddles[0].x
+    sim.step([(1.0, False), NO_INPUT, NO_INPUT, NO_INPUT])
+    assert sim.paddles[0].x == start_x + sim.paddles[0].speed
+
+    for _ in range(100):
+        sim.step([(-1.0, False), (1.0, False), NO_INPUT, NO_INPUT])
+    assert sim.paddles[0].x == sim.game_rect.left
+    assert sim.paddles[1].y == sim.game_rect.bottom - sim.paddles[1].height
+
+def test_hits_only_register_once_the_game_has_started():
+    sim = quiet(PongSimulation, 800, 600, 2)
+    sim.step([(0.0, True)] * 4)
+    assert sim.paddles[0].hit_timer == 0
+
+    sim.start()
+    quiet(sim.step, [(0.0, True)] * 4)
+    assert sim.paddles[0].hit_timer > 0
+    # Player 4 isn't in a two player match
+    assert sim.paddles[3].hit_timer == 0
+
+def test_speeds_and_durations_hold_at_any_simulation_rate():
+    for rate in (60, 144, 240):
+        sim = quiet(PongSimulation, 800, 600, 4, 1, 0, False, rate)
+        sim.start()
+        start_x = sim.paddles[0].x
+        for _ in range(rate // 4):  # A quarter of a second
+            quiet(sim.step, [(0.25, True)] + [NO_INPUT] * 3)
+        # A quarter of full speed (three game areas a second)
+        assert abs(sim.paddles[0].x - start_x - 0.0625 * sim.game_rect.width * 3.0) < 1e-6
+        assert abs(sim.ball.base_speed * rate - (sim.ball_speed + BALL_SPEED_INCREMENT)) < 1e-9
+        assert sim.ball.reset_ticks == rate
+        assert sim.paddles[0].hit_ticks == round(rate / 6)
+
+def test_restoring_a_snapshot_plays_the_same_ticks_again():
+    from pong_bot import PongBot, bot_inputs
+    from pong_replay import state_checksum
+    sim = quiet(PongSimulation, 800, 600, 4, 5, 3, True)
+    bots = {player: PongBot(player, seed=player) for player in range(4)}
+    sim.start()
+    for _ in range(200):
+        quiet(sim.step, bot_inputs(bots, sim))
+    snapshot = sim.snapshot()
+    inputs = []
+    for _ in range(300):
+        inputs.append(bot_inputs(bots, sim))
+        quiet(sim.step, inputs[-1])
+    played = (state_checksum(sim), sim.player_lives[:], len(sim.balls))
+
+    sim.restore(snapshot)
+    for tick_inputs in inputs:
+        quiet(sim.step, tick_inputs)
+    assert (state_checksum(sim), sim.player_lives[:], len(sim.balls)) == played
+
+def test_ticks_reuse_the_entities_rects():
+    from allocbench import count_rects
+    sim = quiet(PongSimulation, 800, 600, 4, 8)
+    sim.start()
+    rect = sim.paddles[0].get_rect()
+    _, created = count_rects(lambda: [quiet(sim.step, [(1.0, True)] * 4) for _ in range(200)])
+    assert created == 0
+    assert sim.paddles[0].get_rect() is rect  # Updated in place as the paddle moves
+
+if __name__ == "__main__":
+    test_simulation_does_not_import_pygame()
+    test_match_without_input_ends_with_a_winner()
+    test_inputs_move_paddles_within_the_game_area()
+    test_hits_only_register_once_the_game_has_started()
+    test_speeds_and_durations_hold_at_any_simulation_rate()
+    test_restoring_a_snapshot_plays_the_same_ticks_again()
+    test_ticks_reuse_the_entities_rects()
+    print("All Pong simulation tests passed")
@@ -0,0 +1,71 @@
+import time
+from pong_sim import PongSimulation
+from pong_bot import PongBot, bot_inputs
+from pong_spectate import (FIELDS, SpectatorServer, SpectatorClient, capture, encode_snapshot,
+                           decode_snapshot, apply_state, BALL_WAITING)
+from testutil import quiet
+
+def play(sim, bots, ticks):
+    for _ in range(ticks):
+        quiet(sim.step, bot_inputs(bots, sim))
+
+def test_deltas_decode_to_the_same_state_and_are_small():
+    sim = quiet(PongSimulation, 800, 600, 4, 2)
+    bots = {player: PongBot(player, seed=player) for player in range(4)}
+    sim.start()
+    play(sim, bots, 120)
+    base_tick, base = sim.tick, capture(sim)
+    play(sim, bots, 3)
+    state = capture(sim)
+    assert len(state) == len(FIELDS)
+
+    info = (sim.width, sim.height, sim.rate, sim.player_count)
+    full = encode_snapshot(sim.tick, state, info=info)
+    delta = encode_snapshot(sim.tick, state, base_tick, base)
+    assert decode_snapshot(full, {}) == (sim.tick, state, info)
+    assert decode_snapshot(delta, {base_tick: base}) == (sim.tick, state, None)
+    assert decode_snapshot(delta, {})[1] is None  # Can't decode without its base
+    assert len(delta) < len(full) and len(delta) <= 32
+
+    # A spectator's copy draws the same thing
+    copy = quiet(PongSimulation, 800, 600, 4)
+    apply_state(copy, state)
+    assert capture(copy) == state
+
+def test_spectator_follows_a_match_over_loopback():
+    server = SpectatorServer('127.0.0.1', 0)
+    assert quiet(server.start)
+    client = SpectatorClient('127.0.0.1', server.port)
+    sim = quiet(PongSimulation, 800, 600, 4, 3)
+    bots = {player: PongBot(player, seed=player) for player in range(4)}
+    sim.start()
+    try:
+        client.poll()  # Hello
+        for _ in range(600):
+            quiet(sim.step, bot_inputs(bots, sim))
+            quiet(server.broadcast, sim)
+            client.poll()
+        deadline = time.time() + 2
+        while client.latest != sim.tick and time.time() < deadline:
+            client.poll()
+            time.sleep(0.001)
+    finally:
+        client.close()
+        server.close()
+
+    assert client.info == (800, 600, sim.rate, 4)
+    assert client.states[client.latest] == capture(sim)
+    assert server.full_sent <= 3  # Everything after the first ack is a delta
+    assert server.bytes_sent / server.packets_sent < 30
+
+    # Halfway between two ticks the ball is drawn halfway between them
+    tick_a, a = client.timeline[-2]
+    tick_b, b = client.timeline[-1]
+    middle = client.state_at((tick_a + tick_b) / 2)
+    if not (a[2] | b[2]) & BALL_WAITING:
+        assert middle[0] == (a[0] + b[0]) / 2
+
+if __name__ == "__main__":
+    test_deltas_decode_to_the_same_state_and_are_small()
+    test_spectator_follows_a_match_over_loopback()
+    print("All spectator tests passed")
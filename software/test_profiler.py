@@ -0,0 +1,40 @@
+import json
+import time
+import tempfile
+from profiler import FrameProfiler, percentile, PHASES
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 100) == 100
+    assert percentile([], 95) == 0.0
+
+def test_phases_are_timed_per_frame_and_summarised():
+    profiler = FrameProfiler(window=5, budget_ms=1.0)
+    for _ in range(8):
+        profiler.begin_frame()
+        profiler.start('update')
+        time.sleep(0.002)
+        profiler.start('draw')
+        profiler.end_frame()
+
+    summary = profiler.summary()
+    assert summary['frames'] == 8
+    assert summary['window'] == 5
+    assert summary['over_budget'] == 8
+    assert summary['phases']['update']['p50'] >= 2.0
+    assert summary['phases']['events']['max'] == 0.0
+    assert summary['phases']['total']['p50'] >= summary['phases']['update']['p50']
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = profiler.write_summary('pong', {'winner': 2}, directory)
+        with open(path) as f:
+            report = json.load(f)
+    assert report['winner'] == 2
+    assert set(PHASES) <= set(report['phases'])
+
+if __name__ == "__main__":
+    test_percentile_uses_nearest_rank()
+    test_phases_are_timed_per_frame_and_summarised()
+    print("All profiler tests passed")
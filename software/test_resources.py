@@ -0,0 +1,35 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+from assets import AssetManager
+from resources import ResourceStore
+
+def test_preloading_reads_everything_once_in_the_background():
+    pygame.display.init()
+    pygame.display.set_mode((320, 240))
+    store = ResourceStore(AssetManager())
+    store.start(images=["pong-bg.jpg", "pikachu.png"], sounds=["win-sound.mp3"])
+    assert store.wait(10)
+
+    assert len(store.assets.loaded) == 2
+    sound = store.sound("win-sound.mp3")
+    if pygame.mixer.get_init():
+        assert sound is not None
+        assert store.sound("win-sound.mp3", 0.7) is sound
+        assert abs(sound.get_volume() - 0.7) < 0.01
+
+    # Converting for the display reuses what was read in the background
+    store.image("pikachu.png", (40, 40))
+    assert len(store.assets.loaded) == 2
+
+def test_missing_sounds_are_reported_once_and_return_none():
+    store = ResourceStore(AssetManager())
+    assert store.sound("does-not-exist.mp3") is None
+    assert store.sound("does-not-exist.mp3") is None
+    assert len(store.sounds) == 1
+
+if __name__ == "__main__":
+    test_preloading_reads_everything_once_in_the_background()
+    test_missing_sounds_are_reported_once_and_return_none()
+    print("All resource tests passed")
@@ -0,0 +1,38 @@
+import math
+import random
+from shooting_stars import Star
+
+FIELD = 10**9  # Far enough from every wall that nothing bounces
+
+def turn(vx, vy, new_vx, new_vy):
+    """Angle between two velocities, in radians"""
+    return abs(math.atan2(vx * new_vy - vy * new_vx, vx * new_vx + vy * new_vy))
+
+def per_frame_wobble_turn(samples):
+    """Mean course change of a wobble back when stars moved 4 pixels per frame"""
+    total = 0.0
+    for _ in range(samples):
+        angle = random.uniform(0, 2 * math.pi)
+        speed = random.uniform(0.8, 1.8) * 4
+        vx, vy = math.cos(angle) * speed, math.sin(angle) * speed
+        new_vx, new_vy = vx + random.uniform(-0.2, 0.2), vy + random.uniform(-0.2, 0.2)
+        total += turn(vx, vy, new_vx, new_vy)
+    return total / samples
+
+def test_a_wobble_turns_a_star_as_much_as_it_did_per_frame():
+    random.seed(1)
+    samples = 20000
+    total = 0.0
+    for _ in range(samples):
+        star = Star(FIELD / 2, FIELD / 2)
+        vx, vy = star.vx, star.vy
+        star.update(FIELD, FIELD, 2.0)  # Long enough that the wobble always happens
+        total += turn(vx, vy, star.vx, star.vy)
+        assert abs(math.hypot(star.vx, star.vy) - star.speed) < 1e-9
+
+    expected = per_frame_wobble_turn(samples)
+    assert abs(total / samples - expected) < 0.1 * expected
+
+if __name__ == "__main__":
+    test_a_wobble_turns_a_star_as_much_as_it_did_per_frame()
+    print("All Shooting Stars tests passed")
@@ -0,0 +1,9 @@
+# testutil.py - Helpers shared by the test files
+import io
+import contextlib
+
+
+def quiet(func, *args, **kwargs):
+    """Run func with the game's debug prints silenced"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)